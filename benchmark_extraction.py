@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+字段提取吞吐量基准测试
+
+对比现有的单层 list 字段处理与带通配符的 path 字段处理：
+相同的扁平数据上两者的开销，以及 path 字段在深层嵌套数据上的吞吐量。
+"""
+
+import argparse
+import time
+from typing import Any, Dict, List
+
+from packages.formats.generic import GenericFormatHandler
+
+FLAT_CONFIG = {
+    "name": "flat",
+    "translatable_fields": [{
+        "field": "messages",
+        "type": "list",
+        "sub_fields": [{"field": "content", "type": "string", "condition": "role:user|assistant|system"}],
+    }],
+}
+
+PATH_CONFIG = {
+    "name": "path",
+    "translatable_fields": [{"field": "messages.*.content", "type": "path", "condition": "role:user|assistant|system"}],
+}
+
+DEEP_CONFIG = {
+    "name": "deep",
+    "translatable_fields": [
+        {"field": "messages.*.content.*.text", "type": "path", "condition": "type:text"},
+        {"field": "messages.*.tool_calls.*.function.arguments", "type": "path"},
+        {"field": "metadata.*.*", "type": "path"},
+    ],
+}
+
+
+def make_flat_row(turns: int) -> Dict[str, Any]:
+    """扁平消息：content 为字符串"""
+    return {"messages": [
+        {"role": "user" if i % 2 == 0 else "assistant", "content": f"Message {i} with some text to translate."}
+        for i in range(turns)
+    ]}
+
+
+def make_deep_row(turns: int) -> Dict[str, Any]:
+    """深层嵌套消息：content 为多段内容，带工具调用和 列表字典 形式的元数据"""
+    messages = []
+    for i in range(turns):
+        message = {
+            "role": "user" if i % 2 == 0 else "assistant",
+            "content": [
+                {"type": "text", "text": f"Part one of message {i}."},
+                {"type": "image_url", "image_url": {"url": "https://example.com/image.png"}},
+                {"type": "text", "text": f"Part two of message {i}."},
+            ],
+        }
+        if i % 2:
+            message["tool_calls"] = [{"id": f"call_{i}", "function": {"name": "search", "arguments": f"query {i}"}}]
+        messages.append(message)
+    return {"messages": messages, "metadata": {"tags": ["greeting", "search"], "notes": ["first note"]}}
+
+
+def measure(handler: GenericFormatHandler, rows: List[Dict[str, Any]], repeat: int) -> Dict[str, float]:
+    """重复提取多次，取最快一次的耗时"""
+    best = float("inf")
+    fields = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fields = sum(len(handler.extract_translatable_content(row)) for row in rows)
+        best = min(best, time.perf_counter() - start)
+    return {"rows_per_s": len(rows) / best, "fields_per_s": fields / best, "fields": fields}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="字段提取吞吐量基准测试")
+    parser.add_argument("--rows", type=int, default=5000, help="数据项数量，默认5000")
+    parser.add_argument("--turns", type=int, default=8, help="每个数据项的消息数，默认8")
+    parser.add_argument("--repeat", type=int, default=5, help="重复次数，默认5")
+    args = parser.parse_args()
+
+    flat_rows = [make_flat_row(args.turns) for _ in range(args.rows)]
+    deep_rows = [make_deep_row(args.turns) for _ in range(args.rows)]
+    cases = [
+        ("list (flat rows)", GenericFormatHandler(FLAT_CONFIG), flat_rows),
+        ("path (flat rows)", GenericFormatHandler(PATH_CONFIG), flat_rows),
+        ("path (deep rows)", GenericFormatHandler(DEEP_CONFIG), deep_rows),
+    ]
+
+    print(f"{args.rows} rows, {args.turns} messages per row, best of {args.repeat}")
+    for name, handler, rows in cases:
+        result = measure(handler, rows, args.repeat)
+        print(f"  {name:<18} {result['rows_per_s']:>10.0f} rows/s  {result['fields_per_s']:>10.0f} fields/s  ({result['fields']} fields)")
+
+
+if __name__ == "__main__":
+    main()
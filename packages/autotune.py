@@ -0,0 +1,214 @@
+import json
+import os
+import time
+import asyncio
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+
+class ConcurrencyTuner:
+    """
+    根据观测到的延迟自动调整并发请求数
+
+    从较低的并发开始，每完成一个观测窗口的请求评估一次：
+    吞吐量提升时成倍（慢启动阶段）或逐步增加并发；延迟超过目标、延迟相对基线明显上升或错误率过高时按比例回退。
+    同时记录满足延迟和错误率要求的吞吐量最高的工作点，供之后的运行作为初始并发。
+    """
+
+    def __init__(self, initial: int = 4, minimum: int = 1, maximum: int = 256,
+                 target_latency: Optional[float] = None, latency_tolerance: float = 2.0,
+                 max_error_rate: float = 0.05, improvement: float = 0.05, backoff: float = 0.7,
+                 min_window: int = 10, verbose: bool = True):
+        """
+        初始化调节器
+
+        Args:
+            initial: 初始并发数
+            minimum: 最小并发数
+            maximum: 最大并发数
+            target_latency: 目标p90延迟（秒），默认不设，改为与基线比较
+            latency_tolerance: 未设目标延迟时，p90延迟超过基线（观测到的最低p90）的倍数即视为过载
+            max_error_rate: 窗口内允许的最大错误率
+            improvement: 吞吐量相对上一窗口提升超过该比例才视为有提升
+            backoff: 回退时并发数乘以的比例
+            min_window: 每个观测窗口的最少请求数
+            verbose: 是否打印每次调整
+        """
+        if not 1 <= minimum <= maximum:
+            raise ValueError("Concurrency bounds must satisfy 1 <= minimum <= maximum")
+        self.minimum = minimum
+        self.maximum = maximum
+        self.limit = min(max(initial, minimum), maximum)
+        self.target_latency = target_latency
+        self.latency_tolerance = latency_tolerance
+        self.max_error_rate = max_error_rate
+        self.improvement = improvement
+        self.backoff = backoff
+        self.min_window = min_window
+        self.verbose = verbose
+
+        self.in_flight = 0
+        self.history: List[Dict[str, Any]] = []
+        self.best: Optional[Dict[str, Any]] = None
+        # 各并发数下未过载窗口的 (吞吐量, p90延迟)，工作点按平均值选取，避免单个窗口的波动
+        self._throughputs: Dict[int, List[Tuple[float, float]]] = {}
+        self._last_change = 0
+        self._slow_start = True
+        self._baseline_latency: Optional[float] = None
+        self._previous_throughput: Optional[float] = None
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._latencies: List[float] = []
+        self._errors = 0
+        self._window_start: Optional[float] = None
+
+    async def acquire(self) -> None:
+        """等待一个并发名额"""
+        if self._window_start is None:
+            self._window_start = time.perf_counter()
+        if self.in_flight < self.limit and not self._waiters:
+            self.in_flight += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # 名额已经分配给了被取消的请求，交还给下一个等待者
+                self.in_flight -= 1
+                self._wake()
+            else:
+                self._waiters.remove(waiter)
+            raise
+
+    def release(self, latency: float, ok: bool = True) -> None:
+        """
+        归还名额并记录一次请求的结果
+
+        Args:
+            latency: 请求耗时（秒）
+            ok: 请求是否成功
+        """
+        self.in_flight -= 1
+        self._latencies.append(latency)
+        if not ok:
+            self._errors += 1
+        if len(self._latencies) >= max(self.min_window, 2 * self.limit):
+            self._evaluate()
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters and self.in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    def _evaluate(self) -> None:
+        """按一个观测窗口的吞吐量、p90延迟和错误率调整并发数"""
+        now = time.perf_counter()
+        ordered = sorted(self._latencies)
+        p90 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.9))]
+        throughput = len(ordered) / max(now - self._window_start, 1e-9)
+        error_rate = self._errors / len(ordered)
+        self._baseline_latency = p90 if self._baseline_latency is None else min(self._baseline_latency, p90)
+
+        target = self.target_latency or self._baseline_latency * self.latency_tolerance
+        overloaded = p90 > target or error_rate > self.max_error_rate
+        previous = self._previous_throughput
+        improved = previous is None or throughput > previous * (1 + self.improvement)
+
+        if not overloaded:
+            self._throughputs.setdefault(self.limit, []).append((throughput, p90))
+            self.best = max(
+                (
+                    {
+                        "max_concurrent": limit,
+                        "throughput_rps": round(sum(t for t, _ in samples) / len(samples), 3),
+                        "p90_latency_s": round(sum(p for _, p in samples) / len(samples), 4),
+                    }
+                    for limit, samples in self._throughputs.items()
+                ),
+                key=lambda point: point["throughput_rps"]
+            )
+
+        limit = self.limit
+        if overloaded:
+            # 延迟上升或出错：按比例回退，结束慢启动
+            self._slow_start = False
+            limit = max(self.minimum, int(self.limit * self.backoff))
+        elif self._slow_start:
+            if improved:
+                limit = min(self.maximum, self.limit * 2)
+            else:
+                # 吞吐量不再随并发成倍提升，回到最佳工作点后逐步探测
+                self._slow_start = False
+                limit = self.best["max_concurrent"] if self.best else self.limit
+        elif self._last_change > 0 and not improved:
+            # 上次增加并发没有带来吞吐量提升：退回一步
+            limit = max(self.minimum, self.limit - max(1, self.limit // 8))
+        else:
+            limit = min(self.maximum, self.limit + max(1, self.limit // 8))
+
+        self.history.append({
+            "max_concurrent": self.limit,
+            "throughput_rps": round(throughput, 3),
+            "p90_latency_s": round(p90, 4),
+            "error_rate": round(error_rate, 4),
+        })
+        if self.verbose and limit != self.limit:
+            print(f"Concurrency {self.limit} -> {limit} (throughput {throughput:.1f} req/s, "
+                  f"p90 latency {p90 * 1000:.0f} ms, errors {error_rate:.0%})")
+
+        self._last_change = limit - self.limit
+        self.limit = limit
+        self._previous_throughput = throughput
+        self._latencies = []
+        self._errors = 0
+        self._window_start = now
+
+    def operating_point(self) -> Dict[str, Any]:
+        """
+        选定的工作点
+
+        Returns:
+            Dict[str, Any]: 吞吐量最高且满足延迟和错误率要求的并发数及其吞吐量、p90延迟；没有完整窗口时为当前并发数
+        """
+        point = dict(self.best) if self.best else {"max_concurrent": self.limit}
+        point["windows"] = len(self.history)
+        return point
+
+
+def load_operating_point(path: str, key: str) -> Optional[Dict[str, Any]]:
+    """
+    读取之前保存的工作点
+
+    Args:
+        path: 状态文件路径
+        key: 后端标识（如 API地址|模型）
+
+    Returns:
+        Optional[Dict[str, Any]]: 工作点，没有记录时返回None
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f).get(key)
+
+
+def save_operating_point(path: str, key: str, point: Dict[str, Any]) -> None:
+    """
+    保存工作点，同一状态文件中按后端标识分别记录
+
+    Args:
+        path: 状态文件路径
+        key: 后端标识
+        point: 工作点
+    """
+    state = {}
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    state[key] = point
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False, indent=2)
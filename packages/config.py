@@ -1,6 +1,6 @@
 import os
 import yaml
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from .formats.base import FormatHandler
 from .formats.generic import GenericFormatHandler
 
@@ -16,6 +16,7 @@ class ConfigManager:
         """
         self.config_dir = config_dir
         self._configs = {}
+        self.load_errors: Dict[str, str] = {}  # 加载失败的配置：格式名称 -> 错误信息
         self._load_configs()
     
     def _load_configs(self):
@@ -34,6 +35,7 @@ class ConfigManager:
                         self._configs[config_name] = config
                         print(f"Loaded config: {config_name}")
                 except Exception as e:
+                    self.load_errors[config_name] = str(e)
                     print(f"Error loading config '{filename}': {str(e)}")
     
     def get_config(self, format_name: str) -> Dict[str, Any]:
@@ -103,6 +105,9 @@ class ConfigManager:
         Returns:
             bool: 配置是否有效
         """
+        if not isinstance(config, dict):
+            return False
+        
         required_fields = ["name", "translatable_fields"]
         
         for field in required_fields:
@@ -123,6 +128,7 @@ class ConfigManager:
     def reload_configs(self):
         """重新加载所有配置文件"""
         self._configs.clear()
+        self.load_errors.clear()
         self._load_configs()
     
     def add_config_from_dict(self, format_name: str, config: Dict[str, Any]):
@@ -154,3 +160,32 @@ class ConfigManager:
         
         with open(config_path, 'w', encoding='utf-8') as f:
             yaml.dump(self._configs[format_name], f, default_flow_style=False, allow_unicode=True)
+
+
+def check_translation_settings(config: Dict[str, Any], from_lang: str, to_langs: List[str],
+                               multi_target_json: bool = False) -> Tuple[List[str], List[str]]:
+    """
+    检查格式配置与运行参数的组合
+
+    DatasetTranslator 构建时与 --plan、--validate_config 使用相同的检查，避免计划通过但运行时失败。
+
+    Args:
+        config: 格式配置
+        from_lang: 源语言代码
+        to_langs: 目标语言代码列表
+        multi_target_json: 是否用一次JSON模式请求同时翻译所有目标语言
+
+    Returns:
+        Tuple[List[str], List[str]]: (错误信息列表, 警告信息列表)，有错误时无法开始翻译
+    """
+    errors = []
+    warnings = []
+    if not to_langs:
+        errors.append("At least one target language is required")
+    if from_lang in to_langs:
+        errors.append(f"Source language '{from_lang}' is also a target language")
+    if multi_target_json and len(to_langs) > 1 and (config.get("conversation") or {}).get("enabled", False):
+        # 对话窗口按目标语言分别整体翻译，多目标语言JSON请求只用于对话之外的单个字段
+        warnings.append("conversation windows are translated once per target language; "
+                        "multi_target_json only applies to fields outside conversations")
+    return errors, warnings
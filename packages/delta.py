@@ -0,0 +1,161 @@
+import os
+import json
+import hashlib
+from dataclasses import replace
+from typing import Any, Dict, List, Optional, Tuple
+from .formats.base import FormatHandler, TranslatableField
+from .quarantine import FailureLog, FAILED_FIELDS_FILENAME
+from .readers import read_slice
+from .writers import open_output_splits
+
+# 行哈希索引文件名，与翻译结果位于同一目录
+ROW_INDEX_FILENAME = "row_index.json"
+
+# 行哈希的算法版本，修改计算方式时递增，旧索引随之失效
+ROW_HASH_VERSION = 1
+
+
+def row_hash(fields: List[TranslatableField]) -> str:
+    """
+    计算数据项可翻译内容的稳定哈希
+
+    只覆盖格式处理器提取出的字段路径和内容，不可翻译字段的变化不影响哈希。
+
+    Args:
+        fields: 可翻译字段列表
+
+    Returns:
+        str: 十六进制哈希值
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for field in fields:
+        content = field.content if isinstance(field.content, str) else json.dumps(field.content, ensure_ascii=False, sort_keys=True)
+        digest.update(field.field_path.encode("utf-8"))
+        digest.update(b"\x00")
+        digest.update(content.encode("utf-8"))
+        digest.update(b"\x01")
+    return digest.hexdigest()
+
+
+class RowIndex:
+    """一次运行的输出索引：每个split中按输出顺序排列的行哈希"""
+
+    def __init__(self, format_name: str, from_lang: str):
+        """
+        初始化索引
+
+        Args:
+            format_name: 格式名称
+            from_lang: 源语言代码
+        """
+        self.format_name = format_name
+        self.from_lang = from_lang
+        self.splits: Dict[str, List[str]] = {}
+
+    def save(self, path: str) -> None:
+        """写入索引文件"""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({
+                "version": ROW_HASH_VERSION,
+                "format": self.format_name,
+                "from_lang": self.from_lang,
+                "splits": self.splits,
+            }, f)
+
+    @staticmethod
+    def load(path: str) -> Optional["RowIndex"]:
+        """读取索引文件，文件不存在或哈希版本不一致时返回None"""
+        if not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != ROW_HASH_VERSION:
+            return None
+        index = RowIndex(data["format"], data["from_lang"])
+        index.splits = data["splits"]
+        return index
+
+
+class PriorOutput:
+    """
+    之前一次运行的输出，用于增量翻译
+
+    按行哈希查找内容未变的数据项，复用其已有译文；之前运行中记录了失败字段的数据项不复用。
+    """
+
+    def __init__(self, output_dirs: Dict[str, str], format_handler: FormatHandler, from_lang: str,
+                 preload: bool = False):
+        """
+        打开之前的输出
+
+        Args:
+            output_dirs: 目标语言 -> 之前的输出目录
+            format_handler: 格式处理器
+            from_lang: 源语言代码
+            preload: 是否将之前的输出整体读入内存；输出写回同一目录时需要，避免读取被覆盖的文件
+
+        Raises:
+            FileNotFoundError: 缺少输出或行哈希索引时抛出
+            ValueError: 之前的输出使用了不同的格式或源语言时抛出
+        """
+        self.format_handler = format_handler
+        self._splits: Dict[str, Dict[str, Any]] = {}
+        self._locations: Dict[str, Tuple[str, int]] = {}
+
+        excluded = set()
+        indexes = []
+        for lang, output_dir in output_dirs.items():
+            index = RowIndex.load(os.path.join(output_dir, ROW_INDEX_FILENAME))
+            if index is None:
+                raise FileNotFoundError(f"No {ROW_INDEX_FILENAME} found in '{output_dir}'")
+            if index.format_name != format_handler.name or index.from_lang != from_lang:
+                raise ValueError(
+                    f"Previous output '{output_dir}' was translated with format '{index.format_name}' "
+                    f"from '{index.from_lang}', expected '{format_handler.name}' from '{from_lang}'"
+                )
+            indexes.append(index)
+            excluded |= set(FailureLog.group_by_row(FailureLog.load(os.path.join(output_dir, FAILED_FIELDS_FILENAME))))
+            splits = open_output_splits(output_dir)
+            if preload:
+                splits = {split: read_slice(rows, 0, len(rows)) for split, rows in splits.items()}
+            self._splits[lang] = splits
+
+        # 各目标语言的输出来自同一次运行，行顺序一致；同一哈希只复用第一次出现的位置
+        for split, hashes in indexes[0].splits.items():
+            for position, digest in enumerate(hashes):
+                if (split, position) not in excluded and digest not in self._locations:
+                    if all(index.splits.get(split, [])[position:position + 1] == [digest] for index in indexes[1:]):
+                        self._locations[digest] = (split, position)
+
+    def __len__(self) -> int:
+        return len(self._locations)
+
+    def lookup(self, digest: str, fields: List[TranslatableField]) -> Optional[Dict[str, List[TranslatableField]]]:
+        """
+        查找内容未变的数据项的已有译文
+
+        Args:
+            digest: 当前数据项的行哈希
+            fields: 当前数据项的可翻译字段
+
+        Returns:
+            Optional[Dict[str, List[TranslatableField]]]: 目标语言 -> 译文字段（与fields一一对应）；不可复用时返回None
+        """
+        location = self._locations.get(digest)
+        if location is None:
+            return None
+        split, position = location
+
+        lang_fields = {}
+        for lang, splits in self._splits.items():
+            rows = read_slice(splits[split], position, position + 1) if split in splits else []
+            if not rows:
+                return None
+            translated = {
+                field.field_path: field.content
+                for field in self.format_handler.extract_translatable_content(rows[0])
+            }
+            if any(field.field_path not in translated for field in fields):
+                return None
+            lang_fields[lang] = [replace(field, content=translated[field.field_path]) for field in fields]
+        return lang_fields
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any, Optional, Tuple, Union
 from dataclasses import dataclass
 
 @dataclass
@@ -24,6 +24,7 @@ class FormatHandler(ABC):
         self.name = config.get("name", "unknown")
         self.description = config.get("description", "")
         self.translatable_fields = config.get("translatable_fields", [])
+        self.conversation = config.get("conversation") or {}
     
     @abstractmethod
     def extract_translatable_content(self, item: Dict[str, Any]) -> List[TranslatableField]:
@@ -52,6 +53,64 @@ class FormatHandler(ABC):
         """
         pass
     
+    def extract_batch(self, items: List[Dict[str, Any]]) -> List[Union[List[TranslatableField], Exception]]:
+        """
+        批量提取可翻译内容，便于在线程池/进程池中按批执行
+
+        Args:
+            items: 数据项列表
+
+        Returns:
+            List[Union[List[TranslatableField], Exception]]: 每个数据项的可翻译字段，提取失败时为异常
+        """
+        results = []
+        for item in items:
+            try:
+                results.append(self.extract_translatable_content(item))
+            except Exception as e:
+                results.append(e)
+        return results
+
+    def reconstruct_batch(self, batch: List[Tuple[Dict[str, Any], Optional[List[TranslatableField]]]]) -> List[Union[Dict[str, Any], Exception]]:
+        """
+        批量重新组装数据项，便于在线程池/进程池中按批执行
+
+        Args:
+            batch: (原始数据项, 翻译后的字段列表) 列表，字段列表为None时原样返回数据项
+
+        Returns:
+            List[Union[Dict[str, Any], Exception]]: 重新组装后的数据项，组装失败时为异常
+        """
+        results = []
+        for item, translated_fields in batch:
+            if translated_fields is None:
+                results.append(item)
+                continue
+            try:
+                results.append(self.reconstruct_item(item, translated_fields))
+            except Exception as e:
+                results.append(e)
+        return results
+
+    def align_fields(self, source_item: Dict[str, Any], translated_item: Optional[Dict[str, Any]]) -> List[Tuple[str, Any, Any]]:
+        """
+        按配置的字段路径对齐原文与译文，用于并排对照检查翻译结果
+
+        Args:
+            source_item: 原始数据项
+            translated_item: 翻译后的数据项，可以为None
+
+        Returns:
+            List[Tuple[str, Any, Any]]: (字段路径, 原文, 译文) 列表，译文中缺失的字段为None
+        """
+        translated = {}
+        if translated_item is not None:
+            translated = {field.field_path: field.content for field in self.extract_translatable_content(translated_item)}
+        return [
+            (field.field_path, field.content, translated.get(field.field_path))
+            for field in self.extract_translatable_content(source_item)
+        ]
+
     def validate_item(self, item: Dict[str, Any]) -> bool:
         """
         验证数据项是否符合当前格式
@@ -62,14 +121,56 @@ class FormatHandler(ABC):
         Returns:
             bool: 是否符合格式要求
         """
-        # 基础验证：检查必需字段是否存在
+        # 基础验证：检查必需字段是否存在（路径类型字段检查第一段）
         for field_config in self.translatable_fields:
             if field_config.get("required", False):
                 field_name = field_config["field"]
+                if field_config.get("type") == "path":
+                    field_name = field_name.split(".")[0]
                 if field_name not in item:
                     return False
         return True
     
+    def group_conversation_fields(self, fields: List[TranslatableField]) -> List[List[int]]:
+        """
+        将同一列表字段中的连续轮次分组，用于按对话整体翻译
+
+        未启用对话模式时每个字段单独成组。分组大小受 conversation.max_chars（按字符数近似token）
+        和 conversation.max_turns 限制，超出时切分为多个窗口。
+
+        Args:
+            fields: 可翻译字段列表
+
+        Returns:
+            List[List[int]]: 字段下标分组
+        """
+        if not self.conversation.get("enabled", False):
+            return [[i] for i in range(len(fields))]
+
+        max_chars = self.conversation.get("max_chars", 8000)
+        max_turns = self.conversation.get("max_turns", 32)
+
+        groups = []
+        current: List[int] = []
+        current_key = None
+        current_size = 0
+        for i, field in enumerate(fields):
+            key = field.field_path.split('.')[0] if field.field_type == "list_item" else None
+            size = len(field.content) if isinstance(field.content, str) else 0
+            if current and (key is None or key != current_key or current_size + size > max_chars
+                            or len(current) >= max_turns):
+                groups.append(current)
+                current, current_size = [], 0
+            if key is None:
+                groups.append([i])
+                continue
+            current.append(i)
+            current_key = key
+            current_size += size
+        if current:
+            groups.append(current)
+        return groups
+    
     def get_field_value(self, item: Dict[str, Any], field_path: str) -> Any:
         """
         根据字段路径获取字段值
@@ -85,7 +186,7 @@ class FormatHandler(ABC):
         current = item
         
         for part in parts:
-            if part.isdigit():
+            if part.isdigit() and isinstance(current, list):
                 # 处理数组索引
                 index = int(part)
                 if isinstance(current, list) and 0 <= index < len(current):
@@ -115,7 +216,7 @@ class FormatHandler(ABC):
         
         # 导航到父对象
         for part in parts[:-1]:
-            if part.isdigit():
+            if part.isdigit() and isinstance(current, list):
                 index = int(part)
                 current = current[index]
             else:
@@ -123,7 +224,7 @@ class FormatHandler(ABC):
         
         # 设置最终值
         final_part = parts[-1]
-        if final_part.isdigit():
+        if final_part.isdigit() and isinstance(current, list):
             index = int(final_part)
             current[index] = value
         else:
@@ -1,16 +1,31 @@
 from typing import Dict, List, Any
 from .base import FormatHandler, TranslatableField
+from .paths import compile_path, walk_path
 
 class GenericFormatHandler(FormatHandler):
     """通用格式处理器，基于配置文件处理任意格式"""
+
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        # path类型字段的路径模式在初始化时编译一次，提取时直接按分段展开
+        self._compiled_paths = {
+            i: compile_path(field_config["field"])
+            for i, field_config in enumerate(self.translatable_fields)
+            if field_config.get("type") == "path"
+        }
     
     def extract_translatable_content(self, item: Dict[str, Any]) -> List[TranslatableField]:
         """从数据项中提取可翻译的内容"""
         translatable_content = []
         
-        for field_config in self.translatable_fields:
+        for config_index, field_config in enumerate(self.translatable_fields):
             field_name = field_config["field"]
             field_type = field_config.get("type", "string")
+
+            if field_type == "path":
+                # 处理带通配符的嵌套路径，如 messages.*.content.*.text
+                translatable_content.extend(self._extract_path(item, self._compiled_paths[config_index], field_config))
+                continue
             
             if field_name not in item:
                 continue
@@ -69,6 +84,26 @@ class GenericFormatHandler(FormatHandler):
         
         return translatable_content
     
+    def _extract_path(self, item: Dict[str, Any], path, field_config: Dict[str, Any]) -> List[TranslatableField]:
+        """按编译后的路径提取字符串字段，condition 作用于包含该字段的对象"""
+        condition = field_config.get("condition")
+        fields = []
+        for field_path, content, parent, first_index in walk_path(item, path):
+            if not content or not isinstance(content, str):
+                continue
+            if condition and not (isinstance(parent, dict) and self._check_condition(parent, condition)):
+                continue
+            fields.append(
+                TranslatableField(
+                    field_path=field_path,
+                    content=content,
+                    # 经过列表的字段按列表项处理，对话模式下同一顶层列表中的内容一起翻译
+                    field_type="list_item" if first_index is not None else "nested",
+                    index=first_index
+                )
+            )
+        return fields
+
     def reconstruct_item(self, item: Dict[str, Any], translated_fields: List[TranslatableField]) -> Dict[str, Any]:
         """将翻译后的内容重新组装到数据项中"""
         # 创建深拷贝避免修改原始数据
@@ -0,0 +1,74 @@
+from typing import Any, Iterator, List, Optional, Tuple, Union
+
+# 通配符：匹配列表的所有元素或对象的所有值
+WILDCARD = "*"
+
+# 编译后的路径：每段为对象键（str）、列表下标（int）或通配符
+CompiledPath = Tuple[Union[str, int], ...]
+
+
+def compile_path(pattern: str) -> CompiledPath:
+    """
+    将路径模式编译为分段元组，只在加载配置时执行一次
+
+    路径各段以 "." 分隔：普通段为对象键，数字段为列表下标，"*" 匹配列表的所有元素或对象的所有值，
+    例如 "messages.*.content.*.text"。
+
+    Args:
+        pattern: 路径模式
+
+    Returns:
+        CompiledPath: 编译后的路径
+
+    Raises:
+        ValueError: 路径为空或包含空段时抛出
+    """
+    if not isinstance(pattern, str) or not pattern:
+        raise ValueError(f"Invalid path pattern {pattern!r}")
+    segments = []
+    for part in pattern.split("."):
+        if not part:
+            raise ValueError(f"Empty segment in path pattern '{pattern}'")
+        segments.append(int(part) if part.isdigit() else part)
+    return tuple(segments)
+
+
+def walk_path(item: Any, path: CompiledPath) -> Iterator[Tuple[str, Any, Optional[Any], Optional[int]]]:
+    """
+    按编译后的路径逐段展开数据项，迭代实现，不对每个数据项递归调用
+
+    结果按文档顺序产出，字段路径中的通配符替换为实际的下标或键。
+
+    Args:
+        item: 数据项
+        path: 编译后的路径
+
+    Yields:
+        Tuple[str, Any, Optional[Any], Optional[int]]: (字段路径, 值, 值所在的对象或列表, 路径中第一个列表下标)
+    """
+    # (值, 已展开的字段路径, 所在的容器, 第一个列表下标)；路径按段拼接为字符串，避免每层构造元组
+    nodes: List[Tuple[Any, str, Any, Optional[int]]] = [(item, "", None, None)]
+    for segment in path:
+        expanded = []
+        append = expanded.append
+        for node, prefix, _, first_index in nodes:
+            if segment == WILDCARD:
+                if isinstance(node, list):
+                    for i, child in enumerate(node):
+                        append((child, f"{prefix}{i}.", node, i if first_index is None else first_index))
+                elif isinstance(node, dict):
+                    for key, child in node.items():
+                        append((child, f"{prefix}{key}.", node, first_index))
+            elif isinstance(segment, int):
+                if isinstance(node, list) and 0 <= segment < len(node):
+                    append((node[segment], f"{prefix}{segment}.", node, segment if first_index is None else first_index))
+                elif isinstance(node, dict) and str(segment) in node:
+                    append((node[str(segment)], f"{prefix}{segment}.", node, first_index))
+            elif isinstance(node, dict) and segment in node:
+                append((node[segment], f"{prefix}{segment}.", node, first_index))
+        if not expanded:
+            return
+        nodes = expanded
+
+    for value, prefix, parent, first_index in nodes:
+        yield prefix[:-1], value, parent, first_index
@@ -0,0 +1,35 @@
+import json
+from typing import Any, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # orjson为可选依赖，缺失时退回标准库json
+    orjson = None
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """解析JSON，优先使用orjson"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any, indent: Optional[int] = None) -> bytes:
+    """
+    将对象序列化为UTF-8编码的JSON
+
+    优先使用orjson（只支持紧凑输出和2空格缩进），遇到orjson不支持的缩进或类型时退回标准库json。
+
+    Args:
+        obj: 待序列化的对象
+        indent: 缩进空格数，None表示紧凑输出
+
+    Returns:
+        bytes: JSON
+    """
+    if orjson is not None and indent in (None, 2):
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+        except TypeError:
+            pass
+    return json.dumps(obj, ensure_ascii=False, indent=indent, default=str).encode("utf-8")
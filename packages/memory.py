@@ -0,0 +1,303 @@
+import os
+import json
+import zlib
+from array import array
+from typing import Dict, List, Optional, Tuple, Any
+import yaml
+from .readers import read_jsonl
+
+_MASK32 = 0xFFFFFFFF
+
+
+def normalize_segment(text: str) -> str:
+    """规范化文本片段：合并空白字符，用于精确匹配"""
+    return " ".join(text.split())
+
+
+def _shingles(text: str, ngram: int) -> List[bytes]:
+    """将规范化后的文本切分为字符n-gram"""
+    data = text.lower().encode("utf-8")
+    if len(data) <= ngram:
+        return [data]
+    return [data[i:i + ngram] for i in range(len(data) - ngram + 1)]
+
+
+def minhash_signature(text: str, num_perm: int = 32, ngram: int = 3) -> array:
+    """
+    计算文本的MinHash签名（单次哈希分桶的 one-permutation hashing）
+
+    每个n-gram只计算一次crc32，按哈希值落入的桶取最小值，开销与文本长度成线性关系。
+
+    Args:
+        text: 规范化后的文本
+        num_perm: 签名长度（桶数）
+        ngram: n-gram长度（按UTF-8字节计）
+
+    Returns:
+        array: 长度为num_perm的签名，空桶为0xFFFFFFFF
+    """
+    signature = array("I", [_MASK32]) * num_perm
+    bucket_size = (_MASK32 + 1) // num_perm
+    for shingle in _shingles(text, ngram):
+        h = zlib.crc32(shingle)
+        bucket = h // bucket_size
+        if h < signature[bucket]:
+            signature[bucket] = h
+    return signature
+
+
+def _signature_similarity(a: array, b: array) -> float:
+    """估计两个签名对应文本的Jaccard相似度，忽略两侧均为空的桶"""
+    same = 0
+    total = 0
+    for x, y in zip(a, b):
+        if x == _MASK32 and y == _MASK32:
+            continue
+        total += 1
+        if x == y:
+            same += 1
+    return same / total if total else 0.0
+
+
+class _PairIndex:
+    """单个语言对的翻译记忆索引"""
+
+    def __init__(self, num_perm: int, bands: int):
+        self.exact: Dict[str, str] = {}
+        self.sources: List[str] = []
+        self.targets: List[str] = []
+        self.signatures: List[bytes] = []
+        self.buckets: Dict[bytes, List[int]] = {}
+        self.num_perm = num_perm
+        self.bands = bands
+        self.band_width = (num_perm // bands) * 4
+
+    def band_keys(self, signature: bytes) -> List[bytes]:
+        """签名按band切分后的LSH桶键，全部为空桶的band不参与索引"""
+        empty = b"\xff" * self.band_width
+        keys = []
+        for band in range(self.bands):
+            chunk = signature[band * self.band_width:(band + 1) * self.band_width]
+            if chunk != empty:
+                keys.append(bytes((band,)) + chunk)
+        return keys
+
+
+class TranslationMemory:
+    """翻译记忆库：原文片段 -> 译文，支持精确匹配和基于MinHash LSH的模糊匹配"""
+
+    def __init__(self, path: str = None, num_perm: int = 32, bands: int = 8, threshold: float = 0.6,
+                 ngram: int = 3, max_candidates: int = 64):
+        """
+        初始化翻译记忆库
+
+        Args:
+            path: JSONL持久化文件路径，存在时自动加载
+            num_perm: MinHash签名长度
+            bands: LSH band数量，必须整除num_perm
+            threshold: 模糊匹配的最低相似度
+            ngram: 字符n-gram长度
+            max_candidates: 单次模糊查询最多比较的候选数量
+        """
+        if num_perm % bands != 0:
+            raise ValueError("num_perm must be divisible by bands")
+
+        self.path = path
+        self.num_perm = num_perm
+        self.bands = bands
+        self.threshold = threshold
+        self.ngram = ngram
+        self.max_candidates = max_candidates
+        self._pairs: Dict[Tuple[str, str], _PairIndex] = {}
+        self._unsaved: List[Dict[str, str]] = []
+
+        if path and os.path.exists(path):
+            self.load(path)
+
+    def __len__(self) -> int:
+        return sum(len(index.exact) for index in self._pairs.values())
+
+    def _index(self, from_lang: str, to_lang: str) -> _PairIndex:
+        key = (from_lang, to_lang)
+        if key not in self._pairs:
+            self._pairs[key] = _PairIndex(self.num_perm, self.bands)
+        return self._pairs[key]
+
+    def add(self, from_lang: str, to_lang: str, source: str, target: str, persist: bool = True) -> None:
+        """
+        添加一条翻译记忆
+
+        Args:
+            from_lang: 源语言代码
+            to_lang: 目标语言代码
+            source: 原文
+            target: 译文
+            persist: 是否在下次save时写入文件
+        """
+        index = self._index(from_lang, to_lang)
+        normalized = normalize_segment(source)
+        if not normalized or normalized in index.exact:
+            return
+
+        index.exact[normalized] = target
+        signature = minhash_signature(normalized, self.num_perm, self.ngram).tobytes()
+        segment_id = len(index.sources)
+        index.sources.append(source)
+        index.targets.append(target)
+        index.signatures.append(signature)
+        for key in index.band_keys(signature):
+            index.buckets.setdefault(key, []).append(segment_id)
+
+        if persist:
+            self._unsaved.append({"from": from_lang, "to": to_lang, "source": source, "target": target})
+
+    def lookup(self, from_lang: str, to_lang: str, source: str) -> Optional[str]:
+        """
+        精确查找译文
+
+        Returns:
+            Optional[str]: 命中时返回译文，否则返回None
+        """
+        index = self._pairs.get((from_lang, to_lang))
+        if index is None:
+            return None
+        return index.exact.get(normalize_segment(source))
+
+    def fuzzy_lookup(self, from_lang: str, to_lang: str, source: str, limit: int = 3) -> List[Tuple[float, str, str]]:
+        """
+        模糊查找相似的翻译记忆
+
+        Args:
+            from_lang: 源语言代码
+            to_lang: 目标语言代码
+            source: 原文
+            limit: 最多返回的条数
+
+        Returns:
+            List[Tuple[float, str, str]]: (相似度, 原文, 译文) 列表，按相似度降序
+        """
+        index = self._pairs.get((from_lang, to_lang))
+        if index is None:
+            return []
+
+        normalized = normalize_segment(source)
+        query = minhash_signature(normalized, self.num_perm, self.ngram)
+        candidates = set()
+        for key in index.band_keys(query.tobytes()):
+            for segment_id in index.buckets.get(key, ()):
+                candidates.add(segment_id)
+                if len(candidates) >= self.max_candidates:
+                    break
+            if len(candidates) >= self.max_candidates:
+                break
+
+        matches = []
+        for segment_id in candidates:
+            if index.sources[segment_id] == source:
+                continue
+            other = array("I")
+            other.frombytes(index.signatures[segment_id])
+            score = _signature_similarity(query, other)
+            if score >= self.threshold:
+                matches.append((score, index.sources[segment_id], index.targets[segment_id]))
+
+        matches.sort(key=lambda match: -match[0])
+        return matches[:limit]
+
+    def load(self, path: str) -> None:
+        """从JSONL文件加载翻译记忆"""
+        for record in read_jsonl(path):
+            self.add(record["from"], record["to"], record["source"], record["target"], persist=False)
+        print(f"Loaded {len(self)} translation memory segments from {path}")
+
+    def save(self, path: str = None) -> None:
+        """将新增的翻译记忆追加写入JSONL文件"""
+        path = path or self.path
+        if not path or not self._unsaved:
+            return
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            for record in self._unsaved:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        print(f"Saved {len(self._unsaved)} new translation memory segments to {path}")
+        self._unsaved.clear()
+
+
+class Glossary:
+    """术语表：在原文中查找术语并给出指定译法"""
+
+    def __init__(self, terms: Dict[str, Dict[str, str]] = None):
+        """
+        初始化术语表
+
+        Args:
+            terms: 术语 -> {目标语言代码: 译法}
+        """
+        self._terms: Dict[str, Tuple[str, Dict[str, str]]] = {}
+        self._max_words = 1
+        for term, targets in (terms or {}).items():
+            self.add(term, targets)
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def add(self, term: str, targets: Dict[str, str]) -> None:
+        """添加一个术语"""
+        key = " ".join(term.lower().split())
+        if not key:
+            return
+        self._terms[key] = (term, targets)
+        self._max_words = max(self._max_words, len(key.split()))
+
+    @classmethod
+    def from_file(cls, path: str) -> "Glossary":
+        """
+        从YAML或TSV文件加载术语表
+
+        YAML格式为 术语 -> {语言代码: 译法} 的映射；TSV每行为 "术语<TAB>语言代码<TAB>译法"。
+
+        Args:
+            path: 术语表文件路径
+
+        Returns:
+            Glossary: 术语表实例
+        """
+        glossary = cls()
+        if path.endswith((".yaml", ".yml")):
+            with open(path, "r", encoding="utf-8") as f:
+                data: Dict[str, Any] = yaml.safe_load(f) or {}
+            for term, targets in data.items():
+                glossary.add(str(term), {str(lang): str(target) for lang, target in targets.items()})
+        else:
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    parts = line.rstrip("\n").split("\t")
+                    if len(parts) == 3:
+                        term, lang, target = parts
+                        existing = glossary._terms.get(" ".join(term.lower().split()))
+                        targets = dict(existing[1]) if existing else {}
+                        targets[lang] = target
+                        glossary.add(term, targets)
+        print(f"Loaded {len(glossary)} glossary terms from {path}")
+        return glossary
+
+    def match(self, text: str, to_lang: str) -> List[Tuple[str, str]]:
+        """
+        查找原文中出现的术语
+
+        Args:
+            text: 原文
+            to_lang: 目标语言代码
+
+        Returns:
+            List[Tuple[str, str]]: (术语, 译法) 列表
+        """
+        words = [word.strip(".,;:!?()[]{}\"'") for word in text.lower().split()]
+        found = {}
+        for start in range(len(words)):
+            for length in range(1, min(self._max_words, len(words) - start) + 1):
+                entry = self._terms.get(" ".join(words[start:start + length]))
+                if entry and to_lang in entry[1]:
+                    found[entry[0]] = entry[1][to_lang]
+        return list(found.items())
@@ -0,0 +1,158 @@
+import asyncio
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+# CPU密集阶段的执行方式：inline（在事件循环中直接执行）、thread（线程池）、process（进程池）
+CPU_EXECUTORS = ["inline", "thread", "process"]
+
+
+def create_executor(executor_type: str, workers: Optional[int] = None, thread_name_prefix: str = "") -> Executor:
+    """
+    创建线程池或进程池
+
+    Args:
+        executor_type: thread 或 process
+        workers: 线程/进程数，默认由执行器决定
+        thread_name_prefix: 线程名前缀，仅线程池使用
+
+    Returns:
+        Executor: 执行器
+    """
+    if executor_type == "process":
+        # 进程池的依赖较重，只在需要时导入
+        from concurrent.futures import ProcessPoolExecutor
+        return ProcessPoolExecutor(max_workers=workers)
+    return ThreadPoolExecutor(max_workers=workers, thread_name_prefix=thread_name_prefix)
+
+
+class CpuOffload:
+    """
+    CPU密集阶段的执行器边界
+
+    字段提取、数据项重新组装（深拷贝）、译文校验和输出写入等CPU工作按批提交到线程池/进程池，
+    事件循环只负责网络I/O，避免CPU工作拖慢响应处理、抬高观测到的请求延迟。
+    """
+
+    def __init__(self, executor_type: str = "inline", workers: Optional[int] = None, batch_size: int = 256):
+        """
+        初始化执行器边界
+
+        Args:
+            executor_type: inline、thread 或 process
+            workers: 线程/进程数，默认由执行器决定
+            batch_size: 每批提交的数据项数量
+        """
+        if executor_type not in CPU_EXECUTORS:
+            raise ValueError(f"Unknown CPU executor '{executor_type}'. Available: {CPU_EXECUTORS}")
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+
+        self.executor_type = executor_type
+        self.batch_size = batch_size
+        self._executor: Optional[Executor] = None
+        # 写入文件等必须在当前进程内执行的工作使用单独的线程，保证同一写入器的调用按顺序执行
+        self._io_executor: Optional[Executor] = None
+        if executor_type != "inline":
+            self._executor = create_executor(executor_type, workers, thread_name_prefix="cpu")
+            self._io_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="io")
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """
+        在执行器中运行CPU密集函数（进程池模式下函数和参数需可序列化）
+
+        Args:
+            func: 函数
+            *args: 参数
+
+        Returns:
+            函数返回值
+        """
+        if self._executor is None:
+            return func(*args)
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    async def run_local(self, func: Callable[..., Any], *args: Any) -> Any:
+        """在当前进程的写入线程中运行需要共享状态的函数（如写入文件），inline模式下直接执行"""
+        if self._io_executor is None:
+            return func(*args)
+        return await asyncio.get_running_loop().run_in_executor(self._io_executor, func, *args)
+
+    async def map_batches(self, func: Callable[[List[Any]], List[Any]], items: Sequence[Any]) -> List[Any]:
+        """
+        将数据按 batch_size 分批并发提交给批处理函数，按原顺序合并结果
+
+        Args:
+            func: 接收一批数据、返回等长结果列表的函数
+            items: 数据
+
+        Returns:
+            List[Any]: 所有结果
+        """
+        batches = [list(items[start:start + self.batch_size]) for start in range(0, len(items), self.batch_size)]
+        results = await asyncio.gather(*(self.run(func, batch) for batch in batches))
+        return [result for batch_results in results for result in batch_results]
+
+    def close(self) -> None:
+        """关闭执行器"""
+        for executor in (self._executor, self._io_executor):
+            if executor is not None:
+                executor.shutdown()
+
+
+class LoopLagMonitor:
+    """
+    事件循环延迟监测
+
+    后台任务按固定间隔休眠，实际唤醒时间超出预期的部分即为事件循环被阻塞的时间。
+    """
+
+    def __init__(self, interval: float = 0.05):
+        """
+        初始化监测器
+
+        Args:
+            interval: 采样间隔（秒）
+        """
+        self.interval = interval
+        self.samples: List[float] = []
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """在当前事件循环中开始采样"""
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._run())
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, loop.time() - expected))
+
+    async def stop(self) -> None:
+        """停止采样"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def summary(self) -> Dict[str, float]:
+        """
+        延迟统计
+
+        Returns:
+            Dict[str, float]: 采样数及平均、p99、最大延迟（毫秒）
+        """
+        if not self.samples:
+            return {"samples": 0, "mean_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+        ordered = sorted(self.samples)
+        p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+        return {
+            "samples": len(ordered),
+            "mean_ms": round(sum(ordered) / len(ordered) * 1000, 2),
+            "p99_ms": round(p99 * 1000, 2),
+            "max_ms": round(ordered[-1] * 1000, 2),
+        }
@@ -1,9 +1,16 @@
+import time
 import asyncio
+import inspect
 import json
 import aiohttp
+from .autotune import ConcurrencyTuner
+from .recording import ReplayMiss, TrafficRecorder, TrafficReplayer
 
 class OpenAIHandler:
-    def __init__(self, model: str, openai_url: str, openai_key: str, max_retries: int = 5, use_ollama: bool = True, retry_delay: float = 1.0):
+    def __init__(self, model: str, openai_url: str, openai_key: str, max_retries: int = 5, use_ollama: bool = True, retry_delay: float = 1.0,
+                 session: aiohttp.ClientSession = None, connection_limit: int = 100,
+                 recorder: TrafficRecorder = None, replayer: TrafficReplayer = None,
+                 tuner: ConcurrencyTuner = None):
         """
         初始化 OpenAIHandler
         
@@ -13,6 +20,11 @@ class OpenAIHandler:
             openai_key: OpenAI API 密钥
             max_retries: 最大重试次数，默认5次
             retry_delay: 初始重试延迟(秒)，默认1秒
+            session: 可选的共享 aiohttp 会话，由调用方负责关闭；不提供时首次请求时创建，并在 close() 时关闭
+            connection_limit: 自行创建会话时连接池的最大连接数，默认100
+            recorder: 可选的录制器，记录每次请求尝试的响应和延迟
+            replayer: 可选的回放器，设置后不发送网络请求，直接回放录制的响应
+            tuner: 可选的并发调节器，限制同时进行的请求数并根据观测到的延迟自动调整
         """
         self.model = model
         self.openai_url = openai_url
@@ -20,6 +32,79 @@ class OpenAIHandler:
         self.use_ollama = use_ollama
         self.max_retries = max_retries
         self.retry_delay = retry_delay
+        self.connection_limit = connection_limit
+        self._session = session
+        self._owns_session = session is None
+        self.recorder = recorder
+        self.replayer = replayer
+        self.tuner = tuner
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        """获取复用的会话，所有请求共享同一个连接池"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=self.connection_limit))
+            self._owns_session = True
+        return self._session
+
+    async def _post(self, data: dict) -> dict:
+        """
+        发送一次请求并返回响应体，回放模式下直接返回录制的响应；设置了并发调节器时先等待名额
+
+        Args:
+            data: 请求体
+
+        Returns:
+            dict: 响应体
+        """
+        if self.tuner is None:
+            return await self._send(data)
+
+        await self.tuner.acquire()
+        started = time.perf_counter()
+        ok = False
+        try:
+            result = await self._send(data)
+            ok = "error" not in result
+            return result
+        finally:
+            self.tuner.release(time.perf_counter() - started, ok)
+
+    async def _send(self, data: dict) -> dict:
+        """发送一次请求（或回放录制的响应），按需记录到录制文件"""
+        if self.replayer is not None:
+            return await self.replayer.replay(data)
+
+        headers = {
+            "Authorization": f"Bearer {self.openai_key}",
+            "Content-Type": "application/json"
+        }
+        session = await self.get_session()
+        started = time.perf_counter()
+        try:
+            async with session.post(self.openai_url, headers=headers, json=data, timeout=60) as response:
+                result = await response.json()
+        except Exception as e:
+            if self.recorder is not None:
+                self.recorder.record(data, started, error=e)
+            raise
+        if self.recorder is not None:
+            self.recorder.record(data, started, result=result)
+        return result
+
+    async def close(self) -> None:
+        """关闭自行创建的会话和录制文件"""
+        if self.recorder is not None:
+            self.recorder.close()
+        if self._owns_session and self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def __aenter__(self) -> "OpenAIHandler":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
     def get_config(self) -> dict:
         """
         获取当前配置
@@ -42,7 +127,7 @@ class OpenAIHandler:
             messages: 消息列表
             model: 模型名称,默认使用初始化时设置的模型
             temp: 温度参数,控制随机性,默认0.7
-            validator_callback: 可选的验证回调函数 (对响应内容进行验证)
+            validator_callback: 可选的验证回调函数 (对响应内容进行验证)，可以是协程函数
             
         Returns:
             str: OpenAI的响应文本
@@ -50,14 +135,8 @@ class OpenAIHandler:
         Raises:
             Exception: 当API调用失败或验证失败时抛出异常
         """
-        url = self.openai_url
         model = model or self.model
         
-        headers = {
-            "Authorization": f"Bearer {self.openai_key}",
-            "Content-Type": "application/json"
-        }
-        
         data = {
             "model": model,
             "messages": messages,
@@ -66,27 +145,28 @@ class OpenAIHandler:
         
         retry_delay = self.retry_delay
         
-        async with aiohttp.ClientSession() as session:
-            for attempt in range(self.max_retries):
-                try:
-                    async with session.post(url, headers=headers, json=data, timeout=60) as response:
-                        result = await response.json()
+        for attempt in range(self.max_retries):
+            try:
+                result = await self._post(data)
 
-                        if "error" in result:
-                            raise Exception(f"OpenAI API错误: {result['error']}")
+                if "error" in result:
+                    raise Exception(f"OpenAI API错误: {result['error']}")
 
-                        content = result["choices"][0]["message"]["content"]
+                content = result["choices"][0]["message"]["content"]
 
-                        if validator_callback:
-                            validator_callback(content)
+                if validator_callback:
+                    validation = validator_callback(content)
+                    if inspect.isawaitable(validation):
+                        await validation
 
-                        return content
+                return content
 
-                except Exception as e:
-                    print(f"openai request 第 {attempt + 1} 次重试，错误信息: {str(e)}")
-                    if attempt == self.max_retries - 1:  # 最后一次重试
-                        raise Exception(f"请求OpenAI失败(重试{self.max_retries}次): {str(e)}")
-                    await asyncio.sleep(retry_delay)
+            except Exception as e:
+                print(f"openai request 第 {attempt + 1} 次重试，错误信息: {str(e)}")
+                # 最后一次重试；回放时没有录制的请求重试也不会命中
+                if attempt == self.max_retries - 1 or isinstance(e, ReplayMiss):
+                    raise Exception(f"请求OpenAI失败(重试{self.max_retries}次): {str(e)}") from e
+                await asyncio.sleep(retry_delay)
 
     async def request_json(self, messages: list, model: str = None, temp: float = 0.7, validator_callback=None) -> dict:
         """
@@ -96,7 +176,7 @@ class OpenAIHandler:
             messages: 消息列表
             model: 模型名称,默认使用初始化时设置的模型
             temp: 温度参数,控制随机性,默认0.7
-            validator_callback: 可选的JSON验证回调函数
+            validator_callback: 可选的JSON验证回调函数，可以是协程函数
             
         Returns:
             dict: OpenAI的JSON响应
@@ -104,14 +184,8 @@ class OpenAIHandler:
         Raises:
             Exception: 当API调用失败或JSON验证失败时抛出异常
         """
-        url = self.openai_url
         model = model or self.model
         
-        headers = {
-            "Authorization": f"Bearer {self.openai_key}",
-            "Content-Type": "application/json"
-        }
-        
         data = {
             "model": model,
             "messages": messages,
@@ -121,30 +195,31 @@ class OpenAIHandler:
         
         retry_delay = self.retry_delay
         
-        async with aiohttp.ClientSession() as session:
-            for attempt in range(self.max_retries):
-                try:
-                    async with session.post(url, headers=headers, json=data, timeout=60) as response:
-                        result = await response.json()
+        for attempt in range(self.max_retries):
+            try:
+                result = await self._post(data)
 
-                        if "error" in result:
-                            raise Exception(f"OpenAI API错误: {result['error']}")
+                if "error" in result:
+                    raise Exception(f"OpenAI API错误: {result['error']}")
 
-                        json_response_str = result["choices"][0]["message"]["content"]
+                json_response_str = result["choices"][0]["message"]["content"]
 
-                        try:
-                            json_response = json.loads(json_response_str)
+                try:
+                    json_response = json.loads(json_response_str)
 
-                            # 如果提供了验证回调,则进行验证
-                            if validator_callback:
-                                validator_callback(json_response)
+                    # 如果提供了验证回调,则进行验证
+                    if validator_callback:
+                        validation = validator_callback(json_response)
+                        if inspect.isawaitable(validation):
+                            await validation
 
-                            return json_response
-                        except json.JSONDecodeError as e:
-                            raise Exception(f"解析 OpenAI JSON 响应失败: {str(e)}: {json_response_str}")
+                    return json_response
+                except json.JSONDecodeError as e:
+                    raise Exception(f"解析 OpenAI JSON 响应失败: {str(e)}: {json_response_str}") from e
 
-                except Exception as e:
-                    print(f"openai json request 第 {attempt + 1} 次重试，错误信息: {str(e)}")
-                    if attempt == self.max_retries - 1:  # 最后一次重试
-                        raise Exception(f"请求OpenAI JSON失败(重试{self.max_retries}次): {str(e)}")
-                    await asyncio.sleep(retry_delay)
+            except Exception as e:
+                print(f"openai json request 第 {attempt + 1} 次重试，错误信息: {str(e)}")
+                # 最后一次重试；回放时没有录制的请求重试也不会命中
+                if attempt == self.max_retries - 1 or isinstance(e, ReplayMiss):
+                    raise Exception(f"请求OpenAI JSON失败(重试{self.max_retries}次): {str(e)}") from e
+                await asyncio.sleep(retry_delay)
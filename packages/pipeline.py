@@ -0,0 +1,386 @@
+import asyncio
+from collections import deque
+from dataclasses import replace
+from typing import Any, AsyncIterable, AsyncIterator, Awaitable, Callable, Deque, Dict, Iterable, List, Optional, Tuple, Union
+from .config import check_translation_settings
+from .delta import PriorOutput, row_hash
+from .formats.base import FormatHandler, TranslatableField
+from .memory import TranslationMemory, Glossary
+from .offload import CpuOffload
+from .openai import OpenAIHandler
+from .prefilter import ContentFilter
+from .profiling import StageTimer
+from .prompts import PromptBuilder
+from .quarantine import FailureLog, WHOLE_ITEM
+from .scheduler import ReorderBuffer, item_cost, schedule_order
+from .translate import OpenAITranslator
+from .validators import TranslationValidator
+
+# 目标语言 -> 翻译后的字段列表，None表示保留原数据项
+LangFields = Dict[str, Optional[List[TranslatableField]]]
+
+
+class DatasetTranslator:
+    """
+    数据集翻译器：可嵌入其他服务的异步翻译接口
+
+    负责字段提取、前置过滤与遮蔽、逐字段/按对话整体翻译、失败字段隔离和数据项重新组装，
+    不涉及环境变量、数据集加载和结果写入。多个翻译器可以共享同一个 OpenAIHandler（连接池）、
+    翻译记忆库和术语表。
+    """
+
+    def __init__(self, openai_handler: OpenAIHandler, format_handler: FormatHandler, from_lang: str = "en",
+                 to_langs: Union[str, List[str]] = "zh-CN", max_concurrent: int = 5,
+                 memory: TranslationMemory = None, glossary: Glossary = None, multi_target_json: bool = False,
+                 offload: CpuOffload = None, failures: FailureLog = None, stages: StageTimer = None):
+        """
+        初始化数据集翻译器
+
+        Args:
+            openai_handler: OpenAI请求处理器，可在多个翻译器之间共享
+            format_handler: 格式处理器，其配置中的 prefilter、prompt、validation 部分同时生效
+            from_lang: 源语言代码，默认en
+            to_langs: 目标语言代码或代码列表，默认zh-CN
+            max_concurrent: 同时翻译的数据项数量上限，默认5
+            memory: 可选的翻译记忆库
+            glossary: 可选的术语表
+            multi_target_json: 多目标语言时是否用一次JSON模式请求同时翻译所有语言，失败时逐语言回退；
+                               对话模式下只用于对话窗口之外的单个字段
+            offload: CPU密集阶段的执行器边界，默认在事件循环中直接执行
+            failures: 失败字段记录，默认新建
+            stages: 各阶段（extract、hash、delta、translate、reconstruct）的耗时统计，默认新建
+        """
+        self.to_langs = [to_langs] if isinstance(to_langs, str) else list(to_langs)
+        config = format_handler.config
+        errors, warnings = check_translation_settings(config, from_lang, self.to_langs, multi_target_json)
+        if errors:
+            raise ValueError(errors[0])
+        for warning in warnings:
+            print(f"Warning: {warning}")
+        self.format_handler = format_handler
+        self.from_lang = from_lang
+        self.max_concurrent = max_concurrent
+        self.multi_target_json = multi_target_json
+        self.offload = offload or CpuOffload()
+        self.failures = failures or FailureLog()
+        self.stages = stages or StageTimer()
+        self.content_filter = ContentFilter(config.get("prefilter"))
+        self.prompts = PromptBuilder(config.get("prompt"))
+        self.validator = TranslationValidator(config.get("validation"))
+        # 校验需在格式配置中显式启用，未启用时不在请求的重试循环内校验响应
+        self.translator = OpenAITranslator(openai_handler, memory=memory, glossary=glossary, prompts=self.prompts,
+                                           validator=self.validator if self.validator.enabled else None,
+                                           offload=self.offload)
+        self.semaphore = asyncio.Semaphore(max_concurrent)
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """请求、翻译记忆、前置过滤和校验的统计信息"""
+        return {
+            **self.translator.stats,
+            "prefilter_skipped": self.content_filter.skipped,
+            "validation_rejected": dict(self.validator.stats),
+        }
+
+    def record_failure(self, split_name: str, index: int, field_path: str, lang: str, error: Exception) -> None:
+        """记录失败的字段，失败字段保留原文，之后可通过 --retry_failed 重新翻译"""
+        print(f"Error translating field {field_path} of {split_name}[{index}] to {lang}: {str(error)}")
+        self.failures.record(split_name, index, field_path, lang, error)
+
+    async def extract_fields(self, items: List[Dict], split_name: str = "train", start: int = 0) -> List[List[TranslatableField]]:
+        """
+        按批提取数据项的可翻译字段，提取失败的数据项记录后视为没有可翻译内容
+
+        Args:
+            items: 数据项列表
+            split_name: split名称
+            start: 第一个数据项的下标
+
+        Returns:
+            List[List[TranslatableField]]: 每个数据项的可翻译字段
+        """
+        with self.stages.span("extract"):
+            item_fields = await self.offload.map_batches(self.format_handler.extract_batch, items)
+        for offset, fields in enumerate(item_fields):
+            if isinstance(fields, Exception):
+                for lang in self.to_langs:
+                    self.record_failure(split_name, start + offset, WHOLE_ITEM, lang, fields)
+                item_fields[offset] = []
+        return item_fields
+
+    async def translate_field(self, field: TranslatableField, split_name: str, index: int, langs: List[str]) -> Dict[str, str]:
+        """将一个字段翻译为指定的目标语言，返回 目标语言 -> 译文（跳过或失败的语言不包含在内）"""
+        # 跳过无需翻译的内容（代码、URL、数字、已是目标语言等）
+        langs = [lang for lang in langs if self.content_filter.check(field.content, self.from_lang, lang)]
+        if not langs:
+            return {}
+
+        masked_content, masked_segments = self.content_filter.mask(field.content)
+        if self.content_filter.is_masked_only(masked_content):
+            self.content_filter.stats["masked_only"] += len(langs)
+            return {}
+
+        raw_translations = {}
+        if self.multi_target_json and len(langs) > 1:
+            try:
+                raw_translations = await self.translator.translate_multi(self.from_lang, langs, masked_content)
+            except Exception as e:
+                # JSON响应无效或语言不全时逐语言回退翻译
+                print(f"Error translating {field.field_path} to {langs} in one request, falling back to per-language requests: {str(e)}")
+                self.translator.stats["multi_target_fallbacks"] += 1
+        if not raw_translations:
+            results = await asyncio.gather(
+                *(self.translator.translate(from_lang=self.from_lang, to_lang=lang, text=masked_content) for lang in langs),
+                return_exceptions=True
+            )
+            for lang, result in zip(langs, results):
+                if isinstance(result, Exception):
+                    self.record_failure(split_name, index, field.field_path, lang, result)
+                else:
+                    raw_translations[lang] = result
+
+        translations = {}
+        for lang, translated_content in raw_translations.items():
+            try:
+                translations[lang] = self.content_filter.unmask(translated_content, masked_segments)
+            except ValueError as e:
+                self.record_failure(split_name, index, field.field_path, lang, e)
+                continue
+            self.translator.remember(self.from_lang, lang, masked_content, translated_content)
+        return translations
+
+    async def translate_window(self, fields: List[TranslatableField], split_name: str, index: int,
+                               langs: List[str]) -> List[Dict[str, str]]:
+        """将一段对话的多轮内容按对话整体翻译为指定的目标语言，返回每个字段的 目标语言 -> 译文"""
+        results = [{} for _ in fields]
+        masked = [self.content_filter.mask(field.content) for field in fields]
+
+        async def translate_window_lang(lang: str):
+            turns = [
+                i for i, field in enumerate(fields)
+                if self.content_filter.check(field.content, self.from_lang, lang)
+                and not self.content_filter.is_masked_only(masked[i][0])
+            ]
+            if not turns:
+                return
+            try:
+                translated = await self.translator.translate_conversation(self.from_lang, lang, [masked[i][0] for i in turns])
+            except Exception as e:
+                print(f"Error translating conversation window to {lang}, falling back to per-turn requests: {str(e)}")
+                translated = {}
+
+            for position, i in enumerate(turns):
+                try:
+                    translated_content = translated.get(position)
+                    if translated_content is None:
+                        # 对话整体翻译中缺失或无效的轮次逐轮回退翻译
+                        translated_content = await self.translator.translate(from_lang=self.from_lang, to_lang=lang, text=masked[i][0])
+                    results[i][lang] = self.content_filter.unmask(translated_content, masked[i][1])
+                    self.translator.remember(self.from_lang, lang, masked[i][0], translated_content)
+                except Exception as e:
+                    self.record_failure(split_name, index, fields[i].field_path, lang, e)
+
+        await asyncio.gather(*(translate_window_lang(lang) for lang in langs))
+        return results
+
+    async def translate_item(self, index: int, item: Dict, translatable_fields: List[TranslatableField],
+                             split_name: str = "train", langs: List[str] = None) -> Tuple[int, LangFields]:
+        """
+        翻译单个数据项，返回 (原始索引, 目标语言 -> 翻译后的字段列表)；langs默认为所有目标语言
+
+        字段列表为None表示保留原数据项，重新组装由 reconstruct_items 按批完成
+        """
+        langs = langs or self.to_langs
+        async with self.semaphore:
+            with self.stages.span("translate"):
+                try:
+                    if not translatable_fields:
+                        print(f"No translatable content found in item: {item}")
+                        return index, {lang: None for lang in langs}
+
+                    # 翻译所有字段，每个字段的各目标语言并发请求；对话模式下同一对话的多轮内容合并为一次请求
+                    field_translations: List[Dict[str, str]] = [{} for _ in translatable_fields]
+                    for group in self.format_handler.group_conversation_fields(translatable_fields):
+                        group = [
+                            i for i in group
+                            if translatable_fields[i].content and isinstance(translatable_fields[i].content, str)
+                        ]
+                        if len(group) == 1:
+                            field_translations[group[0]] = await self.translate_field(
+                                translatable_fields[group[0]], split_name, index, langs
+                            )
+                        elif group:
+                            translations = await self.translate_window(
+                                [translatable_fields[i] for i in group], split_name, index, langs
+                            )
+                            for i, field_translation in zip(group, translations):
+                                field_translations[i] = field_translation
+
+                    return index, {
+                        lang: [
+                            replace(field, content=translations.get(lang, field.content))
+                            for field, translations in zip(translatable_fields, field_translations)
+                        ]
+                        for lang in langs
+                    }
+
+                except Exception as e:
+                    # 整条数据项失败时保留原文并记录，之后可通过 --retry_failed 重新翻译
+                    for lang in langs:
+                        self.record_failure(split_name, index, WHOLE_ITEM, lang, e)
+                    return index, {lang: None for lang in langs}
+
+    async def reconstruct_items(self, split_name: str, lang: str,
+                                entries: List[Tuple[int, Dict, Optional[List[TranslatableField]]]]) -> List[Dict]:
+        """按批重新组装数据项，entries为 (原始索引, 原始数据项, 翻译后的字段列表)，组装失败的数据项保留原文"""
+        with self.stages.span("reconstruct"):
+            rows = await self.offload.run(self.format_handler.reconstruct_batch, [(item, fields) for _, item, fields in entries])
+        for position, ((index, item, _), row) in enumerate(zip(entries, rows)):
+            if isinstance(row, Exception):
+                self.record_failure(split_name, index, WHOLE_ITEM, lang, row)
+                rows[position] = item
+        return rows
+
+    async def translate_split(self, items: List[Dict], split_name: str,
+                              emit: Callable[[str, List[Dict]], Awaitable[None]], scheduling: str = "lpt",
+                              prior: PriorOutput = None) -> List[str]:
+        """
+        翻译一个split的全部数据项
+
+        按调度策略提交翻译，结果经重排缓冲区按原始顺序就绪后按批重新组装，再交给 emit 写出。
+        提供之前的输出时，可翻译内容未变的数据项直接复用已有译文，只翻译新增或修改的数据项。
+
+        Args:
+            items: 数据项列表
+            split_name: split名称
+            emit: 接收 (目标语言, 按原始顺序排列的一批翻译结果) 的协程函数
+            scheduling: 调度策略（fifo、lpt、bucket），不影响输出顺序
+            prior: 可选的之前一次运行的输出
+
+        Returns:
+            List[str]: 每个数据项的行哈希，用于写入输出索引
+        """
+        item_fields = await self.extract_fields(items, split_name)
+        with self.stages.span("hash"):
+            hashes = [row_hash(fields) for fields in item_fields]
+
+        reused: Dict[int, LangFields] = {}
+        if prior is not None:
+            with self.stages.span("delta"):
+                for index, (digest, fields) in enumerate(zip(hashes, item_fields)):
+                    lang_fields = prior.lookup(digest, fields) if fields else None
+                    if lang_fields is not None:
+                        reused[index] = lang_fields
+            self.translator.stats["reused_rows"] += len(reused)
+
+        pending = [index for index in range(len(items)) if index not in reused]
+        order = [pending[i] for i in schedule_order([item_cost(item_fields[index]) for index in pending], scheduling)]
+
+        ready: List[Tuple[int, LangFields]] = []
+
+        async def emit_ready():
+            batch = ready[:]
+            ready.clear()
+            for lang in self.to_langs:
+                rows = await self.reconstruct_items(
+                    split_name, lang, [(index, items[index], lang_fields[lang]) for index, lang_fields in batch]
+                )
+                await emit(lang, rows)
+
+        reorder_buffer = ReorderBuffer(ready.append)
+        tasks = [asyncio.ensure_future(self.translate_item(i, items[i], item_fields[i], split_name)) for i in order]
+        for index, lang_fields in reused.items():
+            reorder_buffer.push(index, (index, lang_fields))
+            if len(ready) >= self.offload.batch_size:
+                await emit_ready()
+        for future in asyncio.as_completed(tasks):
+            index, lang_fields = await future
+            reorder_buffer.push(index, (index, lang_fields))
+            if len(ready) >= self.offload.batch_size:
+                await emit_ready()
+        reorder_buffer.close()
+        if ready:
+            await emit_ready()
+        return hashes
+
+    async def translate_batch(self, rows: List[Dict], split_name: str = "train",
+                              scheduling: str = "lpt") -> Dict[str, List[Dict]]:
+        """
+        翻译一批数据项
+
+        Args:
+            rows: 数据项列表
+            split_name: split名称，用于失败记录
+            scheduling: 调度策略
+
+        Returns:
+            Dict[str, List[Dict]]: 目标语言 -> 与输入顺序一致的翻译结果
+        """
+        results: Dict[str, List[Dict]] = {lang: [] for lang in self.to_langs}
+
+        async def collect(lang: str, translated_rows: List[Dict]):
+            results[lang].extend(translated_rows)
+
+        await self.translate_split(list(rows), split_name, collect, scheduling)
+        return results
+
+    async def translate_rows(self, rows: Union[AsyncIterable[Dict], Iterable[Dict]], split_name: str = "train",
+                             window: int = None) -> AsyncIterator[Dict[str, Dict]]:
+        """
+        流式翻译数据项：逐条读取输入，按输入顺序逐条产出翻译结果
+
+        同时处理中的数据项不超过 window 条，输入来不及消费时不会无限制地读取。
+
+        Args:
+            rows: 数据项的异步或同步可迭代对象
+            split_name: split名称，用于失败记录
+            window: 同时处理的最大数据项数量，默认 max_concurrent 的4倍
+
+        Yields:
+            Dict[str, Dict]: 目标语言 -> 翻译后的数据项
+        """
+        window = window or self.max_concurrent * 4
+        in_flight: Deque[Tuple[int, Dict, asyncio.Future]] = deque()
+
+        async def start(index: int, item: Dict) -> Tuple[int, LangFields]:
+            fields = (await self.extract_fields([item], split_name, start=index))[0]
+            return await self.translate_item(index, item, fields, split_name)
+
+        async def pop_ready() -> List[Dict[str, Dict]]:
+            # 等待最早提交的数据项完成，连同其后已完成的数据项一起按批重新组装
+            await in_flight[0][2]
+            batch = []
+            while in_flight and in_flight[0][2].done() and len(batch) < self.offload.batch_size:
+                index, item, task = in_flight.popleft()
+                batch.append((index, item, task.result()[1]))
+            lang_rows = {
+                lang: await self.reconstruct_items(split_name, lang, [(index, item, lang_fields[lang]) for index, item, lang_fields in batch])
+                for lang in self.to_langs
+            }
+            return [{lang: lang_rows[lang][position] for lang in self.to_langs} for position in range(len(batch))]
+
+        try:
+            index = 0
+            async for item in _aiter(rows):
+                in_flight.append((index, item, asyncio.ensure_future(start(index, item))))
+                index += 1
+                if len(in_flight) >= window:
+                    for result in await pop_ready():
+                        yield result
+            while in_flight:
+                for result in await pop_ready():
+                    yield result
+        finally:
+            # 调用方提前停止迭代时取消仍在处理的数据项
+            for _, _, task in in_flight:
+                task.cancel()
+
+
+async def _aiter(rows: Union[AsyncIterable[Dict], Iterable[Dict]]) -> AsyncIterator[Dict]:
+    """将同步或异步可迭代对象统一为异步迭代"""
+    if hasattr(rows, "__aiter__"):
+        async for row in rows:
+            yield row
+    else:
+        for row in rows:
+            yield row
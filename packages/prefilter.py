@@ -0,0 +1,263 @@
+import re
+import json
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+# 各文字系统的Unicode区间
+SCRIPT_RANGES = {
+    "han": [(0x3400, 0x4DBF), (0x4E00, 0x9FFF), (0xF900, 0xFAFF)],
+    "kana": [(0x3040, 0x30FF), (0x31F0, 0x31FF)],
+    "hangul": [(0xAC00, 0xD7AF), (0x1100, 0x11FF)],
+    "cyrillic": [(0x0400, 0x04FF)],
+    "arabic": [(0x0600, 0x06FF)],
+    "latin": [(0x0041, 0x005A), (0x0061, 0x007A), (0x00C0, 0x024F)],
+}
+
+# 语言代码（取主标签）到其主要文字系统的映射
+LANGUAGE_SCRIPTS = {
+    "zh": ("han",),
+    "ja": ("kana", "han"),
+    "ko": ("hangul",),
+    "ru": ("cyrillic",),
+    "uk": ("cyrillic",),
+    "ar": ("arabic",),
+    "en": ("latin",),
+    "fr": ("latin",),
+    "de": ("latin",),
+    "es": ("latin",),
+    "it": ("latin",),
+    "pt": ("latin",),
+}
+
+# 判定为该语言时必须出现的文字系统（例如日语与中文共用汉字，需要包含假名才视为日语）
+REQUIRED_SCRIPTS = {
+    "ja": "kana",
+}
+
+# 默认启用的跳过规则
+DEFAULT_RULES = ["empty", "url", "number", "json", "code", "identifier", "target_language"]
+# 默认在混合内容中遮蔽的片段类型
+DEFAULT_MASKS = ["code_fence", "inline_code", "url"]
+
+# URL在反引号和占位符起始 "{{" 处结束，避免吞掉紧邻的已遮蔽片段
+_URL_CHARS = r"(?:(?!\{\{)[^\s<>\"'`])+"
+_URL_PATTERN = rf"(?:https?|ftp)://{_URL_CHARS}|www\.{_URL_CHARS}"
+MASK_PATTERNS = {
+    "code_fence": re.compile(r"```.*?```|~~~.*?~~~", re.DOTALL),
+    "inline_code": re.compile(r"`[^`\n]+`"),
+    "url": re.compile(_URL_PATTERN),
+}
+
+_RULE_PATTERNS = {
+    "url": re.compile(rf"^\s*(?:(?:{_URL_PATTERN}|[\w.+-]+@[\w-]+\.[\w.-]+)\s*)+$"),
+    "number": re.compile(r"^[\s\d.,:;%+\-*/=()<>^$€¥£#]+$"),
+    # 整段只有一个代码块（块内不含其他围栏）；代码与说明文字混合的内容交给遮蔽处理
+    "code": re.compile(r"^\s*(?:```(?:(?!```).)*```|~~~(?:(?!~~~).)*~~~)\s*$", re.DOTALL),
+    # 单个不含空格、带有下划线/路径/数字/驼峰等特征的标识符，例如 snake_case、a/b.py、v1.2；
+    # 只匹配ASCII字符，避免把含数字或冒号的中日韩句子（如 "第1章"）当作标识符
+    "identifier": re.compile(r"^\s*(?=\S*(?:\w[_/\\.:]\w|\d|[a-z][A-Z]))[\w./\\:+-]+\s*$", re.ASCII),
+}
+
+PLACEHOLDER = "{{KEEP_%d}}"
+_PLACEHOLDER_PATTERN = re.compile(r"\{\{KEEP_(\d+)\}\}")
+
+
+def primary_language(lang: str) -> str:
+    """语言代码的主标签，例如 zh-CN -> zh"""
+    return lang.split("-")[0].split("_")[0].lower()
+
+
+def target_scripts(from_lang: str, to_lang: str) -> Optional[Tuple[str, ...]]:
+    """
+    获取可用于按字符判断目标语言的文字系统
+
+    Args:
+        from_lang: 源语言代码
+        to_lang: 目标语言代码
+
+    Returns:
+        Optional[Tuple[str, ...]]: 目标语言的文字系统；语言未知或源语言与目标语言使用相同文字系统时
+                                   无法通过字符判断，返回None
+    """
+    scripts = LANGUAGE_SCRIPTS.get(primary_language(to_lang))
+    source_scripts = LANGUAGE_SCRIPTS.get(primary_language(from_lang))
+    if not scripts or not source_scripts or set(scripts) & set(source_scripts):
+        return None
+    return scripts
+
+
+def missing_required_script(text: str, to_lang: str) -> bool:
+    """目标语言必需的文字系统（如日语假名）是否完全没有出现在文本中"""
+    required = REQUIRED_SCRIPTS.get(primary_language(to_lang))
+    return required is not None and script_ratio(text, (required,)) == 0
+
+
+def script_ratio(text: str, scripts: Tuple[str, ...]) -> float:
+    """
+    计算文本字母类字符中属于指定文字系统的比例
+
+    Args:
+        text: 文本
+        scripts: 文字系统名称（见 SCRIPT_RANGES）
+
+    Returns:
+        float: 比例，文本中没有字母类字符时返回0
+    """
+    ranges = [r for script in scripts for r in SCRIPT_RANGES[script]]
+    letters = 0
+    matched = 0
+    for char in text:
+        if not char.isalpha():
+            continue
+        letters += 1
+        code = ord(char)
+        for low, high in ranges:
+            if low <= code <= high:
+                matched += 1
+                break
+    return matched / letters if letters else 0.0
+
+
+class ContentFilter:
+    """翻译前置过滤器：跳过无需翻译的内容，并遮蔽混合内容中不应翻译的片段"""
+
+    def __init__(self, config: Dict[str, Any] = None):
+        """
+        初始化过滤器
+
+        Args:
+            config: 格式配置中的 prefilter 部分，支持的键：
+                enabled: 是否启用，默认false（需在格式配置中显式启用）
+                rules: 启用的跳过规则，默认 DEFAULT_RULES
+                mask: 遮蔽的片段类型，默认 DEFAULT_MASKS
+                patterns: 额外的正则表达式，整段匹配时跳过
+                target_script_ratio: 判定为已是目标语言的文字比例阈值，默认0.5
+        """
+        config = config or {}
+        self.enabled = config.get("enabled", False)
+        self.rules = config.get("rules", DEFAULT_RULES)
+        self.masks = config.get("mask", DEFAULT_MASKS)
+        self.patterns = [re.compile(pattern, re.DOTALL) for pattern in config.get("patterns", [])]
+        self.target_script_ratio = config.get("target_script_ratio", 0.5)
+        self.stats = Counter()
+
+        unknown = [rule for rule in self.rules if rule not in DEFAULT_RULES]
+        unknown += [mask for mask in self.masks if mask not in MASK_PATTERNS]
+        if unknown:
+            raise ValueError(f"Unknown prefilter rules: {unknown}")
+
+    def classify(self, text: str, from_lang: str, to_lang: str) -> Optional[str]:
+        """
+        判断文本是否无需翻译
+
+        Args:
+            text: 待翻译文本
+            from_lang: 源语言代码
+            to_lang: 目标语言代码
+
+        Returns:
+            Optional[str]: 命中的规则名称；需要翻译时返回None
+        """
+        if not self.enabled:
+            return None
+
+        for rule in self.rules:
+            if rule == "empty":
+                if not text.strip():
+                    return rule
+            elif rule == "json":
+                stripped = text.strip()
+                if stripped[:1] in ("{", "[") and self._is_json(stripped):
+                    return rule
+            elif rule == "target_language":
+                if self._is_target_language(text, from_lang, to_lang):
+                    return rule
+            elif _RULE_PATTERNS[rule].match(text):
+                return rule
+
+        for pattern in self.patterns:
+            if pattern.fullmatch(text):
+                return "pattern"
+        return None
+
+    def check(self, text: str, from_lang: str, to_lang: str) -> bool:
+        """
+        判断文本是否需要翻译，并记录跳过统计
+
+        Returns:
+            bool: 需要翻译时返回True
+        """
+        reason = self.classify(text, from_lang, to_lang)
+        if reason is None:
+            return True
+        self.stats[reason] += 1
+        return False
+
+    def mask(self, text: str) -> Tuple[str, List[str]]:
+        """
+        将代码块、行内代码、URL等片段替换为占位符
+
+        Args:
+            text: 原文
+
+        Returns:
+            Tuple[str, List[str]]: (遮蔽后的文本, 被替换的片段列表)
+        """
+        segments: List[str] = []
+        if not self.enabled:
+            return text, segments
+
+        def replace(match: re.Match) -> str:
+            segments.append(match.group(0))
+            return PLACEHOLDER % (len(segments) - 1)
+
+        for mask in self.masks:
+            text = MASK_PATTERNS[mask].sub(replace, text)
+        if segments:
+            self.stats["masked_segments"] += len(segments)
+        return text, segments
+
+    def unmask(self, text: str, segments: List[str]) -> str:
+        """
+        将占位符还原为原始片段
+
+        Raises:
+            ValueError: 译文中缺少占位符时抛出
+        """
+        if not segments:
+            return text
+
+        found = {int(index) for index in _PLACEHOLDER_PATTERN.findall(text)}
+        missing = set(range(len(segments))) - found
+        if missing:
+            raise ValueError(f"Translation lost {len(missing)} masked segment(s)")
+
+        def restore(match: re.Match) -> str:
+            index = int(match.group(1))
+            return segments[index] if index < len(segments) else match.group(0)
+
+        # 单次替换，还原出的片段内容不会被再次扫描
+        return _PLACEHOLDER_PATTERN.sub(restore, text)
+
+    def is_masked_only(self, text: str) -> bool:
+        """遮蔽后是否只剩占位符和空白"""
+        return not _PLACEHOLDER_PATTERN.sub("", text).strip()
+
+    @staticmethod
+    def _is_json(text: str) -> bool:
+        try:
+            json.loads(text)
+            return True
+        except ValueError:
+            return False
+
+    def _is_target_language(self, text: str, from_lang: str, to_lang: str) -> bool:
+        scripts = target_scripts(from_lang, to_lang)
+        if scripts is None or missing_required_script(text, to_lang):
+            return False
+        return script_ratio(text, scripts) >= self.target_script_ratio
+
+    @property
+    def skipped(self) -> int:
+        """因无需翻译而节省的请求数"""
+        return sum(count for reason, count in self.stats.items() if reason != "masked_segments")
@@ -0,0 +1,181 @@
+import os
+import sys
+import time
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+# --profile 的模式：spans（只统计各阶段耗时）、cprofile（另外运行cProfile）、sample（另外运行采样分析器）
+PROFILE_MODES = ["spans", "cprofile", "sample"]
+
+
+class StageTimer:
+    """
+    按阶段统计耗时
+
+    每个阶段记录调用次数和累计耗时。并发执行的阶段（如各数据项的翻译）累计的是所有数据项的耗时之和，
+    可能超过实际运行时间。
+    """
+
+    def __init__(self):
+        self.totals: Dict[str, float] = Counter()
+        self.calls: Dict[str, int] = Counter()
+        self._start = time.perf_counter()
+
+    @contextmanager
+    def span(self, stage: str) -> Iterator[None]:
+        """
+        统计一段代码的耗时，可包裹 await
+
+        Args:
+            stage: 阶段名称
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.totals[stage] += time.perf_counter() - started
+            self.calls[stage] += 1
+
+    def report(self) -> Dict[str, Dict[str, float]]:
+        """
+        各阶段的耗时统计
+
+        Returns:
+            Dict[str, Dict[str, float]]: 阶段 -> 调用次数、累计秒数、平均毫秒数、占运行时间的百分比
+        """
+        wall = time.perf_counter() - self._start
+        return {
+            stage: {
+                "calls": self.calls[stage],
+                "total_s": round(total, 4),
+                "mean_ms": round(total / self.calls[stage] * 1000, 3),
+                "wall_pct": round(total / wall * 100, 1) if wall else 0.0,
+            }
+            for stage, total in sorted(self.totals.items(), key=lambda entry: -entry[1])
+        }
+
+
+class SamplingProfiler:
+    """
+    采样分析器
+
+    后台线程按固定间隔读取所有线程的调用栈，按栈计数。结果保存为 flamegraph.pl、speedscope 等工具
+    可直接读取的折叠栈格式（每行 "线程;外层函数;...;内层函数 次数"）。
+    """
+
+    def __init__(self, interval: float = 0.005):
+        """
+        初始化分析器
+
+        Args:
+            interval: 采样间隔（秒）
+        """
+        self.interval = interval
+        self.stacks: Dict[str, int] = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """开始采样"""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """停止采样"""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                self.stacks[self._collapse(names.get(thread_id, str(thread_id)), frame)] += 1
+            self.samples += 1
+
+    @staticmethod
+    def _collapse(thread_name: str, frame) -> str:
+        """将调用栈折叠为从外到内、以分号分隔的一行"""
+        parts: List[str] = []
+        while frame is not None:
+            code = frame.f_code
+            parts.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+            frame = frame.f_back
+        parts.append(thread_name)
+        return ";".join(reversed(parts))
+
+    def save(self, path: str) -> None:
+        """按折叠栈格式写入采样结果"""
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in sorted(self.stacks.items(), key=lambda entry: -entry[1]):
+                f.write(f"{stack} {count}\n")
+
+
+class RunProfiler:
+    """
+    一次翻译运行的分析器：按模式在阶段耗时之外运行 cProfile 或采样分析器，并保存结果
+    """
+
+    def __init__(self, mode: str = "spans", interval: float = 0.005):
+        """
+        初始化分析器
+
+        Args:
+            mode: spans、cprofile 或 sample
+            interval: sample 模式的采样间隔（秒）
+        """
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode '{mode}'. Available: {PROFILE_MODES}")
+        self.mode = mode
+        self._profile = None
+        self._sampler: Optional[SamplingProfiler] = None
+        if mode == "cprofile":
+            import cProfile
+            self._profile = cProfile.Profile()
+        elif mode == "sample":
+            self._sampler = SamplingProfiler(interval)
+
+    def start(self) -> None:
+        """开始分析（cProfile 只覆盖调用线程，即事件循环所在线程）"""
+        if self._profile is not None:
+            self._profile.enable()
+        if self._sampler is not None:
+            self._sampler.start()
+
+    def stop(self) -> None:
+        """停止分析"""
+        if self._profile is not None:
+            self._profile.disable()
+        if self._sampler is not None:
+            self._sampler.stop()
+
+    def save(self, output_dir: str) -> List[str]:
+        """
+        保存分析结果：cprofile 模式为 pstats 文件（profile.prof），sample 模式为折叠栈文件（profile.collapsed）
+
+        Args:
+            output_dir: 输出目录
+
+        Returns:
+            List[str]: 写入的文件路径
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        paths = []
+        if self._profile is not None:
+            path = os.path.join(output_dir, "profile.prof")
+            self._profile.dump_stats(path)
+            paths.append(path)
+        if self._sampler is not None:
+            path = os.path.join(output_dir, "profile.collapsed")
+            self._sampler.save(path)
+            paths.append(path)
+        return paths
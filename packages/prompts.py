@@ -0,0 +1,167 @@
+import hashlib
+from typing import Any, Dict, List, Tuple
+
+# 内置的系统提示模板，按版本号管理；修改提示词时新增版本而不是修改已有版本，
+# 以便通过输出元数据追溯每次翻译使用的提示词
+PROMPT_TEMPLATES = {
+    "v1": (
+        "你是一位专业的翻译专家，擅长在不同语言之间进行翻译，特别是{from_lang}和{to_lang}之间的翻译。\n\n"
+        "任务：提供准确的{from_lang}到{to_lang}的翻译。\n"
+        "范围：专注于保持原文的含义和上下文。\n"
+        "语气：使用正式和专业的语气。\n"
+        "注意：确保{to_lang}的翻译结果中不包含任何{from_lang}的字符或单词。\n\n"
+    ),
+}
+
+# 一次请求翻译为多种目标语言时使用的系统提示模板（JSON模式），{to_langs} 为逗号分隔的语言代码
+MULTI_TARGET_TEMPLATES = {
+    "v1": (
+        "你是一位专业的翻译专家，擅长在不同语言之间进行翻译。\n\n"
+        "任务：将用户提供的{from_lang}文本分别准确地翻译为每一种目标语言。\n"
+        "目标语言：{to_langs}\n"
+        "范围：专注于保持原文的含义和上下文。\n"
+        "语气：使用正式和专业的语气。\n"
+        "输出：仅输出一个JSON对象，键为目标语言代码，值为对应语言的完整译文。\n\n"
+    ),
+}
+
+# 按对话整体翻译时使用的系统提示模板（JSON模式），用户消息为 轮次编号 -> 内容 的JSON对象
+CONVERSATION_TEMPLATES = {
+    "v1": (
+        "你是一位专业的翻译专家，擅长在不同语言之间进行翻译，特别是{from_lang}和{to_lang}之间的翻译。\n\n"
+        "任务：用户提供一个JSON对象，包含同一段对话中按顺序排列的多轮内容，键为轮次编号。"
+        "请结合上下文将每一轮内容准确地从{from_lang}翻译为{to_lang}，并在各轮之间保持术语和称呼一致。\n"
+        "范围：专注于保持原文的含义和上下文，不要合并、拆分或省略任何一轮。\n"
+        "语气：使用正式和专业的语气。\n"
+        "输出：仅输出一个JSON对象，键与输入完全相同，值为对应轮次的完整译文。\n\n"
+    ),
+}
+
+DEFAULT_PROMPT_VERSION = "v1"
+
+
+class PromptBuilder:
+    """提示词构建器：每个语言对只渲染一次系统提示，保证请求间的静态前缀字节一致"""
+
+    def __init__(self, config: Dict[str, Any] = None):
+        """
+        初始化提示词构建器
+
+        Args:
+            config: 格式配置中的 prompt 部分，支持的键：
+                version: 提示词版本，默认 DEFAULT_PROMPT_VERSION
+                system: 自定义系统提示模板，可使用 {from_lang} 和 {to_lang}；
+                        提供时必须同时指定 version
+                multi_target_system: 自定义多目标语言系统提示模板，可使用 {from_lang} 和 {to_langs}
+                conversation_system: 自定义对话翻译系统提示模板，可使用 {from_lang} 和 {to_lang}
+        """
+        config = config or {}
+        self.version = config.get("version", DEFAULT_PROMPT_VERSION)
+
+        if "system" in config:
+            if "version" not in config:
+                raise ValueError("A custom prompt template must declare its 'version'")
+            self.template = config["system"]
+        elif self.version in PROMPT_TEMPLATES:
+            self.template = PROMPT_TEMPLATES[self.version]
+        else:
+            raise ValueError(f"Unknown prompt version '{self.version}'. Available: {list(PROMPT_TEMPLATES.keys())}")
+
+        self.multi_target_template = config.get(
+            "multi_target_system", MULTI_TARGET_TEMPLATES.get(self.version, MULTI_TARGET_TEMPLATES[DEFAULT_PROMPT_VERSION])
+        )
+
+        self.conversation_template = config.get(
+            "conversation_system", CONVERSATION_TEMPLATES.get(self.version, CONVERSATION_TEMPLATES[DEFAULT_PROMPT_VERSION])
+        )
+
+        self._system_prompts: Dict[Tuple[Any, ...], str] = {}
+
+    def system_prompt(self, from_lang: str, to_lang: str) -> str:
+        """
+        获取语言对的系统提示（缓存）
+
+        Args:
+            from_lang: 源语言代码
+            to_lang: 目标语言代码
+
+        Returns:
+            str: 系统提示
+        """
+        key = (from_lang, to_lang)
+        prompt = self._system_prompts.get(key)
+        if prompt is None:
+            prompt = self.template.format(from_lang=from_lang, to_lang=to_lang)
+            self._system_prompts[key] = prompt
+        return prompt
+
+    def multi_target_system_prompt(self, from_lang: str, to_langs: List[str]) -> str:
+        """
+        获取一次翻译为多种目标语言的系统提示（缓存）
+
+        Args:
+            from_lang: 源语言代码
+            to_langs: 目标语言代码列表
+
+        Returns:
+            str: 系统提示
+        """
+        key = (from_lang, tuple(to_langs))
+        prompt = self._system_prompts.get(key)
+        if prompt is None:
+            prompt = self.multi_target_template.format(from_lang=from_lang, to_langs=", ".join(to_langs))
+            self._system_prompts[key] = prompt
+        return prompt
+
+    def conversation_system_prompt(self, from_lang: str, to_lang: str) -> str:
+        """
+        获取按对话整体翻译时的系统提示（缓存）
+
+        Args:
+            from_lang: 源语言代码
+            to_lang: 目标语言代码
+
+        Returns:
+            str: 系统提示
+        """
+        key = ("conversation", from_lang, to_lang)
+        prompt = self._system_prompts.get(key)
+        if prompt is None:
+            prompt = self.conversation_template.format(from_lang=from_lang, to_lang=to_lang)
+            self._system_prompts[key] = prompt
+        return prompt
+
+    def build_messages(self, from_lang: str, to_lang: str, text: str, hints: str = "") -> List[Dict[str, str]]:
+        """
+        构建请求消息
+
+        静态的系统提示始终位于最前面，术语表、参考译文等随请求变化的内容追加在其后，
+        使同一语言对的所有请求共享相同的前缀，便于服务端的前缀/KV缓存命中。
+
+        Args:
+            from_lang: 源语言代码
+            to_lang: 目标语言代码
+            text: 待翻译文本
+            hints: 追加在系统提示后的动态参考信息
+
+        Returns:
+            List[Dict[str, str]]: 消息列表
+        """
+        return [
+            {"role": "system", "content": self.system_prompt(from_lang, to_lang) + hints},
+            {"role": "user", "content": text}
+        ]
+
+    def template_hash(self) -> str:
+        """
+        实际使用的各系统提示模板的哈希值，用于发现内容被修改但版本号未变的模板
+
+        Returns:
+            str: 十六进制哈希值
+        """
+        payload = "\0".join([self.template, self.multi_target_template, self.conversation_template])
+        return hashlib.blake2b(payload.encode("utf-8"), digest_size=8).hexdigest()
+
+    def metadata(self) -> Dict[str, Any]:
+        """用于写入输出元数据的提示词信息：版本号和模板哈希"""
+        return {"prompt_version": self.version, "prompt_hash": self.template_hash()}
@@ -0,0 +1,103 @@
+import os
+import json
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Set, Tuple
+from .readers import read_jsonl
+
+# 失败字段记录文件名，与翻译结果位于同一目录
+FAILED_FIELDS_FILENAME = "failed_fields.jsonl"
+
+# 表示整条数据项失败（提取或重新组装出错）时使用的字段路径
+WHOLE_ITEM = "*"
+
+
+@dataclass
+class FieldFailure:
+    """一个翻译失败的字段"""
+    split: str       # split名称
+    row: int         # 数据项在split中的下标
+    field_path: str  # 字段路径，整条数据项失败时为 "*"
+    to_lang: str     # 目标语言代码
+    error: str       # 根因异常类名
+    message: str = ""  # 异常信息（截断）
+
+
+class FailureLog:
+    """失败字段隔离记录：收集翻译失败的字段，写入JSONL旁路文件供 --retry_failed 重新处理"""
+
+    def __init__(self, max_message_length: int = 200):
+        """
+        初始化失败记录
+
+        Args:
+            max_message_length: 异常信息保留的最大长度
+        """
+        self.failures: List[FieldFailure] = []
+        self.max_message_length = max_message_length
+
+    def __len__(self) -> int:
+        return len(self.failures)
+
+    def record(self, split: str, row: int, field_path: str, to_lang: str, error: Exception) -> None:
+        """
+        记录一个失败的字段
+
+        Args:
+            split: split名称
+            row: 数据项下标
+            field_path: 字段路径
+            to_lang: 目标语言代码
+            error: 捕获到的异常，记录的类名取异常链（raise ... from）最底层的根因
+        """
+        root = error
+        while root.__cause__ is not None:
+            root = root.__cause__
+        self.failures.append(FieldFailure(
+            split=split,
+            row=row,
+            field_path=field_path,
+            to_lang=to_lang,
+            error=type(root).__name__,
+            message=str(error)[:self.max_message_length]
+        ))
+
+    def for_lang(self, to_lang: str) -> List[FieldFailure]:
+        """获取指定目标语言的失败记录"""
+        return [failure for failure in self.failures if failure.to_lang == to_lang]
+
+    def save(self, path: str, to_lang: str) -> int:
+        """
+        将指定目标语言的失败记录写入文件（覆盖旧文件）
+
+        Args:
+            path: 文件路径
+            to_lang: 目标语言代码
+
+        Returns:
+            int: 写入的记录数
+        """
+        failures = self.for_lang(to_lang)
+        with open(path, "w", encoding="utf-8") as f:
+            for failure in failures:
+                f.write(json.dumps(asdict(failure), ensure_ascii=False) + "\n")
+        return len(failures)
+
+    @staticmethod
+    def load(path: str) -> List[FieldFailure]:
+        """从文件读取失败记录，文件不存在时返回空列表"""
+        if not os.path.exists(path):
+            return []
+        return [FieldFailure(**record) for record in read_jsonl(path)]
+
+    @staticmethod
+    def group_by_row(failures: List[FieldFailure]) -> Dict[Tuple[str, int], Set[str]]:
+        """
+        按数据项分组失败字段
+
+        Returns:
+            Dict[Tuple[str, int], Set[str]]: (split, 下标) -> 失败的字段路径集合
+        """
+        rows: Dict[Tuple[str, int], Set[str]] = {}
+        for failure in failures:
+            rows.setdefault((failure.split, failure.row), set()).add(failure.field_path)
+        return rows
@@ -0,0 +1,544 @@
+import os
+import csv
+import mmap
+import random
+from array import array
+from itertools import islice
+from typing import Dict, Any, Iterator, Callable, List, Optional, Tuple
+from .jsoncodec import loads as _loads
+
+# 文件扩展名到输入格式的映射
+EXTENSION_FORMATS = {
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    ".parquet": "parquet",
+    ".arrow": "arrow",
+    ".feather": "arrow",
+    ".csv": "csv",
+}
+
+INPUT_FORMATS = ["hub", "auto"] + sorted(set(EXTENSION_FORMATS.values()))
+
+
+def read_jsonl(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    逐行读取JSONL文件
+
+    Args:
+        path: JSONL文件路径
+
+    Yields:
+        Dict[str, Any]: 每一行解析得到的数据项
+    """
+    with open(path, "rb", buffering=1024 * 1024) as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield _loads(line)
+
+
+def _jsonl_spans(path: str) -> Iterator[Tuple[int, int]]:
+    """通过内存映射逐个产出JSONL文件中非空行的起止偏移，不解析JSON"""
+    if os.path.getsize(path) == 0:
+        return
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        start = 0
+        size = len(mm)
+        while start < size:
+            end = mm.find(b"\n", start)
+            if end == -1:
+                end = size
+            if mm[start:end].strip():
+                yield start, end
+            start = end + 1
+
+
+def count_jsonl(path: str) -> int:
+    """
+    通过内存映射统计JSONL文件中的非空行数，不解析JSON
+
+    Args:
+        path: JSONL文件路径
+
+    Returns:
+        int: 数据项数量
+    """
+    return sum(1 for _ in _jsonl_spans(path))
+
+
+def index_jsonl(path: str) -> array:
+    """
+    通过内存映射建立JSONL文件的行偏移索引，不解析JSON
+
+    Args:
+        path: JSONL文件路径
+
+    Returns:
+        array: 每个非空行的起止偏移，依次存放为 [起始0, 结束0, 起始1, 结束1, ...]
+    """
+    spans = array("Q")
+    for span in _jsonl_spans(path):
+        spans.extend(span)
+    return spans
+
+
+def slice_jsonl(path: str, start: int, stop: int, spans: array = None) -> List[Dict[str, Any]]:
+    """
+    按行号区间随机读取JSONL文件，只解析区间内的行
+
+    Args:
+        path: JSONL文件路径
+        start: 起始行号（包含）
+        stop: 结束行号（不包含）
+        spans: index_jsonl 建立的索引，多次读取时应复用
+
+    Returns:
+        List[Dict[str, Any]]: 数据项
+    """
+    if spans is None:
+        spans = index_jsonl(path)
+    stop = min(stop, len(spans) // 2)
+    if start >= stop:
+        return []
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return [_loads(mm[spans[2 * i]:spans[2 * i + 1]]) for i in range(start, stop)]
+
+
+def read_parquet(path: str, batch_size: int = 1024) -> Iterator[Dict[str, Any]]:
+    """
+    以内存映射方式按row group分批读取Parquet文件
+
+    Args:
+        path: Parquet文件路径
+        batch_size: 每批转换为Python对象的行数
+
+    Yields:
+        Dict[str, Any]: 数据项
+    """
+    import pyarrow.parquet as pq
+
+    parquet_file = pq.ParquetFile(path, memory_map=True)
+    for row_group in range(parquet_file.num_row_groups):
+        for batch in parquet_file.iter_batches(batch_size=batch_size, row_groups=[row_group]):
+            yield from batch.to_pylist()
+
+
+def count_parquet(path: str) -> int:
+    """从Parquet元数据中读取行数"""
+    import pyarrow.parquet as pq
+
+    return pq.ParquetFile(path, memory_map=True).metadata.num_rows
+
+
+def slice_parquet(path: str, start: int, stop: int) -> List[Dict[str, Any]]:
+    """按行号区间读取Parquet文件，只解码与区间重叠的row group"""
+    import pyarrow.parquet as pq
+
+    parquet_file = pq.ParquetFile(path, memory_map=True)
+    row_groups = []
+    first_row = None
+    offset = 0
+    for row_group in range(parquet_file.num_row_groups):
+        num_rows = parquet_file.metadata.row_group(row_group).num_rows
+        if offset < stop and offset + num_rows > start:
+            row_groups.append(row_group)
+            if first_row is None:
+                first_row = offset
+        offset += num_rows
+    if not row_groups:
+        return []
+    table = parquet_file.read_row_groups(row_groups)
+    return table.slice(start - first_row, stop - start).to_pylist()
+
+
+def _open_arrow(path: str):
+    """内存映射打开Arrow IPC文件，兼容file与stream两种格式"""
+    import pyarrow as pa
+
+    source = pa.memory_map(path, "r")
+    try:
+        return pa.ipc.open_file(source)
+    except pa.ArrowInvalid:
+        source.seek(0)
+        return pa.ipc.open_stream(source)
+
+
+def _arrow_batches(path: str):
+    """按顺序产出Arrow文件中的record batch，file格式按索引读取，stream格式顺序读取"""
+    reader = _open_arrow(path)
+    if hasattr(reader, "num_record_batches"):
+        for i in range(reader.num_record_batches):
+            yield reader.get_batch(i)
+    else:
+        yield from reader
+
+
+def read_arrow(path: str, batch_size: int = 1024) -> Iterator[Dict[str, Any]]:
+    """
+    以内存映射方式读取Arrow IPC文件
+
+    Args:
+        path: Arrow文件路径
+        batch_size: 每批转换为Python对象的行数
+
+    Yields:
+        Dict[str, Any]: 数据项
+    """
+    for batch in _arrow_batches(path):
+        for offset in range(0, batch.num_rows, batch_size):
+            yield from batch.slice(offset, batch_size).to_pylist()
+
+
+def count_arrow(path: str) -> int:
+    """统计Arrow文件中的行数"""
+    return sum(batch.num_rows for batch in _arrow_batches(path))
+
+
+def slice_arrow(path: str, start: int, stop: int) -> List[Dict[str, Any]]:
+    """按行号区间读取内存映射的Arrow文件，只转换区间内的行"""
+    rows = []
+    offset = 0
+    for batch in _arrow_batches(path):
+        if offset >= stop:
+            break
+        if offset + batch.num_rows > start:
+            begin = max(start - offset, 0)
+            rows.extend(batch.slice(begin, min(stop - offset, batch.num_rows) - begin).to_pylist())
+        offset += batch.num_rows
+    return rows
+
+
+def read_csv(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    逐行读取带表头的CSV文件
+
+    Args:
+        path: CSV文件路径
+
+    Yields:
+        Dict[str, Any]: 以表头为键的数据项
+    """
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        yield from csv.DictReader(f)
+
+
+def count_csv(path: str) -> int:
+    """统计CSV文件中的数据行数（不含表头）"""
+    return sum(1 for _ in read_csv(path))
+
+
+def slice_csv(path: str, start: int, stop: int) -> List[Dict[str, Any]]:
+    """按行号区间读取CSV文件（需要顺序扫描到起始行）"""
+    return list(islice(read_csv(path), start, stop))
+
+
+def _in_order(found: Dict[int, Dict[str, Any]], indices: List[int], path: str) -> List[Dict[str, Any]]:
+    """按请求的行号顺序排列读取到的数据项，缺少的行号视为越界"""
+    missing = [index for index in indices if index not in found]
+    if missing:
+        raise IndexError(f"Index {missing[0]} out of range for split '{path}'")
+    return [found[index] for index in indices]
+
+
+def select_jsonl(path: str, indices: List[int], spans: array = None) -> List[Dict[str, Any]]:
+    """按行号列表随机读取JSONL文件，只解析选中的行"""
+    if spans is None:
+        spans = index_jsonl(path)
+    count = len(spans) // 2
+    found = {}
+    if count:
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for index in set(indices):
+                if 0 <= index < count:
+                    found[index] = _loads(mm[spans[2 * index]:spans[2 * index + 1]])
+    return _in_order(found, indices, path)
+
+
+def select_parquet(path: str, indices: List[int]) -> List[Dict[str, Any]]:
+    """按行号列表读取Parquet文件，行号按row group分组，每个row group只解码一次且只转换选中的行"""
+    import pyarrow.parquet as pq
+
+    parquet_file = pq.ParquetFile(path, memory_map=True)
+    wanted = sorted(set(indices))
+    found = {}
+    position = 0
+    offset = 0
+    for row_group in range(parquet_file.num_row_groups):
+        if position >= len(wanted):
+            break
+        num_rows = parquet_file.metadata.row_group(row_group).num_rows
+        group = []
+        while position < len(wanted) and wanted[position] < offset + num_rows:
+            if wanted[position] >= offset:
+                group.append(wanted[position])
+            position += 1
+        if group:
+            table = parquet_file.read_row_group(row_group).take([index - offset for index in group])
+            found.update(zip(group, table.to_pylist()))
+        offset += num_rows
+    return _in_order(found, indices, path)
+
+
+def select_arrow(path: str, indices: List[int]) -> List[Dict[str, Any]]:
+    """按行号列表读取内存映射的Arrow文件，按batch分组，只转换选中的行"""
+    wanted = sorted(set(indices))
+    found = {}
+    position = 0
+    offset = 0
+    for batch in _arrow_batches(path):
+        if position >= len(wanted):
+            break
+        group = []
+        while position < len(wanted) and wanted[position] < offset + batch.num_rows:
+            group.append(wanted[position])
+            position += 1
+        if group:
+            found.update(zip(group, batch.take([index - offset for index in group]).to_pylist()))
+        offset += batch.num_rows
+    return _in_order(found, indices, path)
+
+
+def select_csv(path: str, indices: List[int]) -> List[Dict[str, Any]]:
+    """按行号列表读取CSV文件，顺序扫描一次，读到最大行号即停止"""
+    wanted = set(indices)
+    last = max(wanted, default=-1)
+    found = {}
+    for index, row in enumerate(islice(read_csv(path), last + 1)):
+        if index in wanted:
+            found[index] = row
+    return _in_order(found, indices, path)
+
+
+# 输入格式 -> (读取函数, 计数函数)
+READERS: Dict[str, tuple] = {
+    "jsonl": (read_jsonl, count_jsonl),
+    "parquet": (read_parquet, count_parquet),
+    "arrow": (read_arrow, count_arrow),
+    "csv": (read_csv, count_csv),
+}
+
+# 输入格式 -> 按行号区间读取的函数（jsonl由LocalSplit复用行偏移索引）
+SLICERS: Dict[str, Callable[[str, int, int], List[Dict[str, Any]]]] = {
+    "jsonl": slice_jsonl,
+    "parquet": slice_parquet,
+    "arrow": slice_arrow,
+    "csv": slice_csv,
+}
+
+# 输入格式 -> 按行号列表读取的函数（jsonl由LocalSplit复用行偏移索引）
+SELECTORS: Dict[str, Callable[[str, List[int]], List[Dict[str, Any]]]] = {
+    "jsonl": select_jsonl,
+    "parquet": select_parquet,
+    "arrow": select_arrow,
+    "csv": select_csv,
+}
+
+
+class LocalSplit:
+    """本地文件对应的一个split，按需流式读取，不经过datasets缓存"""
+
+    def __init__(self, path: str, input_format: str):
+        """
+        初始化本地split
+
+        Args:
+            path: 文件路径
+            input_format: 输入格式（jsonl, parquet, arrow, csv）
+        """
+        if input_format not in READERS:
+            raise ValueError(f"Unsupported input format '{input_format}'. Available: {list(READERS.keys())}")
+        self.path = path
+        self.input_format = input_format
+        self._reader, self._counter = READERS[input_format]
+        self._length: Optional[int] = None
+        self._spans: Optional[array] = None
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return self._reader(self.path)
+
+    def __len__(self) -> int:
+        if self._length is None:
+            self._length = len(self._spans) // 2 if self._spans is not None else self._counter(self.path)
+        return self._length
+
+    def __getitem__(self, index: int) -> Dict[str, Any]:
+        if index < 0:
+            index += len(self)
+        rows = self.slice(index, index + 1) if index >= 0 else []
+        if not rows:
+            raise IndexError(f"Index {index} out of range for split '{self.path}'")
+        return rows[0]
+
+    def slice(self, start: int, stop: int) -> List[Dict[str, Any]]:
+        """
+        按行号区间读取数据项，用于分页浏览
+
+        Args:
+            start: 起始行号（包含）
+            stop: 结束行号（不包含）
+
+        Returns:
+            List[Dict[str, Any]]: 数据项
+        """
+        if self.input_format == "jsonl":
+            # 行偏移索引只建立一次，之后每页只解析需要的行
+            if self._spans is None:
+                self._spans = index_jsonl(self.path)
+            return slice_jsonl(self.path, start, stop, self._spans)
+        return SLICERS[self.input_format](self.path, start, stop)
+
+    def select(self, indices: List[int]) -> List[Dict[str, Any]]:
+        """
+        按行号列表读取数据项，用于抽样：一次读取所有选中的行，而不是每个行号单独扫描或解码
+
+        Args:
+            indices: 行号列表
+
+        Returns:
+            List[Dict[str, Any]]: 按 indices 顺序排列的数据项
+        """
+        if self.input_format == "jsonl":
+            if self._spans is None:
+                self._spans = index_jsonl(self.path)
+            return select_jsonl(self.path, indices, self._spans)
+        return SELECTORS[self.input_format](self.path, indices)
+
+
+def detect_input_format(path: str) -> str:
+    """
+    根据文件扩展名推断输入格式
+
+    Args:
+        path: 数据集路径或名称
+
+    Returns:
+        str: 输入格式，本地文件/目录无法识别时返回 hub
+    """
+    if os.path.isfile(path):
+        return EXTENSION_FORMATS.get(os.path.splitext(path)[1].lower(), "hub")
+    if os.path.isdir(path):
+        formats = {
+            EXTENSION_FORMATS[os.path.splitext(name)[1].lower()]
+            for name in os.listdir(path)
+            if os.path.splitext(name)[1].lower() in EXTENSION_FORMATS
+        }
+        if len(formats) == 1:
+            return formats.pop()
+    return "hub"
+
+
+def load_local_dataset(path: str, input_format: str) -> Dict[str, LocalSplit]:
+    """
+    加载本地文件或目录为 split -> LocalSplit 的字典
+
+    单个文件对应 train split；目录中的每个文件以文件名（不含扩展名）作为split名称。
+
+    Args:
+        path: 文件或目录路径
+        input_format: 输入格式
+
+    Returns:
+        Dict[str, LocalSplit]: 各split的数据
+    """
+    if os.path.isfile(path):
+        return {"train": LocalSplit(path, input_format)}
+
+    if not os.path.isdir(path):
+        raise FileNotFoundError(f"Local dataset '{path}' not found")
+
+    splits = {}
+    for filename in sorted(os.listdir(path)):
+        ext = os.path.splitext(filename)[1].lower()
+        if EXTENSION_FORMATS.get(ext) == input_format:
+            split_name = os.path.splitext(filename)[0]
+            splits[split_name] = LocalSplit(os.path.join(path, filename), input_format)
+
+    if not splits:
+        raise FileNotFoundError(f"No {input_format} files found in '{path}'")
+    return splits
+
+
+def open_dataset(path: str, input_format: str = "hub", loader: Callable = None) -> Dict[str, Any]:
+    """
+    按输入格式打开数据集
+
+    Args:
+        path: 数据集路径或名称
+        input_format: hub（默认，使用datasets.load_dataset）、auto（按扩展名推断）或具体的本地格式
+        loader: hub格式使用的加载函数，默认 datasets.load_dataset
+
+    Returns:
+        Dict[str, Any]: split名称到可迭代数据的映射
+    """
+    if input_format == "auto":
+        input_format = detect_input_format(path)
+
+    if input_format == "hub":
+        if loader is None:
+            from datasets import load_dataset as loader
+        return loader(path)
+
+    return load_local_dataset(path, input_format)
+
+
+def read_slice(split: Any, start: int, stop: int) -> List[Dict[str, Any]]:
+    """
+    读取任意split中的一段数据项
+
+    支持 LocalSplit、datasets.Dataset（经Arrow切片，只转换区间内的行）以及普通列表。
+
+    Args:
+        split: split数据
+        start: 起始行号（包含）
+        stop: 结束行号（不包含）
+
+    Returns:
+        List[Dict[str, Any]]: 数据项
+    """
+    if isinstance(split, LocalSplit):
+        return split.slice(start, stop)
+    if hasattr(split, "with_format"):
+        return split.with_format("arrow")[start:stop].to_pylist()
+    return list(split[start:stop])
+
+
+def sample_indices(length: int, sample: Optional[int] = None, fraction: Optional[float] = None,
+                   seed: int = 0) -> Optional[List[int]]:
+    """
+    按固定随机种子抽取行号，用于小规模试运行
+
+    Args:
+        length: split的行数
+        sample: 抽取的行数
+        fraction: 抽取的比例（0到1之间），与sample同时指定时取较小者
+        seed: 随机种子，相同种子得到相同的抽样结果
+
+    Returns:
+        Optional[List[int]]: 升序排列的行号；未指定抽样时返回None
+    """
+    if sample is None and fraction is None:
+        return None
+    if fraction is not None and not 0 < fraction <= 1:
+        raise ValueError(f"fraction must be in (0, 1], got {fraction}")
+    count = length
+    if sample is not None:
+        count = min(count, sample)
+    if fraction is not None:
+        count = min(count, max(1, round(length * fraction)) if length else 0)
+    return sorted(random.Random(seed).sample(range(length), count))
+
+
+def select_rows(split: Any, indices: List[int]) -> List[Dict[str, Any]]:
+    """
+    读取split中指定行号的数据项
+
+    Args:
+        split: split数据（LocalSplit、datasets.Dataset 或列表），LocalSplit 和 Dataset 一次读取所有选中的行
+        indices: 升序排列的行号
+
+    Returns:
+        List[Dict[str, Any]]: 数据项
+    """
+    if hasattr(split, "select"):
+        return list(split.select(indices))
+    return [split[index] for index in indices]
@@ -0,0 +1,151 @@
+import json
+import time
+import asyncio
+import hashlib
+from collections import Counter, deque
+from typing import Any, Deque, Dict, List, Optional
+from .writers import open_input, open_output
+
+
+def request_key(data: Dict[str, Any]) -> str:
+    """
+    请求的稳定标识，用于回放时匹配录制的响应
+
+    只覆盖消息、温度和响应格式，不包含模型名称和API地址，同一份录制可以在不同环境中回放。
+    模型名称和完整的请求体另外记录在录制中，可用于检查录制或按新的规则重新计算标识。
+
+    Args:
+        data: 请求体
+
+    Returns:
+        str: 十六进制哈希值
+    """
+    payload = json.dumps(
+        [data.get("messages"), data.get("temperature"), data.get("response_format")],
+        ensure_ascii=False, sort_keys=True, separators=(",", ":")
+    )
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class TrafficRecorder:
+    """
+    请求/响应录制
+
+    每次请求尝试写入一行紧凑的JSONL：请求标识、模型名称、相对开始时间、延迟、请求大小、请求体，以及响应体或异常信息。
+    文件名以 .gz/.zst 结尾时压缩写入。
+    """
+
+    def __init__(self, path: str):
+        """
+        打开录制文件
+
+        Args:
+            path: 录制文件路径
+        """
+        compression = "gzip" if path.endswith(".gz") else "zstd" if path.endswith(".zst") else "none"
+        self.path = path
+        self.count = 0
+        self._file = open_output(path, compression)
+        self._start = time.perf_counter()
+
+    def record(self, data: Dict[str, Any], started: float, result: Optional[Dict[str, Any]] = None,
+               error: Optional[Exception] = None) -> None:
+        """
+        记录一次请求尝试
+
+        Args:
+            data: 请求体
+            started: 请求开始时的 time.perf_counter()
+            result: 响应体，请求异常时为None
+            error: 请求异常（超时、连接错误等）
+        """
+        entry = {
+            "key": request_key(data),
+            "model": data.get("model"),
+            "t": round(started - self._start, 4),
+            "latency": round(time.perf_counter() - started, 4),
+            "request_chars": sum(len(str(message.get("content", ""))) for message in data.get("messages", [])),
+            "request": data,
+        }
+        if error is not None:
+            entry["error"] = f"{type(error).__name__}: {str(error)}"
+        else:
+            entry["response"] = result
+        self._file.write(json.dumps(entry, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n")
+        self.count += 1
+
+    def close(self) -> None:
+        """关闭录制文件"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class ReplayMiss(Exception):
+    """回放时没有找到请求对应的录制"""
+
+
+class TrafficReplayer:
+    """
+    按录制回放响应
+
+    同一请求的多次录制按原顺序回放（包括失败的尝试），只剩一条时重复使用该条。
+    录制中带有请求体时按当前的 request_key 重新计算标识，否则使用录制的标识。
+    每次回放前按原延迟乘以 latency_scale 休眠，以重现真实流量的时延分布。
+
+    请求标识覆盖完整的消息，包括翻译记忆的参考译文提示；这些提示取决于请求完成的顺序，
+    因此启用翻译记忆时无法稳定回放（translate_dataset 拒绝同时使用 --memory 和 --replay）。
+    """
+
+    def __init__(self, path: str, latency_scale: float = 1.0):
+        """
+        读取录制文件
+
+        Args:
+            path: 录制文件路径
+            latency_scale: 延迟缩放比例，1为原始延迟，0为不等待
+        """
+        if latency_scale < 0:
+            raise ValueError("latency_scale must not be negative")
+        self.latency_scale = latency_scale
+        self.stats = Counter()
+        self._entries: Dict[str, Deque[Dict[str, Any]]] = {}
+        with open_input(path) as f:
+            for line in f.read().splitlines():
+                if line.strip():
+                    entry = json.loads(line)
+                    key = request_key(entry["request"]) if "request" in entry else entry["key"]
+                    self._entries.setdefault(key, deque()).append(entry)
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._entries.values())
+
+    def latencies(self) -> List[float]:
+        """录制中所有请求尝试的延迟（秒）"""
+        return [entry["latency"] for entries in self._entries.values() for entry in entries]
+
+    async def replay(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        回放一次请求
+
+        Args:
+            data: 请求体
+
+        Returns:
+            Dict[str, Any]: 录制的响应体
+
+        Raises:
+            ReplayMiss: 没有对应的录制时抛出
+            Exception: 录制的是失败的尝试时按原异常信息抛出
+        """
+        entries = self._entries.get(request_key(data))
+        if not entries:
+            self.stats["misses"] += 1
+            raise ReplayMiss("No recorded response for this request")
+        entry = entries.popleft() if len(entries) > 1 else entries[0]
+        if self.latency_scale:
+            await asyncio.sleep(entry["latency"] * self.latency_scale)
+        self.stats["hits"] += 1
+        if "error" in entry:
+            raise Exception(f"Recorded error: {entry['error']}")
+        return entry["response"]
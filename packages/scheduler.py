@@ -0,0 +1,90 @@
+from typing import Any, Callable, Dict, List, Sequence
+from .formats.base import TranslatableField
+
+# 可选的调度策略
+#   fifo:   按原始顺序提交
+#   lpt:    最长任务优先（Longest Processing Time first），避免大数据项在末尾拖尾
+#   bucket: 按长度分桶，长度相近的数据项一起提交，桶之间按长度从大到小
+SCHEDULING_POLICIES = ["fifo", "lpt", "bucket"]
+
+
+def item_cost(fields: Sequence[TranslatableField]) -> int:
+    """
+    估算一个数据项的翻译开销（可翻译文本的总字符数）
+
+    Args:
+        fields: 数据项提取出的可翻译字段
+
+    Returns:
+        int: 开销估计值
+    """
+    return sum(len(field.content) for field in fields if isinstance(field.content, str))
+
+
+def length_bucket(cost: int) -> int:
+    """按2的幂划分长度桶"""
+    return cost.bit_length()
+
+
+def schedule_order(costs: Sequence[int], policy: str = "fifo") -> List[int]:
+    """
+    根据调度策略计算数据项的提交顺序
+
+    Args:
+        costs: 每个数据项的开销估计
+        policy: 调度策略（fifo, lpt, bucket）
+
+    Returns:
+        List[int]: 按提交顺序排列的数据项索引
+    """
+    if policy not in SCHEDULING_POLICIES:
+        raise ValueError(f"Unknown scheduling policy '{policy}'. Available: {SCHEDULING_POLICIES}")
+
+    indices = range(len(costs))
+    if policy == "lpt":
+        return sorted(indices, key=lambda i: -costs[i])
+    if policy == "bucket":
+        return sorted(indices, key=lambda i: -length_bucket(costs[i]))
+    return list(indices)
+
+
+class ReorderBuffer:
+    """重排缓冲区：乱序完成的结果按原始索引顺序依次交给写入端"""
+
+    def __init__(self, emit: Callable[[Any], None], start: int = 0):
+        """
+        初始化重排缓冲区
+
+        Args:
+            emit: 按顺序接收结果的回调
+            start: 第一个结果的索引
+        """
+        self.emit = emit
+        self.next_index = start
+        self._pending: Dict[int, Any] = {}
+
+    def push(self, index: int, item: Any) -> None:
+        """
+        放入一个已完成的结果，并输出所有已连续就绪的结果
+
+        Args:
+            index: 结果的原始索引
+            item: 结果
+        """
+        if index < self.next_index or index in self._pending:
+            raise ValueError(f"Duplicate result for index {index}")
+
+        self._pending[index] = item
+        while self.next_index in self._pending:
+            self.emit(self._pending.pop(self.next_index))
+            self.next_index += 1
+
+    @property
+    def pending(self) -> int:
+        """等待前序结果而暂存的数量"""
+        return len(self._pending)
+
+    def close(self) -> None:
+        """结束写入，检查是否有缺失的结果"""
+        if self._pending:
+            raise RuntimeError(f"Missing result for index {self.next_index}, {self.pending} results still buffered")
@@ -1,5 +1,11 @@
-from typing import List
+import json
+from collections import Counter
+from typing import Dict, List, Optional, Sequence
 from .openai import OpenAIHandler
+from .memory import TranslationMemory, Glossary
+from .prompts import PromptBuilder
+from .validators import TranslationValidator
+from .offload import CpuOffload
 
 # 其他经过验证的代码都可以，视模型支持情况而定
 from_languages = [
@@ -12,31 +18,240 @@ from_languages = [
 to_languages = from_languages[1:] + [from_languages[0]]
 
 class OpenAITranslator:
-    def __init__(self, openai_handler: OpenAIHandler):
+    def __init__(self, openai_handler: OpenAIHandler, memory: TranslationMemory = None, glossary: Glossary = None,
+                 fuzzy_limit: int = 3, prompts: PromptBuilder = None, validator: TranslationValidator = None,
+                 offload: CpuOffload = None):
+        """
+        初始化翻译器
+
+        Args:
+            openai_handler: OpenAI请求处理器
+            memory: 可选的翻译记忆库，精确命中时不再请求API，相似片段作为参考译文提示；
+                    新译文不会自动加入，由调用方在还原遮蔽片段后通过 remember 加入
+            glossary: 可选的术语表，命中的术语作为指定译法提示
+            fuzzy_limit: 每次请求最多附带的相似翻译记忆数量
+            prompts: 提示词构建器，默认使用内置的最新版本模板
+            validator: 可选的译文校验器，在请求的重试循环内校验响应，未通过时立即重试
+            offload: 可选的CPU执行器边界，批量的译文校验在其中执行，避免阻塞事件循环
+        """
         self.openai_handler = openai_handler
+        self.memory = memory
+        self.glossary = glossary
+        self.fuzzy_limit = fuzzy_limit
+        self.prompts = prompts or PromptBuilder()
+        self.validator = validator
+        self.offload = offload
+        self.stats = Counter()
+
+    async def validate_batch(self, sources: Sequence[str], translations: Sequence[str], from_lang: str,
+                             to_lang: str) -> List[Optional[str]]:
+        """
+        校验一批译文（如整段对话的各轮），配置了CPU执行器边界时在执行器中校验，事件循环只负责记录统计
+
+        单条译文直接调用 validator.validate，避免每个响应都向执行器提交一次任务。
+
+        Returns:
+            List[Optional[str]]: 每条译文的错误信息，通过校验时为None
+        """
+        if self.offload is None:
+            return self.validator.validate_batch(sources, translations, from_lang, to_lang)
+        errors = await self.offload.run(self.validator.check_batch, list(sources), list(translations), from_lang, to_lang)
+        self.validator.record(errors)
+        return errors
+
+    def remember(self, from_lang: str, to_lang: str, text: str, translation: str) -> None:
+        """
+        将译文加入翻译记忆，应在译文通过校验并成功还原遮蔽片段后调用，避免记住丢失占位符的译文
+
+        Args:
+            from_lang: 源语言代码
+            to_lang: 目标语言代码
+            text: 请求时的原文（遮蔽后）
+            translation: 请求返回的译文（还原遮蔽片段前）
+        """
+        if self.memory is not None:
+            self.memory.add(from_lang, to_lang, text, translation)
+
+    def build_hints(self, from_lang: str, to_lang: str, text: str) -> str:
+        """
+        根据术语表和翻译记忆生成附加在系统提示后的参考信息
+
+        Returns:
+            str: 参考信息，无命中时为空字符串
+        """
+        hints = ""
+        if self.glossary is not None:
+            terms = self.glossary.match(text, to_lang)
+            if terms:
+                hints += "术语表（请使用以下指定译法）：\n"
+                hints += "".join(f"- {term} => {target}\n" for term, target in terms)
+                hints += "\n"
+
+        if self.memory is not None and self.fuzzy_limit > 0:
+            matches = self.memory.fuzzy_lookup(from_lang, to_lang, text, limit=self.fuzzy_limit)
+            if matches:
+                self.stats["memory_fuzzy_hits"] += 1
+                hints += "参考译文（相似原文的已有翻译，请保持术语和风格一致）：\n"
+                for _, source, target in matches:
+                    hints += f"原文：{source}\n译文：{target}\n"
+                hints += "\n"
+        return hints
 
     async def translate(self, from_lang: str, to_lang: str, text: str) -> str:
         if from_lang == to_lang:
             raise ValueError("Source and target languages cannot be the same")
         if not isinstance(text, str):
             raise ValueError("Input must be a string")
+
+        if self.memory is not None:
+            cached = self.memory.lookup(from_lang, to_lang, text)
+            if cached is not None:
+                self.stats["memory_hits"] += 1
+                return cached
         
-        sysprompt = (
-            f"你是一位专业的翻译专家，擅长在不同语言之间进行翻译，特别是{from_lang}和{to_lang}之间的翻译。\n\n"
-            f"任务：提供准确的{from_lang}到{to_lang}的翻译。\n"
-            f"范围：专注于保持原文的含义和上下文。\n"
-            f"语气：使用正式和专业的语气。\n"
-            f"注意：确保{to_lang}的翻译结果中不包含任何{from_lang}的字符或单词。\n\n"
+        messages = self.prompts.build_messages(
+            from_lang, to_lang, text, hints=self.build_hints(from_lang, to_lang, text)
+        )
+
+        def validate_response(content: str):
+            # 单条译文的校验开销很小，直接在事件循环中执行，不经过CPU执行器
+            self.validator.validate(text, content, from_lang, to_lang)
+
+        translated_text = await self.openai_handler.request(
+            messages=messages,
+            temp=0.7,
+            validator_callback=validate_response if self.validator is not None else None
         )
+        self.stats["requests"] += 1
+
+        return translated_text
+
+    async def translate_multi(self, from_lang: str, to_langs: List[str], text: str) -> Dict[str, str]:
+        """
+        通过一次JSON模式请求将文本翻译为多种目标语言
+
+        Args:
+            from_lang: 源语言代码
+            to_langs: 目标语言代码列表
+            text: 待翻译文本
+
+        Returns:
+            Dict[str, str]: 目标语言代码 -> 译文
+        """
+        if from_lang in to_langs:
+            raise ValueError("Source and target languages cannot be the same")
+        if not isinstance(text, str):
+            raise ValueError("Input must be a string")
+
+        translations = {}
+        if self.memory is not None:
+            for to_lang in to_langs:
+                cached = self.memory.lookup(from_lang, to_lang, text)
+                if cached is not None:
+                    self.stats["memory_hits"] += 1
+                    translations[to_lang] = cached
+
+        pending = [to_lang for to_lang in to_langs if to_lang not in translations]
+        if not pending:
+            return translations
+        if len(pending) == 1:
+            translations[pending[0]] = await self.translate(from_lang, pending[0], text)
+            return translations
+
+        def validate(response: dict):
+            missing = [to_lang for to_lang in pending if not isinstance(response.get(to_lang), str)]
+            if missing:
+                raise ValueError(f"Missing translations for {missing}")
+            extra = [key for key in response if key not in pending]
+            if extra:
+                raise ValueError(f"Unexpected languages in response: {extra}")
+            if self.validator is not None:
+                for to_lang in pending:
+                    self.validator.validate(text, response[to_lang], from_lang, to_lang)
 
         messages = [
-            {"role": "system", "content": sysprompt},
+            {"role": "system", "content": self.prompts.multi_target_system_prompt(from_lang, pending)},
             {"role": "user", "content": text}
         ]
+        response = await self.openai_handler.request_json(
+            messages=messages,
+            temp=0.7,
+            validator_callback=validate
+        )
+        self.stats["requests"] += 1
 
-        translated_text = await self.openai_handler.request(
+        for to_lang in pending:
+            translations[to_lang] = response[to_lang]
+        return translations
+
+    async def translate_conversation(self, from_lang: str, to_lang: str, turns: List[str]) -> Dict[int, str]:
+        """
+        通过一次JSON模式请求结合上下文翻译一段对话的多轮内容
+
+        响应中缺失或无效的轮次不包含在返回结果中，由调用方逐轮回退翻译。
+
+        Args:
+            from_lang: 源语言代码
+            to_lang: 目标语言代码
+            turns: 按顺序排列的各轮内容
+
+        Returns:
+            Dict[int, str]: 轮次下标 -> 译文
+        """
+        if from_lang == to_lang:
+            raise ValueError("Source and target languages cannot be the same")
+        if not all(isinstance(turn, str) for turn in turns):
+            raise ValueError("Input must be a list of strings")
+
+        translations = {}
+        if self.memory is not None:
+            for i, turn in enumerate(turns):
+                cached = self.memory.lookup(from_lang, to_lang, turn)
+                if cached is not None:
+                    self.stats["memory_hits"] += 1
+                    translations[i] = cached
+
+        pending = [i for i in range(len(turns)) if i not in translations]
+        if not pending:
+            return translations
+        if len(pending) == 1:
+            translations[pending[0]] = await self.translate(from_lang, to_lang, turns[pending[0]])
+            return translations
+
+        payload = {str(position): turns[i] for position, i in enumerate(pending)}
+        errors: List[str] = []
+
+        async def validate(response: dict):
+            # 逐轮校验，未通过的轮次由调用方逐轮回退；全部无效时重试整个请求
+            if self.validator is not None:
+                errors[:] = await self.validate_batch(
+                    list(payload.values()), [response.get(key) for key in payload], from_lang, to_lang
+                )
+            else:
+                errors[:] = [
+                    None if isinstance(response.get(key), str) and response[key].strip() else "empty translation"
+                    for key in payload
+                ]
+            if all(errors):
+                raise ValueError(f"No valid turn translations in response: {errors[0]}")
+
+        hints = self.build_hints(from_lang, to_lang, "\n".join(payload.values()))
+        messages = [
+            {"role": "system", "content": self.prompts.conversation_system_prompt(from_lang, to_lang) + hints},
+            {"role": "user", "content": json.dumps(payload, ensure_ascii=False)}
+        ]
+        response = await self.openai_handler.request_json(
             messages=messages,
-            temp=0.7
+            temp=0.7,
+            validator_callback=validate
         )
+        self.stats["requests"] += 1
+        self.stats["conversation_requests"] += 1
 
-        return translated_text
+        for position, i in enumerate(pending):
+            value = response.get(str(position))
+            if errors[position] is None:
+                translations[i] = value
+            else:
+                self.stats["conversation_fallback_turns"] += 1
+        return translations
@@ -0,0 +1,205 @@
+import re
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Sequence
+from .prefilter import REQUIRED_SCRIPTS, missing_required_script, primary_language, script_ratio, target_scripts
+
+# 所有可用的本地校验项
+VALIDATION_CHECKS = ["chatty_prefix", "length_ratio", "script", "code_fences", "markdown", "placeholders", "numbers"]
+
+# 模型在译文前添加的客套话，例如 "Here is the translation:"、"以下是翻译："
+_CHATTY_PREFIX = re.compile(
+    r"^\s*(?:"
+    r"(?:(?:sure|certainly|of course|okay|ok)[\s,.!]*)?here(?:'s| is| are)\b[^\n]{0,40}?\btranslat"
+    r"|(?:the )?translation(?: is)?\s*:"
+    r"|(?:好的[，,。！!]?\s*)?以下是[^\n]{0,20}?(?:翻译|译文)"
+    r"|(?:翻译|译文)(?:如下|结果)?\s*[：:]"
+    r")",
+    re.IGNORECASE
+)
+_CODE_FENCE = re.compile(r"^\s*(?:```|~~~)", re.MULTILINE)
+_HEADING = re.compile(r"^\s{0,3}#{1,6}\s", re.MULTILINE)
+_LIST_ITEM = re.compile(r"^\s*(?:[-*+]|\d+[.)])\s+\S", re.MULTILINE)
+# 需原样保留的占位符：遮蔽占位符、{name}、%s/%d、$1 等
+_PLACEHOLDER = re.compile(r"\{\{KEEP_\d+\}\}|\{[A-Za-z_][A-Za-z0-9_]*\}|%[sd]|%\([A-Za-z_]+\)[sd]|\$\d+")
+_NUMBER = re.compile(r"\d+(?:[.,]\d+)*")
+
+# 少于该长度的原文不做长度比例和文字比例校验
+_MIN_CHECK_LENGTH = 20
+
+
+class ValidationError(ValueError):
+    """译文未通过本地校验"""
+
+
+def _numbers(text: str) -> Counter:
+    return Counter(number.replace(",", "") for number in _NUMBER.findall(text))
+
+
+class TranslationValidator:
+    """译文本地校验器：在重试循环内用廉价的本地规则拦截截断、夹带原文、客套前缀、格式丢失等问题"""
+
+    def __init__(self, config: Dict[str, Any] = None):
+        """
+        初始化校验器
+
+        Args:
+            config: 格式配置中的 validation 部分，支持的键：
+                enabled: 是否启用，默认false（需在格式配置中显式启用）
+                checks: 启用的校验项，默认 VALIDATION_CHECKS
+                min_length_ratio / max_length_ratio: 译文与原文长度比例的上下限，默认0.1 / 5.0
+                min_script_ratio: 译文中目标语言文字的最低比例，默认0.3
+                min_number_recall: 原文数字在译文中保留的最低比例，默认0.5
+        """
+        config = config or {}
+        self.enabled = config.get("enabled", False)
+        self.checks = config.get("checks", VALIDATION_CHECKS)
+        self.min_length_ratio = config.get("min_length_ratio", 0.1)
+        self.max_length_ratio = config.get("max_length_ratio", 5.0)
+        self.min_script_ratio = config.get("min_script_ratio", 0.3)
+        self.min_number_recall = config.get("min_number_recall", 0.5)
+        self.stats = Counter()
+
+        unknown = [check for check in self.checks if check not in VALIDATION_CHECKS]
+        if unknown:
+            raise ValueError(f"Unknown validation checks: {unknown}")
+
+    def validate_batch(self, sources: Sequence[str], translations: Sequence[Any], from_lang: str,
+                       to_lang: str) -> List[Optional[str]]:
+        """
+        批量校验译文并记录拒绝统计
+
+        Args:
+            sources: 原文列表
+            translations: 译文列表
+            from_lang: 源语言代码
+            to_lang: 目标语言代码
+
+        Returns:
+            List[Optional[str]]: 每条译文的错误信息，通过校验时为None
+        """
+        errors = self.check_batch(sources, translations, from_lang, to_lang)
+        self.record(errors)
+        return errors
+
+    def check_batch(self, sources: Sequence[str], translations: Sequence[Any], from_lang: str,
+                    to_lang: str) -> List[Optional[str]]:
+        """
+        批量校验译文，每个校验项对整批数据依次执行
+
+        不修改校验器状态，可以在线程池/进程池中执行，之后由调用方通过 record 记录统计。
+
+        Args:
+            sources: 原文列表
+            translations: 译文列表
+            from_lang: 源语言代码
+            to_lang: 目标语言代码
+
+        Returns:
+            List[Optional[str]]: 每条译文的错误信息，通过校验时为None
+        """
+        errors: List[Optional[str]] = [
+            None if isinstance(translation, str) and translation.strip() else "empty translation"
+            for translation in translations
+        ]
+        if not self.enabled:
+            return errors
+
+        pending = [i for i, error in enumerate(errors) if error is None]
+        for check in self.checks:
+            if not pending:
+                break
+            method: Callable[[str, str, str, str], Optional[str]] = getattr(self, f"_check_{check}")
+            still_pending = []
+            for i in pending:
+                error = method(sources[i], translations[i], from_lang, to_lang)
+                if error:
+                    errors[i] = f"{check}: {error}"
+                else:
+                    still_pending.append(i)
+            pending = still_pending
+        return errors
+
+    def record(self, errors: Sequence[Optional[str]]) -> None:
+        """记录 check_batch 结果中各校验项的拒绝次数"""
+        for error in errors:
+            if error:
+                self.stats[error.split(":")[0]] += 1
+
+    def validate(self, source: str, translation: Any, from_lang: str, to_lang: str) -> None:
+        """
+        校验单条译文
+
+        Raises:
+            ValidationError: 未通过校验时抛出
+        """
+        self.raise_for(self.validate_batch([source], [translation], from_lang, to_lang)[0])
+
+    @staticmethod
+    def raise_for(error: Optional[str]) -> None:
+        """
+        将校验结果转换为异常
+
+        Raises:
+            ValidationError: error不为None时抛出
+        """
+        if error:
+            raise ValidationError(f"Translation rejected by {error}")
+
+    def _check_chatty_prefix(self, source: str, translation: str, from_lang: str, to_lang: str) -> Optional[str]:
+        if _CHATTY_PREFIX.match(translation) and not _CHATTY_PREFIX.match(source):
+            return "unexpected preamble before the translation"
+        return None
+
+    def _check_length_ratio(self, source: str, translation: str, from_lang: str, to_lang: str) -> Optional[str]:
+        if len(source) < _MIN_CHECK_LENGTH:
+            return None
+        ratio = len(translation) / len(source)
+        if ratio < self.min_length_ratio:
+            return f"translation too short ({ratio:.2f}x), possibly truncated"
+        if ratio > self.max_length_ratio:
+            return f"translation too long ({ratio:.2f}x)"
+        return None
+
+    def _check_script(self, source: str, translation: str, from_lang: str, to_lang: str) -> Optional[str]:
+        scripts = target_scripts(from_lang, to_lang)
+        if scripts is None:
+            return None
+        if sum(1 for char in translation if char.isalpha()) < _MIN_CHECK_LENGTH:
+            return None
+        ratio = script_ratio(translation, scripts)
+        if ratio < self.min_script_ratio:
+            return f"only {ratio:.0%} of letters are in the {to_lang} script"
+        if missing_required_script(translation, to_lang):
+            return f"no {REQUIRED_SCRIPTS[primary_language(to_lang)]} characters for {to_lang}"
+        return None
+
+    def _check_code_fences(self, source: str, translation: str, from_lang: str, to_lang: str) -> Optional[str]:
+        expected = len(_CODE_FENCE.findall(source))
+        actual = len(_CODE_FENCE.findall(translation))
+        if expected != actual:
+            return f"expected {expected} code fence markers, got {actual}"
+        return None
+
+    def _check_markdown(self, source: str, translation: str, from_lang: str, to_lang: str) -> Optional[str]:
+        for name, pattern in (("headings", _HEADING), ("list items", _LIST_ITEM)):
+            expected = len(pattern.findall(source))
+            actual = len(pattern.findall(translation))
+            if expected != actual:
+                return f"expected {expected} {name}, got {actual}"
+        return None
+
+    def _check_placeholders(self, source: str, translation: str, from_lang: str, to_lang: str) -> Optional[str]:
+        missing = Counter(_PLACEHOLDER.findall(source)) - Counter(_PLACEHOLDER.findall(translation))
+        if missing:
+            return f"missing placeholders {sorted(missing)}"
+        return None
+
+    def _check_numbers(self, source: str, translation: str, from_lang: str, to_lang: str) -> Optional[str]:
+        expected = _numbers(source)
+        if not expected:
+            return None
+        kept = sum((expected & _numbers(translation)).values())
+        recall = kept / sum(expected.values())
+        if recall < self.min_number_recall:
+            return f"only {recall:.0%} of numbers preserved"
+        return None
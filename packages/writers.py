@@ -0,0 +1,308 @@
+import os
+import io
+import json
+import gzip
+import asyncio
+from concurrent.futures import Executor, Future
+from typing import Any, Dict, List, Optional, Tuple
+from .jsoncodec import dumps
+from .offload import create_executor
+from .quarantine import FAILED_FIELDS_FILENAME
+from .readers import LocalSplit
+
+OUTPUT_FORMATS = ["json", "jsonl"]
+COMPRESSIONS = ["none", "gzip", "zstd"]
+COMPRESSION_SUFFIXES = {"none": "", "gzip": ".gz", "zstd": ".zst"}
+
+# JSON格式输出的文件名（不含压缩后缀）
+JSON_OUTPUT_FILENAME = "translated_dataset.json"
+
+# 写入缓冲区大小
+WRITE_BUFFER_SIZE = 8 * 1024 * 1024
+
+
+def encode_rows(rows: List[Dict[str, Any]], indent: Optional[int] = None) -> List[bytes]:
+    """
+    将一批数据项序列化为UTF-8编码的JSON
+
+    模块级函数，便于在进程池中执行。
+
+    Args:
+        rows: 数据项列表
+        indent: 缩进空格数，None表示紧凑输出
+
+    Returns:
+        List[bytes]: 每个数据项的JSON
+    """
+    return [dumps(row, indent) for row in rows]
+
+
+def open_output(path: str, compression: str = "none") -> io.RawIOBase:
+    """
+    以二进制写模式打开输出文件，按需在写入时流式压缩
+
+    Args:
+        path: 文件路径（已包含压缩后缀）
+        compression: none、gzip 或 zstd
+
+    Returns:
+        文件对象
+    """
+    if compression == "gzip":
+        return gzip.open(path, "wb", compresslevel=6)
+    if compression == "zstd":
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError("zstd compression requires the 'zstandard' package")
+        raw = open(path, "wb")
+        return zstandard.ZstdCompressor(level=3).stream_writer(raw, closefd=True)
+    if compression != "none":
+        raise ValueError(f"Unknown compression '{compression}'. Available: {COMPRESSIONS}")
+    return open(path, "wb", buffering=WRITE_BUFFER_SIZE)
+
+
+def open_input(path: str) -> io.RawIOBase:
+    """按文件后缀以二进制读模式打开（可能被压缩的）输出文件"""
+    if path.endswith(".gz"):
+        return gzip.open(path, "rb")
+    if path.endswith(".zst"):
+        import zstandard
+        return zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)
+    return open(path, "rb")
+
+
+class DatasetWriter:
+    """
+    流式数据集写入器
+
+    数据项按split顺序写入，每积累 chunk_size 条提交到线程池/进程池序列化，
+    序列化结果按提交顺序经大块缓冲写入文件，写入时可选gzip/zstd压缩。
+    """
+
+    def __init__(self, output_dir: str, output_format: str = "json", compression: str = "none",
+                 indent: Optional[int] = None, workers: int = 0, executor_type: str = "thread",
+                 chunk_size: int = 1000):
+        """
+        初始化写入器
+
+        Args:
+            output_dir: 输出目录
+            output_format: json（所有split写入一个 {split: [...]} 文件）或 jsonl（每个split一个文件）
+            compression: none、gzip 或 zstd
+            indent: JSON缩进空格数，默认None（紧凑输出）
+            workers: 序列化并行数，0表示在当前线程序列化
+            executor_type: thread 或 process
+            chunk_size: 每次提交序列化的数据项数量
+        """
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unknown output format '{output_format}'. Available: {OUTPUT_FORMATS}")
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"Unknown compression '{compression}'. Available: {COMPRESSIONS}")
+
+        self.output_dir = output_dir
+        self.output_format = output_format
+        self.compression = compression
+        # JSONL每行一个数据项，不支持缩进
+        self.indent = indent if output_format == "json" else None
+        self.chunk_size = chunk_size
+        self.counts: Dict[str, int] = {}
+        self.paths: List[str] = []
+
+        self._executor: Optional[Executor] = create_executor(executor_type, workers) if workers > 0 else None
+
+        self._file = None
+        self._split: Optional[str] = None
+        self._chunk: List[Dict[str, Any]] = []
+        self._pending: List[Future] = []
+        self._first_row = True
+        os.makedirs(output_dir, exist_ok=True)
+
+    def _path(self, name: str) -> str:
+        path = os.path.join(self.output_dir, name + COMPRESSION_SUFFIXES[self.compression])
+        if path not in self.paths:
+            self.paths.append(path)
+        return path
+
+    def start_split(self, split: str) -> None:
+        """
+        开始写入一个新的split（写入第一个数据项时会自动调用，显式调用可保留空split）
+
+        Args:
+            split: split名称
+        """
+        if split in self.counts:
+            raise ValueError(f"Split '{split}' was already written; splits must be written one after another")
+        self._end_split()
+        self._split = split
+        self.counts[split] = 0
+        self._first_row = True
+
+        if self.output_format == "jsonl":
+            self._file = open_output(self._path(f"{split}.jsonl"), self.compression)
+        else:
+            if self._file is None:
+                self._file = open_output(self._path(JSON_OUTPUT_FILENAME), self.compression)
+                self._file.write(b"{")
+            else:
+                self._file.write(b",")
+            self._file.write(b"\n" + json.dumps(split, ensure_ascii=False).encode("utf-8") + b": [")
+
+    def _end_split(self) -> None:
+        if self._split is None:
+            return
+        self._submit()
+        self._drain(block=True)
+        if self.output_format == "jsonl":
+            self._file.close()
+            self._file = None
+        else:
+            self._file.write(b"\n]" if self.counts[self._split] else b"]")
+        self._split = None
+
+    def write(self, split: str, row: Dict[str, Any]) -> None:
+        """
+        写入一个数据项
+
+        Args:
+            split: split名称
+            row: 数据项
+        """
+        if split != self._split:
+            self.start_split(split)
+        self._chunk.append(row)
+        self.counts[split] += 1
+        if len(self._chunk) >= self.chunk_size:
+            self._submit()
+            self._drain(block=False)
+
+    def write_rows(self, split: str, rows: List[Dict[str, Any]]) -> None:
+        """
+        按顺序写入一批数据项
+
+        Args:
+            split: split名称
+            rows: 数据项列表
+        """
+        for row in rows:
+            self.write(split, row)
+
+    def _submit(self) -> None:
+        if not self._chunk:
+            return
+        if self._executor is not None:
+            future = self._executor.submit(encode_rows, self._chunk, self.indent)
+        else:
+            future = Future()
+            future.set_result(encode_rows(self._chunk, self.indent))
+        self._pending.append(future)
+        self._chunk = []
+
+    def _drain(self, block: bool) -> None:
+        """按提交顺序写出已完成序列化的数据块"""
+        while self._pending and (block or self._pending[0].done()):
+            encoded = self._pending.pop(0).result()
+            if self.output_format == "jsonl":
+                self._file.write(b"\n".join(encoded) + b"\n")
+            else:
+                self._file.write((b"\n" if self._first_row else b",\n") + b",\n".join(encoded))
+                self._first_row = False
+
+    def close(self) -> None:
+        """写出剩余数据并关闭文件"""
+        self._end_split()
+        if self._file is not None:
+            self._file.write(b"\n}\n")
+            self._file.close()
+            self._file = None
+        elif self.output_format == "json" and not self.counts:
+            with open_output(self._path(JSON_OUTPUT_FILENAME), self.compression) as f:
+                f.write(b"{}\n")
+        if self._executor is not None:
+            self._executor.shutdown()
+
+    async def aclose(self) -> None:
+        """在线程中完成剩余的序列化和写入，避免阻塞事件循环"""
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
+
+
+def _split_files(output_dir: str) -> List[str]:
+    """输出目录中的文件名，不含失败字段记录等旁路文件"""
+    if not os.path.isdir(output_dir):
+        return []
+    return sorted(name for name in os.listdir(output_dir) if name != FAILED_FIELDS_FILENAME)
+
+
+def find_output(output_dir: str) -> Tuple[str, str]:
+    """
+    识别已有输出目录的格式和压缩方式
+
+    Returns:
+        Tuple[str, str]: (输出格式, 压缩方式)
+
+    Raises:
+        FileNotFoundError: 目录中没有翻译结果时抛出
+    """
+    names = _split_files(output_dir)
+    for compression, suffix in COMPRESSION_SUFFIXES.items():
+        if JSON_OUTPUT_FILENAME + suffix in names:
+            return "json", compression
+    for compression, suffix in COMPRESSION_SUFFIXES.items():
+        if suffix and any(name.endswith(".jsonl" + suffix) for name in names):
+            return "jsonl", compression
+    if any(name.endswith(".jsonl") for name in names):
+        return "jsonl", "none"
+    raise FileNotFoundError(f"No translated dataset found in '{output_dir}'")
+
+
+def load_output(output_dir: str) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    读取已有的翻译结果
+
+    Args:
+        output_dir: 输出目录
+
+    Returns:
+        Dict[str, List[Dict[str, Any]]]: split -> 数据项列表
+    """
+    output_format, compression = find_output(output_dir)
+    suffix = COMPRESSION_SUFFIXES[compression]
+
+    if output_format == "json":
+        with open_input(os.path.join(output_dir, JSON_OUTPUT_FILENAME + suffix)) as f:
+            return json.loads(f.read())
+
+    splits = {}
+    for name in _split_files(output_dir):
+        if name.endswith(".jsonl" + suffix):
+            split = name[:-len(".jsonl" + suffix)]
+            with open_input(os.path.join(output_dir, name)) as f:
+                splits[split] = [json.loads(line) for line in f.read().splitlines() if line.strip()]
+    return splits
+
+
+def open_output_splits(output_dir: str) -> Dict[str, Any]:
+    """
+    打开已有的翻译结果用于浏览
+
+    未压缩的JSONL输出和Parquet分片以内存映射方式按需读取（见 readers.LocalSplit），
+    其他格式整体读入内存。
+
+    Args:
+        output_dir: 输出目录
+
+    Returns:
+        Dict[str, Any]: split -> 数据（LocalSplit 或数据项列表）
+    """
+    names = _split_files(output_dir)
+    parquet_files = [name for name in names if name.endswith(".parquet")]
+    if parquet_files:
+        return {name[:-len(".parquet")]: LocalSplit(os.path.join(output_dir, name), "parquet") for name in parquet_files}
+
+    output_format, compression = find_output(output_dir)
+    if output_format == "jsonl" and compression == "none":
+        return {
+            name[:-len(".jsonl")]: LocalSplit(os.path.join(output_dir, name), "jsonl")
+            for name in names if name.endswith(".jsonl")
+        }
+    return load_output(output_dir)
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+测试共用的请求处理器与数据集翻译器
+"""
+
+import asyncio
+import inspect
+import json
+import re
+
+import pytest
+
+from packages.config import ConfigManager
+from packages.pipeline import DatasetTranslator
+
+# 单语言和对话系统提示中的目标语言，例如 "特别是en和zh-CN之间的翻译"
+_TARGET_LANG = re.compile(r"和(\S+?)之间")
+# 多目标语言系统提示中的目标语言列表，例如 "目标语言：zh-CN, ja"
+_TARGET_LANGS = re.compile(r"目标语言：(.+)")
+
+
+async def _validate(validator_callback, response):
+    if validator_callback:
+        result = validator_callback(response)
+        if inspect.isawaitable(result):
+            await result
+
+
+class FakeOpenAIHandler:
+    """
+    不请求API的请求处理器，记录请求原文并按规则生成译文
+
+    JSON模式下按用户消息区分对话整体翻译（JSON对象，逐轮返回）与多目标语言翻译（按语言返回）。
+    """
+
+    def __init__(self, translate=None, json_langs=None, drop_last_turn=False, delay=False):
+        """
+        Args:
+            translate: 译文生成函数 (原文, 目标语言) -> 译文，默认 "译文 {原文}"
+            json_langs: 多目标语言响应中包含的语言，默认为请求的所有语言，用于模拟缺少或多出语言键
+            drop_last_turn: 对话整体翻译时丢弃最后一轮，模拟无效响应
+            delay: 是否按文本长度模拟不同的响应耗时
+        """
+        self.translate = translate or (lambda text, lang: f"译文 {text}")
+        self.json_langs = json_langs
+        self.drop_last_turn = drop_last_turn
+        self.delay = delay
+        self.texts = []
+        self.requests = 0
+        self.json_requests = 0
+        self.conversation_langs = []
+
+    async def request(self, messages, model=None, temp=0.7, validator_callback=None):
+        self.requests += 1
+        text = messages[-1]["content"]
+        self.texts.append(text)
+        if self.delay:
+            await asyncio.sleep(0.001 * (len(text) % 5))
+        content = self.translate(text, _TARGET_LANG.search(messages[0]["content"]).group(1))
+        await _validate(validator_callback, content)
+        return content
+
+    async def request_json(self, messages, model=None, temp=0.7, validator_callback=None):
+        self.json_requests += 1
+        text = messages[-1]["content"]
+        if text.startswith("{"):
+            lang = _TARGET_LANG.search(messages[0]["content"]).group(1)
+            self.conversation_langs.append(lang)
+            payload = json.loads(text)
+            last = str(len(payload) - 1)
+            response = {
+                key: self.translate(value, lang) for key, value in payload.items()
+                if not (self.drop_last_turn and key == last)
+            }
+        else:
+            langs = self.json_langs or _TARGET_LANGS.search(messages[0]["content"]).group(1).split(", ")
+            response = {lang: self.translate(text, lang) for lang in langs}
+        await _validate(validator_callback, response)
+        return response
+
+
+@pytest.fixture
+def make_handler():
+    """创建 FakeOpenAIHandler，参数见其构造函数"""
+    return FakeOpenAIHandler
+
+
+@pytest.fixture
+def make_translator():
+    """按内置格式配置创建源语言为 en 的 DatasetTranslator，config 中的各部分覆盖格式配置"""
+    def create(handler, format_name="alpaca", to_langs=("zh-CN",), config=None, **kwargs):
+        format_handler = ConfigManager("configs").create_format_handler(format_name)
+        format_handler.config.update(config or {})
+        format_handler.conversation = format_handler.config.get("conversation") or {}
+        return DatasetTranslator(handler, format_handler, from_lang="en", to_langs=list(to_langs), **kwargs)
+    return create
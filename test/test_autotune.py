@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+测试并发自动调节
+"""
+
+import asyncio
+import time
+
+from packages.autotune import ConcurrencyTuner, load_operating_point, save_operating_point
+
+
+async def run_requests(tuner, count, capacity, latency=0.005, fail=lambda i: False):
+    """模拟只能同时处理 capacity 个请求的后端，超出的请求排队，延迟随之上升"""
+    server = asyncio.Semaphore(capacity)
+
+    async def one(i):
+        await tuner.acquire()
+        started = time.perf_counter()
+        async with server:
+            await asyncio.sleep(latency)
+        tuner.release(time.perf_counter() - started, not fail(i))
+
+    await asyncio.gather(*(one(i) for i in range(count)))
+
+
+def test_tuner_finds_backend_capacity():
+    """测试慢启动提升并发，后端饱和后延迟上升时回退，工作点接近后端容量"""
+    tuner = ConcurrencyTuner(initial=1, maximum=128, verbose=False)
+    asyncio.run(run_requests(tuner, 800, capacity=8))
+
+    point = tuner.operating_point()
+    assert 4 <= point["max_concurrent"] <= 16
+    assert tuner.in_flight == 0
+
+
+def test_tuner_backs_off_on_errors():
+    """测试错误率过高时回退"""
+    tuner = ConcurrencyTuner(initial=16, maximum=64, verbose=False)
+    asyncio.run(run_requests(tuner, 200, capacity=64, fail=lambda i: i % 3 == 0))
+    assert tuner.limit < 16
+    assert tuner.best is None
+
+
+def test_operating_point_state(tmp_path):
+    """测试工作点按后端标识分别保存"""
+    path = str(tmp_path / "autotune.json")
+    assert load_operating_point(path, "a") is None
+    save_operating_point(path, "a", {"max_concurrent": 12})
+    save_operating_point(path, "b", {"max_concurrent": 3})
+    assert load_operating_point(path, "a") == {"max_concurrent": 12}
+    assert load_operating_point(path, "b")["max_concurrent"] == 3
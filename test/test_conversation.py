@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+测试对话模式的分组与整体翻译
+"""
+
+import asyncio
+
+from packages.config import ConfigManager
+from packages.translate import OpenAITranslator
+
+
+def test_group_conversation_fields():
+    """测试对话轮次按窗口分组"""
+    handler = ConfigManager("configs").create_format_handler("sharegpt")
+    item = {"conversations": [{"from": "human", "value": "x" * 10}] * 5}
+    fields = handler.extract_translatable_content(item)
+
+    assert handler.group_conversation_fields(fields) == [[0, 1, 2, 3, 4]]
+
+    handler.conversation = {"enabled": True, "max_chars": 25}
+    assert handler.group_conversation_fields(fields) == [[0, 1], [2, 3], [4]]
+
+    handler.conversation = {}
+    assert handler.group_conversation_fields(fields) == [[0], [1], [2], [3], [4]]
+
+
+def test_translate_conversation_partial(make_handler):
+    """测试整体翻译缺失的轮次不包含在结果中，由调用方回退"""
+    openai_handler = make_handler(drop_last_turn=True)
+    translator = OpenAITranslator(openai_handler)
+    turns = ["first turn", "second turn", "third turn"]
+
+    translations = asyncio.run(translator.translate_conversation("en", "zh-CN", turns))
+
+    assert translations == {0: "译文 first turn", 1: "译文 second turn"}
+    assert openai_handler.json_requests == 1 and openai_handler.requests == 0
+    assert translator.stats["conversation_fallback_turns"] == 1
+
+
+def test_align_fields():
+    """测试按字段路径对齐原文与译文"""
+    handler = ConfigManager("configs").create_format_handler("sharegpt")
+    source = {"conversations": [{"from": "human", "value": "Hi"}, {"from": "gpt", "value": "Hello"}]}
+    translated = {"conversations": [{"from": "human", "value": "你好"}]}
+
+    aligned = handler.align_fields(source, translated)
+    assert [source_text for _, source_text, _ in aligned] == ["Hi", "Hello"]
+    assert [target for _, _, target in aligned] == ["你好", None]
+
+
+def test_translate_window_pipeline(make_handler, make_translator):
+    """测试对话窗口按 max_turns/max_chars 切分，缺失的轮次逐轮回退，译文写回各自的 conversations[i].value"""
+    handler = make_handler(drop_last_turn=True)
+    translator = make_translator(handler, "sharegpt", config={"conversation": {"enabled": True, "max_chars": 40, "max_turns": 2}})
+    long_turn = "A long answer that goes well over the limit."
+    row = {"conversations": [
+        {"from": "system", "value": "Keep me"},
+        {"from": "human", "value": "Hello there"},
+        {"from": "gpt", "value": "General Kenobi"},
+        {"from": "human", "value": long_turn},
+        {"from": "gpt", "value": "How are you"},
+        {"from": "human", "value": "Fine thanks"},
+        {"from": "gpt", "value": "Bye now"},
+    ]}
+    fields = translator.format_handler.extract_translatable_content(row)
+    # 超过 max_chars 的轮次单独成组，每组最多 max_turns 轮
+    assert translator.format_handler.group_conversation_fields(fields) == [[0, 1], [2], [3, 4], [5]]
+
+    result = asyncio.run(translator.translate_batch([row]))["zh-CN"][0]
+
+    assert result["conversations"][0] == row["conversations"][0]
+    assert [turn["from"] for turn in result["conversations"]] == [turn["from"] for turn in row["conversations"]]
+    assert [turn["value"] for turn in result["conversations"][1:]] == [
+        f"译文 {turn['value']}" for turn in row["conversations"][1:]
+    ]
+    # 两个多轮窗口各一次整体请求，每个窗口的最后一轮缺失后逐轮回退；单轮的组直接逐轮请求
+    assert handler.json_requests == 2
+    assert sorted(handler.texts) == sorted(["General Kenobi", long_turn, "Fine thanks", "Bye now"])
+    assert translator.stats["conversation_fallback_turns"] == 2
+    assert len(translator.failures) == 0
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+测试行哈希与增量翻译
+"""
+
+import asyncio
+import os
+
+from packages.delta import PriorOutput, RowIndex, ROW_INDEX_FILENAME, row_hash
+from packages.formats.base import TranslatableField
+from packages.writers import DatasetWriter, load_output
+
+
+def run_split(translator, rows, output_dir, prior=None):
+    """翻译一个split并写出结果和行哈希索引"""
+    writer = DatasetWriter(output_dir, output_format="jsonl")
+    writer.start_split("train")
+
+    async def emit(lang, batch):
+        writer.write_rows("train", batch)
+
+    row_index = RowIndex(translator.format_handler.name, translator.from_lang)
+    row_index.splits["train"] = asyncio.run(translator.translate_split(rows, "train", emit, prior=prior))
+    writer.close()
+    row_index.save(os.path.join(output_dir, ROW_INDEX_FILENAME))
+    return load_output(output_dir)["train"]
+
+
+def test_row_hash():
+    """测试行哈希只由字段路径和内容决定"""
+    fields = [TranslatableField("instruction", "Hello", "string"), TranslatableField("output", "World", "string")]
+    same = [TranslatableField("instruction", "Hello", "string"), TranslatableField("output", "World", "string")]
+    moved = [TranslatableField("instruction", "HelloWorld", "string"), TranslatableField("output", "", "string")]
+
+    assert row_hash(fields) == row_hash(same)
+    assert row_hash(fields) != row_hash(moved)
+    assert row_hash(fields) != row_hash(fields[:1])
+
+
+def test_delta_translation(tmp_path, make_handler, make_translator):
+    """测试增量翻译只翻译新增和修改的数据项，其余复用之前的译文"""
+    rows = [{"instruction": f"Task {i}", "input": "", "output": f"Answer {i}"} for i in range(6)]
+    first = run_split(make_translator(make_handler()), rows, str(tmp_path / "v1"))
+
+    changed = [dict(row) for row in rows]
+    changed[2]["output"] = "Answer 2, revised"
+    changed.append({"instruction": "Task 6", "input": "", "output": "Answer 6"})
+
+    handler = make_handler()
+    translator = make_translator(handler)
+    prior = PriorOutput({"zh-CN": str(tmp_path / "v1")}, translator.format_handler, "en")
+    second = run_split(translator, changed, str(tmp_path / "v2"), prior=prior)
+
+    assert sorted(handler.texts) == ["Answer 2, revised", "Answer 6", "Task 2", "Task 6"]
+    assert translator.stats["reused_rows"] == 5
+    assert second[:2] == first[:2] and second[3:6] == first[3:6]
+    assert second[2]["output"] == "译文 Answer 2, revised"
+    assert second[6]["instruction"] == "译文 Task 6"
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+测试翻译记忆库与术语表
+"""
+
+import asyncio
+import re
+
+from packages.memory import TranslationMemory, Glossary
+
+
+def test_exact_lookup(tmp_path):
+    """测试精确匹配与持久化"""
+    path = str(tmp_path / "memory.jsonl")
+    memory = TranslationMemory(path)
+    memory.add("en", "zh-CN", "Hello  world", "你好世界")
+
+    assert memory.lookup("en", "zh-CN", "Hello world") == "你好世界"
+    assert memory.lookup("en", "ja", "Hello world") is None
+
+    memory.save()
+    reloaded = TranslationMemory(path)
+    assert len(reloaded) == 1
+    assert reloaded.lookup("en", "zh-CN", "Hello world") == "你好世界"
+
+
+def test_fuzzy_lookup():
+    """测试相似片段的模糊匹配"""
+    memory = TranslationMemory(threshold=0.5)
+    memory.add("en", "zh-CN", "The patient reported feeling anxious about work.", "患者表示对工作感到焦虑。")
+    memory.add("en", "zh-CN", "Completely unrelated sentence about the weather.", "一句关于天气的无关句子。")
+
+    matches = memory.fuzzy_lookup("en", "zh-CN", "The patient reported feeling anxious about school.")
+    assert matches
+    assert matches[0][2] == "患者表示对工作感到焦虑。"
+
+
+def test_memory_only_keeps_restored_translations(make_handler, make_translator):
+    """测试只有成功还原遮蔽片段的译文才会加入翻译记忆"""
+    memory = TranslationMemory()
+    # 译文丢弃遮蔽占位符
+    handler = make_handler(lambda text, lang: "译文 " + re.sub(r"\{\{KEEP_\d+\}\}", "", text))
+    translator = make_translator(handler, memory=memory)
+    rows = [{"instruction": "Run `ls -la` in the shell", "input": "", "output": "Plain answer"}]
+    results = asyncio.run(translator.translate_batch(rows))
+
+    assert results["zh-CN"][0]["output"] == "译文 Plain answer"
+    assert len(translator.failures) == 1
+    assert memory.lookup("en", "zh-CN", "Plain answer") == "译文 Plain answer"
+    assert memory.lookup("en", "zh-CN", "Run {{KEEP_0}} in the shell") is None
+    assert len(memory) == 1
+
+
+def test_glossary_match():
+    """测试术语匹配"""
+    glossary = Glossary({"cognitive behavioral therapy": {"zh-CN": "认知行为疗法"}, "anxiety": {"zh-CN": "焦虑"}})
+    terms = glossary.match("Cognitive behavioral therapy is used to treat anxiety.", "zh-CN")
+
+    assert ("cognitive behavioral therapy", "认知行为疗法") in terms
+    assert ("anxiety", "焦虑") in terms
+    assert glossary.match("Cognitive behavioral therapy", "ja") == []
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+测试一次JSON模式请求翻译为多种目标语言
+"""
+
+import asyncio
+
+import pytest
+
+from packages.translate import OpenAITranslator
+
+LANGS = ["zh-CN", "ja"]
+
+
+def by_lang(text, lang):
+    """译文以目标语言代码开头"""
+    return f"{lang} {text}"
+
+
+def test_multi_target_fan_out(make_handler, make_translator):
+    """测试一次请求的JSON响应按语言拆分到各自的输出"""
+    handler = make_handler(by_lang)
+    rows = [{"instruction": "Hello", "input": "", "output": "World"}]
+    results = asyncio.run(make_translator(handler, to_langs=LANGS, multi_target_json=True).translate_batch(rows))
+
+    assert handler.json_requests == 2 and handler.requests == 0
+    assert results["zh-CN"] == [{"instruction": "zh-CN Hello", "input": "", "output": "zh-CN World"}]
+    assert results["ja"] == [{"instruction": "ja Hello", "input": "", "output": "ja World"}]
+
+
+@pytest.mark.parametrize("json_langs", [["zh-CN"], ["zh-CN", "ja", "fr"]])
+def test_multi_target_rejects_language_keys(make_handler, json_langs):
+    """测试缺少或多出语言键的响应被拒绝"""
+    translator = OpenAITranslator(make_handler(by_lang, json_langs=json_langs))
+    with pytest.raises(ValueError, match="Missing translations|Unexpected languages"):
+        asyncio.run(translator.translate_multi("en", LANGS, "Hello"))
+
+
+def test_multi_target_fallback(make_handler, make_translator):
+    """测试JSON响应无效时回退为逐语言请求"""
+    handler = make_handler(by_lang, json_langs=["zh-CN"])
+    translator = make_translator(handler, to_langs=LANGS, multi_target_json=True)
+    results = asyncio.run(translator.translate_batch([{"instruction": "Hello", "input": "", "output": "World"}]))
+
+    assert handler.json_requests == 2 and handler.requests == 4
+    assert results["ja"] == [{"instruction": "ja Hello", "input": "", "output": "ja World"}]
+    assert translator.stats["multi_target_fallbacks"] == 2
+    assert len(translator.failures) == 0
+
+
+def test_multi_target_conversation_mode(make_handler, make_translator):
+    """测试对话模式下对话窗口按目标语言分别整体翻译，单轮字段仍使用多目标语言JSON请求"""
+    handler = make_handler(by_lang)
+    rows = [
+        {"conversations": [{"from": "human", "value": "Hi there"}, {"from": "gpt", "value": "Hello"}]},
+        {"conversations": [{"from": "human", "value": "Only turn"}]},
+    ]
+    results = asyncio.run(make_translator(handler, "sharegpt", to_langs=LANGS, multi_target_json=True).translate_batch(rows))
+
+    assert sorted(handler.conversation_langs) == sorted(LANGS)
+    assert handler.json_requests == 3 and handler.requests == 0
+    for lang in LANGS:
+        assert [[turn["value"] for turn in row["conversations"]] for row in results[lang]] == [
+            [f"{lang} Hi there", f"{lang} Hello"], [f"{lang} Only turn"]
+        ]
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+测试CPU阶段的执行器边界与事件循环延迟监测
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from packages.config import ConfigManager
+from packages.offload import CpuOffload, LoopLagMonitor
+from packages.translate import OpenAITranslator
+from packages.validators import TranslationValidator
+
+
+def double_all(values):
+    return [value * 2 for value in values]
+
+
+@pytest.mark.parametrize("executor_type", ["inline", "thread", "process"])
+def test_map_batches_keeps_order(executor_type):
+    """测试分批执行后结果保持原顺序"""
+    offload = CpuOffload(executor_type, workers=2, batch_size=3)
+    try:
+        assert asyncio.run(offload.map_batches(double_all, list(range(10)))) == [i * 2 for i in range(10)]
+    finally:
+        offload.close()
+
+
+def test_batch_extract_and_reconstruct():
+    """测试格式处理器的批量提取与组装，失败的数据项返回异常而不中断整批"""
+    handler = ConfigManager("configs").create_format_handler("alpaca")
+    items = [{"instruction": "Hello", "input": "", "output": "World"}, None]
+    extracted = handler.extract_batch(items)
+    assert [field.content for field in extracted[0]] == ["Hello", "World"]
+    assert isinstance(extracted[1], Exception)
+
+    rows = handler.reconstruct_batch([(items[0], extracted[0]), (items[0], None)])
+    assert rows[0] == items[0] and rows[0] is not items[0]
+    assert rows[1] is items[0]
+
+
+def test_loop_lag_monitor():
+    """测试阻塞事件循环的CPU工作会体现在延迟统计中"""
+    async def main():
+        monitor = LoopLagMonitor(interval=0.01)
+        monitor.start()
+        await asyncio.sleep(0.03)
+        time.sleep(0.1)
+        await asyncio.sleep(0.03)
+        await monitor.stop()
+        return monitor.summary()
+
+    summary = asyncio.run(main())
+    assert summary["samples"] > 0
+    assert summary["max_ms"] >= 50
+
+
+class CountingOffload(CpuOffload):
+    def __init__(self):
+        super().__init__("inline")
+        self.calls = 0
+
+    async def run(self, func, *args):
+        self.calls += 1
+        return await super().run(func, *args)
+
+
+def test_single_response_validated_inline(make_handler):
+    """测试单条译文在事件循环中直接校验，不提交到CPU执行器"""
+    offload = CountingOffload()
+    translator = OpenAITranslator(make_handler(), validator=TranslationValidator({"enabled": True}),
+                                  offload=offload)
+    assert asyncio.run(translator.translate("en", "zh-CN", "Hello")) == "译文 Hello"
+    result = asyncio.run(translator.translate_multi("en", ["zh-CN", "ja"], "Hello"))
+    assert result == {"zh-CN": "译文 Hello", "ja": "译文 Hello"}
+    assert offload.calls == 0
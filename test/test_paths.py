@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+测试带通配符的嵌套字段路径
+"""
+
+import pytest
+
+from packages.formats.generic import GenericFormatHandler
+from packages.formats.paths import compile_path
+
+CONFIG = {
+    "name": "content_parts",
+    "translatable_fields": [
+        {"field": "messages.*.content.*.text", "type": "path", "required": True, "condition": "type:text"},
+        {"field": "messages.*.tool_calls.*.function.arguments", "type": "path"},
+        {"field": "metadata.*.*", "type": "path"},
+    ],
+}
+
+ROW = {
+    "messages": [
+        {"role": "user", "content": [
+            {"type": "text", "text": "Hello"},
+            {"type": "image_url", "text": "ignored"},
+        ]},
+        {"role": "assistant", "content": [{"type": "text", "text": "Hi"}],
+         "tool_calls": [{"function": {"name": "search", "arguments": "weather today"}}]},
+    ],
+    "metadata": {"tags": ["greeting"], "0": ["digit key"]},
+}
+
+
+def test_compile_path():
+    """测试路径模式编译"""
+    assert compile_path("messages.*.content.0.text") == ("messages", "*", "content", 0, "text")
+    with pytest.raises(ValueError):
+        compile_path("messages..text")
+
+
+def test_extract_and_reconstruct_nested_paths():
+    """测试按通配符路径提取深层字段，并按字段路径写回"""
+    handler = GenericFormatHandler(CONFIG)
+    fields = handler.extract_translatable_content(ROW)
+
+    assert [(field.field_path, field.content) for field in fields] == [
+        ("messages.0.content.0.text", "Hello"),
+        ("messages.1.content.0.text", "Hi"),
+        ("messages.1.tool_calls.0.function.arguments", "weather today"),
+        ("metadata.tags.0", "greeting"),
+        ("metadata.0.0", "digit key"),
+    ]
+    assert fields[1].field_type == "list_item" and fields[1].index == 1
+    assert handler.validate_item(ROW) and not handler.validate_item({"metadata": {}})
+
+    for field in fields:
+        field.content = f"[zh] {field.content}"
+    result = handler.reconstruct_item(ROW, fields)
+    assert result["messages"][0]["content"][0]["text"] == "[zh] Hello"
+    assert result["messages"][0]["content"][1]["text"] == "ignored"
+    assert result["metadata"]["0"] == ["[zh] digit key"]
+    assert ROW["messages"][0]["content"][0]["text"] == "Hello"
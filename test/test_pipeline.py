@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+测试可嵌入的数据集翻译接口
+"""
+
+import asyncio
+
+ROWS = [{"instruction": f"Question {i} about something", "input": "", "output": f"Answer {i} in detail"} for i in range(12)]
+
+
+def chatty(text, lang):
+    """问题类文本带有客套前缀，其余返回固定格式译文"""
+    return f"翻译：{text}" if text.startswith("Q") else f"译文 {text}"
+
+
+# 启用译文校验，拒绝客套前缀
+VALIDATION = {"validation": {"enabled": True}}
+
+
+def test_translate_batch(make_handler, make_translator):
+    """测试批量翻译保持输入顺序，未通过校验的字段记录为失败"""
+    handler = make_handler(chatty, delay=True)
+    translator = make_translator(handler, config=VALIDATION, max_concurrent=3)
+    results = asyncio.run(translator.translate_batch(ROWS))
+
+    assert [row["output"] for row in results["zh-CN"]] == [f"译文 Answer {i} in detail" for i in range(12)]
+    assert handler.requests == 2 * len(ROWS)
+    assert translator.stats["requests"] == len(ROWS)
+    # 校验拒绝 "翻译：" 前缀后记录为失败字段，保留原文
+    assert results["zh-CN"][0]["instruction"] == ROWS[0]["instruction"]
+    assert translator.stats["validation_rejected"]["chatty_prefix"] > 0
+    assert len(translator.failures) == len(ROWS)
+
+
+def test_translate_rows_stream(make_handler, make_translator):
+    """测试流式翻译异步输入，按输入顺序逐条产出"""
+    async def source():
+        for row in ROWS:
+            await asyncio.sleep(0)
+            yield row
+
+    async def main():
+        translator = make_translator(make_handler(chatty, delay=True), config=VALIDATION, max_concurrent=3)
+        return [result async for result in translator.translate_rows(source(), window=4)]
+
+    results = asyncio.run(main())
+    assert [result["zh-CN"]["output"] for result in results] == [f"译文 Answer {i} in detail" for i in range(12)]
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+测试翻译前置过滤器
+"""
+
+import pytest
+
+from packages.prefilter import ContentFilter, missing_required_script, target_scripts
+
+ENABLED = {"enabled": True}
+
+
+def test_classify():
+    """测试无需翻译内容的识别"""
+    content_filter = ContentFilter(ENABLED)
+    assert content_filter.classify("https://example.com/a?b=1", "en", "zh-CN") == "url"
+    assert content_filter.classify("3.14 + 2 = 5.14", "en", "zh-CN") == "number"
+    assert content_filter.classify('{"key": [1, 2]}', "en", "zh-CN") == "json"
+    assert content_filter.classify("```python\nprint(1)\n```", "en", "zh-CN") == "code"
+    assert content_filter.classify("snake_case_name", "en", "zh-CN") == "identifier"
+    assert content_filter.classify("这已经是中文了", "en", "zh-CN") == "target_language"
+    assert content_filter.classify("Yes.", "en", "zh-CN") is None
+    assert content_filter.classify("Hello world", "en", "fr") is None
+
+
+def test_config_rules():
+    """测试按格式配置启用规则"""
+    content_filter = ContentFilter({"enabled": True, "rules": ["empty"], "patterns": [r"<img[^>]*>"]})
+    assert content_filter.classify("42", "en", "zh-CN") is None
+    assert content_filter.classify('<img src="a.png">', "en", "zh-CN") == "pattern"
+    # 未在格式配置中启用时不跳过也不遮蔽任何内容
+    assert ContentFilter().classify("", "en", "zh-CN") is None
+    assert ContentFilter({"rules": ["empty"]}).mask("see `x`") == ("see `x`", [])
+
+    with pytest.raises(ValueError):
+        ContentFilter({"rules": ["unknown"]})
+
+
+def test_mask_roundtrip():
+    """测试混合内容的遮蔽与还原"""
+    content_filter = ContentFilter(ENABLED)
+    text = "Run `pip install x`, see https://example.com and\n```\ncode\n```"
+    masked, segments = content_filter.mask(text)
+
+    assert "pip install" not in masked and "https://" not in masked
+    assert content_filter.unmask(masked, segments) == text
+
+    with pytest.raises(ValueError):
+        content_filter.unmask("lost placeholders", segments)
+
+
+def test_target_language_shared_script():
+    """测试共用汉字的目标语言需要包含假名才视为已是日语"""
+    content_filter = ContentFilter(ENABLED)
+    assert content_filter.classify("这已经是中文了", "en", "ja") is None
+    assert content_filter.classify("これは日本語です", "en", "ja") == "target_language"
+
+
+def test_target_scripts():
+    """测试前置过滤与译文校验共用的文字系统判断"""
+    assert target_scripts("en", "zh-CN") == ("han",)
+    assert target_scripts("zh-CN", "ja") is None
+    assert target_scripts("en", "fr") is None
+    assert missing_required_script("这已经是中文了", "ja")
+    assert not missing_required_script("これは日本語です", "ja")
+    assert not missing_required_script("这已经是中文了", "zh-CN")
+
+
+def test_identifier_ascii_only():
+    """测试含数字或标点的中日韩句子不会被当作标识符跳过"""
+    content_filter = ContentFilter(ENABLED)
+    for text in ["我今年25岁", "第1章", "我有3个苹果", "他说:你好", "版本v2发布了"]:
+        assert content_filter.classify(text, "zh-CN", "en") is None
+    assert content_filter.classify("v1.2", "zh-CN", "en") == "identifier"
+    assert content_filter.classify("config/settings.py", "zh-CN", "en") == "identifier"
+
+
+def test_code_rule_single_block_only():
+    """测试多个代码块之间夹有说明文字时不会整段跳过，说明文字经遮蔽后翻译"""
+    content_filter = ContentFilter(ENABLED)
+    text = "```py x``` Explain what this does and then ```py y```"
+    assert content_filter.classify(text, "en", "zh-CN") is None
+
+    masked, segments = content_filter.mask(text)
+    assert masked == "{{KEEP_0}} Explain what this does and then {{KEEP_1}}"
+    assert content_filter.unmask(masked, segments) == text
+
+
+def test_url_mask_stops_at_adjacent_placeholder():
+    """测试URL紧跟行内代码时不会吞掉代码的占位符"""
+    content_filter = ContentFilter(ENABLED)
+    text = "See https://x.com`code` for details"
+    masked, segments = content_filter.mask(text)
+    assert segments == ["`code`", "https://x.com"]
+    assert content_filter.unmask(masked, segments) == text
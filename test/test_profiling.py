@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+测试阶段耗时统计与分析器
+"""
+
+import asyncio
+import os
+import pstats
+import time
+
+from packages.profiling import RunProfiler, StageTimer
+from packages.quarantine import FailureLog, FAILED_FIELDS_FILENAME
+from packages.writers import DatasetWriter
+from translate_dataset import translate_dataset
+
+
+def busy(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def test_stage_timer():
+    """测试各阶段的调用次数和累计耗时，按耗时降序排列"""
+    stages = StageTimer()
+    for _ in range(3):
+        with stages.span("extract"):
+            busy(0.002)
+    with stages.span("write"):
+        busy(0.01)
+
+    report = stages.report()
+    assert list(report) == ["write", "extract"]
+    assert report["extract"]["calls"] == 3
+    assert report["extract"]["total_s"] >= 0.006
+
+
+def test_profilers_save_output(tmp_path):
+    """测试cProfile保存pstats文件，采样分析器保存折叠栈"""
+    profiler = RunProfiler("cprofile")
+    profiler.start()
+    busy(0.01)
+    profiler.stop()
+    paths = profiler.save(str(tmp_path / "cprofile"))
+    assert [os.path.basename(path) for path in paths] == ["profile.prof"]
+    assert pstats.Stats(paths[0]).total_calls > 0
+
+    profiler = RunProfiler("sample", interval=0.001)
+    profiler.start()
+    busy(0.1)
+    profiler.stop()
+    paths = profiler.save(str(tmp_path / "sample"))
+    with open(paths[0], encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    assert lines and any("busy (test_profiling.py" in line for line in lines)
+    stack, count = lines[0].rsplit(" ", 1)
+    assert stack.startswith("MainThread;") and int(count) > 0
+
+
+def test_profile_retry_failed(tmp_path, capsys):
+    """测试 --retry_failed 时同样输出各阶段耗时并保存分析结果"""
+    output_dir = tmp_path / "output"
+    writer = DatasetWriter(str(output_dir), output_format="jsonl")
+    writer.start_split("train")
+    writer.write_rows("train", [{"instruction": "Hello", "input": "", "output": "World"}])
+    writer.close()
+    failures = FailureLog()
+    failures.record("train", 0, "output", "zh-CN", TimeoutError())
+    failures.save(str(output_dir / FAILED_FIELDS_FILENAME), "zh-CN")
+    # 空录制：回放时请求未命中，字段仍然失败
+    recording = tmp_path / "empty.jsonl"
+    recording.write_text("", encoding="utf-8")
+
+    asyncio.run(translate_dataset(
+        str(tmp_path / "unused"), "alpaca", output_path=str(output_dir), retry_failed=True,
+        replay_path=str(recording), replay_latency_scale=0, profile="cprofile"
+    ))
+
+    out = capsys.readouterr().out
+    assert "Stage breakdown" in out
+    assert os.path.exists(output_dir / "profile.prof")
+    assert len(FailureLog.load(str(output_dir / FAILED_FIELDS_FILENAME))) == 1
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+测试带版本号的提示词模板
+"""
+
+import pytest
+
+from packages.prompts import PromptBuilder, PROMPT_TEMPLATES, DEFAULT_PROMPT_VERSION
+
+
+def test_system_prefix_identical():
+    """测试同一语言对的系统提示在请求间字节一致，动态参考信息只追加在其后"""
+    prompts = PromptBuilder()
+    first = prompts.build_messages("en", "zh-CN", "Hello")
+    second = prompts.build_messages("en", "zh-CN", "World", hints="\n参考译文：你好")
+
+    assert first[0]["content"] == PROMPT_TEMPLATES[DEFAULT_PROMPT_VERSION].format(from_lang="en", to_lang="zh-CN")
+    assert second[0]["content"].startswith(first[0]["content"])
+    assert prompts.system_prompt("en", "zh-CN") is prompts.system_prompt("en", "zh-CN")
+    assert PromptBuilder().system_prompt("en", "zh-CN").encode("utf-8") == first[0]["content"].encode("utf-8")
+    assert prompts.system_prompt("en", "ja") != first[0]["content"]
+    assert prompts.system_prompt("en", "ja") is prompts.system_prompt("en", "ja")
+    assert [message["role"] for message in first] == ["system", "user"]
+    assert first[1]["content"] == "Hello"
+
+
+def test_custom_template_requires_version():
+    """测试自定义模板必须声明版本号，未知的内置版本被拒绝"""
+    with pytest.raises(ValueError, match="version"):
+        PromptBuilder({"system": "Translate {from_lang} to {to_lang}.\n\n"})
+    with pytest.raises(ValueError, match="Unknown prompt version"):
+        PromptBuilder({"version": "v999"})
+
+    prompts = PromptBuilder({"version": "custom-v1", "system": "Translate {from_lang} to {to_lang}.\n\n"})
+    assert prompts.system_prompt("en", "fr") == "Translate en to fr.\n\n"
+
+
+def test_metadata():
+    """测试元数据记录版本号和模板哈希，模板内容改变时哈希随之改变"""
+    default = PromptBuilder().metadata()
+    assert default["prompt_version"] == DEFAULT_PROMPT_VERSION
+    assert default == PromptBuilder({"version": DEFAULT_PROMPT_VERSION}).metadata()
+
+    custom = PromptBuilder({"version": "custom-v1", "system": "Translate {from_lang} to {to_lang}.\n\n"}).metadata()
+    edited = PromptBuilder({"version": "custom-v1", "system": "Translate {from_lang} into {to_lang}.\n\n"}).metadata()
+    assert custom["prompt_version"] == edited["prompt_version"] == "custom-v1"
+    assert custom["prompt_hash"] != edited["prompt_hash"] != default["prompt_hash"]
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+测试失败字段隔离记录与 --retry_failed
+"""
+
+import asyncio
+import json
+import os
+
+from packages.quarantine import FailureLog, FAILED_FIELDS_FILENAME, WHOLE_ITEM
+from packages.writers import DatasetWriter, load_output
+from translate_dataset import retry_failed_fields
+
+
+def test_failure_log_roundtrip(tmp_path):
+    """测试失败记录按目标语言写入旁路文件并读回，异常类名取异常链的根因"""
+    failures = FailureLog(max_message_length=10)
+    try:
+        try:
+            raise TimeoutError("read timed out")
+        except TimeoutError as e:
+            raise Exception("请求OpenAI失败(重试3次)") from e
+    except Exception as e:
+        failures.record("train", 3, "output", "zh-CN", e)
+    failures.record("train", 5, WHOLE_ITEM, "zh-CN", KeyError("instruction"))
+    failures.record("train", 3, "instruction", "ja", ValueError("bad"))
+
+    path = os.path.join(tmp_path, FAILED_FIELDS_FILENAME)
+    assert failures.save(path, "zh-CN") == 2
+    with open(path, encoding="utf-8") as f:
+        records = [json.loads(line) for line in f]
+    assert [record["error"] for record in records] == ["TimeoutError", "KeyError"]
+    assert len(records[0]["message"]) == 10
+
+    loaded = FailureLog.load(path)
+    assert loaded == failures.for_lang("zh-CN")
+    assert FailureLog.group_by_row(loaded) == {("train", 3): {"output"}, ("train", 5): {WHOLE_ITEM}}
+    assert FailureLog.load(os.path.join(tmp_path, "missing.jsonl")) == []
+
+
+def test_retry_failed_fields(tmp_path, make_handler, make_translator):
+    """测试 --retry_failed 只重新翻译记录的失败字段，并原地重写输出"""
+    rows = [
+        {"instruction": "译文 First", "input": "", "output": "Untranslated answer"},
+        {"instruction": "Second", "input": "", "output": "Whole row failed"},
+        {"instruction": "译文 Third", "input": "", "output": "译文 Done"},
+    ]
+    writer = DatasetWriter(str(tmp_path), output_format="jsonl")
+    writer.start_split("train")
+    writer.write_rows("train", rows)
+    writer.close()
+
+    failures = FailureLog()
+    failures.record("train", 0, "output", "zh-CN", TimeoutError())
+    failures.record("train", 1, WHOLE_ITEM, "zh-CN", TimeoutError())
+    failures.save(os.path.join(tmp_path, FAILED_FIELDS_FILENAME), "zh-CN")
+
+    handler = make_handler()
+    translator = make_translator(handler)
+    asyncio.run(retry_failed_fields(str(tmp_path), translator))
+
+    assert sorted(handler.texts) == ["Second", "Untranslated answer", "Whole row failed"]
+    assert load_output(str(tmp_path))["train"] == [
+        {"instruction": "译文 First", "input": "", "output": "译文 Untranslated answer"},
+        {"instruction": "译文 Second", "input": "", "output": "译文 Whole row failed"},
+        rows[2],
+    ]
+    assert FailureLog.load(os.path.join(tmp_path, FAILED_FIELDS_FILENAME)) == []
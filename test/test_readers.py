@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+测试本地文件输入读取器
+"""
+
+import json
+
+import pytest
+
+from packages.readers import open_dataset, detect_input_format, read_slice, sample_indices, select_rows
+
+ROWS = [{"instruction": f"instruction {i}", "output": f"output {i}"} for i in range(5)]
+
+
+def test_jsonl_reader(tmp_path):
+    """测试JSONL逐行读取与计数"""
+    path = tmp_path / "train.jsonl"
+    path.write_text("\n".join(json.dumps(row) for row in ROWS) + "\n\n", encoding="utf-8")
+
+    assert detect_input_format(str(path)) == "jsonl"
+    dataset = open_dataset(str(path), "auto")
+    assert list(dataset.keys()) == ["train"]
+    assert len(dataset["train"]) == len(ROWS)
+    assert list(dataset["train"]) == ROWS
+    assert dataset["train"][0] == ROWS[0]
+
+
+def test_directory_splits(tmp_path):
+    """测试目录中的每个文件作为一个split"""
+    for split_name in ("train", "test"):
+        path = tmp_path / f"{split_name}.jsonl"
+        path.write_text("\n".join(json.dumps(row) for row in ROWS), encoding="utf-8")
+
+    dataset = open_dataset(str(tmp_path), "jsonl")
+    assert sorted(dataset.keys()) == ["test", "train"]
+
+
+def test_parquet_reader(tmp_path):
+    """测试Parquet按row group分批读取"""
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+
+    path = tmp_path / "train.parquet"
+    pq.write_table(pa.Table.from_pylist(ROWS), str(path), row_group_size=2)
+
+    dataset = open_dataset(str(path), "parquet")
+    assert len(dataset["train"]) == len(ROWS)
+    assert list(dataset["train"]) == ROWS
+
+
+def test_slice_pages(tmp_path):
+    """测试按页随机读取JSONL，只解析需要的行"""
+    path = tmp_path / "train.jsonl"
+    path.write_text("\n".join(json.dumps(row) for row in ROWS[:3]) + "\n\n" + json.dumps(ROWS[3]) + "\n", encoding="utf-8")
+
+    split = open_dataset(str(path), "jsonl")["train"]
+    assert split.slice(1, 3) == ROWS[1:3]
+    assert split.slice(2, 10) == ROWS[2:4]
+    assert split[3] == ROWS[3]
+    assert len(split) == 4
+    assert read_slice(ROWS, 1, 2) == ROWS[1:2]
+
+
+@pytest.mark.parametrize("input_format", ["parquet", "arrow"])
+def test_slice_columnar(tmp_path, input_format):
+    """测试Parquet/Arrow按行号区间读取跨越多个row group/batch"""
+    pa = pytest.importorskip("pyarrow")
+    table = pa.Table.from_pylist(ROWS)
+    path = tmp_path / f"train.{input_format}"
+    if input_format == "parquet":
+        import pyarrow.parquet as pq
+        pq.write_table(table, str(path), row_group_size=2)
+    else:
+        with pa.ipc.new_file(str(path), table.schema) as writer:
+            for batch in table.to_batches(max_chunksize=2):
+                writer.write_batch(batch)
+
+    split = open_dataset(str(path), input_format)["train"]
+    assert split.slice(1, 4) == ROWS[1:4]
+    assert split.slice(4, 9) == ROWS[4:]
+    assert split[2] == ROWS[2]
+
+
+@pytest.mark.parametrize("input_format", ["jsonl", "csv", "parquet", "arrow"])
+def test_select_rows(tmp_path, input_format, monkeypatch):
+    """测试按行号列表一次读取抽样的数据项，Parquet每个row group只解码一次"""
+    path = tmp_path / f"train.{input_format}"
+    if input_format == "jsonl":
+        path.write_text("\n".join(json.dumps(row) for row in ROWS), encoding="utf-8")
+    elif input_format == "csv":
+        path.write_text("instruction,output\n" + "".join(f"{row['instruction']},{row['output']}\n" for row in ROWS), encoding="utf-8")
+    else:
+        pa = pytest.importorskip("pyarrow")
+        table = pa.Table.from_pylist(ROWS)
+        if input_format == "parquet":
+            import pyarrow.parquet as pq
+            pq.write_table(table, str(path), row_group_size=2)
+            decoded = []
+            read_row_group = pq.ParquetFile.read_row_group
+            monkeypatch.setattr(pq.ParquetFile, "read_row_group",
+                                lambda self, i, *args, **kwargs: decoded.append(i) or read_row_group(self, i, *args, **kwargs))
+        else:
+            with pa.ipc.new_file(str(path), table.schema) as writer:
+                for batch in table.to_batches(max_chunksize=2):
+                    writer.write_batch(batch)
+
+    split = open_dataset(str(path), input_format)["train"]
+    assert select_rows(split, [0, 2, 3]) == [ROWS[0], ROWS[2], ROWS[3]]
+    assert split.select([4, 1]) == [ROWS[4], ROWS[1]]
+    assert split.select([]) == []
+    if input_format == "parquet":
+        # 行号 2、3 位于同一个row group
+        assert decoded == [0, 1, 0, 2]
+    with pytest.raises(IndexError):
+        split.select([1, 5])
+
+
+def test_sample_indices():
+    """测试按固定种子抽样可复现，sample与fraction同时指定时取较小者"""
+    assert sample_indices(100) is None
+    picked = sample_indices(100, sample=10, seed=1)
+    assert picked == sample_indices(100, sample=10, seed=1)
+    assert len(picked) == 10 and picked == sorted(picked)
+    assert len(sample_indices(100, sample=30, fraction=0.1)) == 10
+    assert sample_indices(5, sample=10) == [0, 1, 2, 3, 4]
+    assert select_rows([{"id": i} for i in range(5)], [1, 3]) == [{"id": 1}, {"id": 3}]
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+测试请求录制与回放
+"""
+
+import asyncio
+import gzip
+import json
+import time
+
+import pytest
+
+from packages.openai import OpenAIHandler
+from packages.recording import ReplayMiss, TrafficRecorder, TrafficReplayer
+from translate_dataset import plan_translation, translate_dataset
+
+
+def make_request(text):
+    return {"model": "m", "messages": [{"role": "user", "content": text}], "temperature": 0.7}
+
+
+def make_response(text):
+    return {"choices": [{"message": {"content": text}}]}
+
+
+@pytest.mark.parametrize("suffix", [".jsonl", ".jsonl.gz"])
+def test_record_and_replay(tmp_path, suffix):
+    """测试录制的失败尝试和响应按顺序回放，回放模式不发送网络请求"""
+    path = str(tmp_path / f"traffic{suffix}")
+    recorder = TrafficRecorder(path)
+    started = time.perf_counter()
+    recorder.record(make_request("Hello"), started, error=TimeoutError("timed out"))
+    recorder.record(make_request("Hello"), started, result=make_response("你好"))
+    recorder.close()
+    assert recorder.count == 2
+
+    replayer = TrafficReplayer(path, latency_scale=0)
+    handler = OpenAIHandler(model="other", openai_url="http://unused", openai_key="", retry_delay=0,
+                            replayer=replayer)
+
+    messages = make_request("Hello")["messages"]
+    assert asyncio.run(handler.request(messages)) == "你好"
+    assert replayer.stats["hits"] == 2
+    # 最后一条录制重复使用
+    assert asyncio.run(handler.request(messages)) == "你好"
+
+    # 没有录制的请求不重试
+    with pytest.raises(Exception, match="No recorded response"):
+        asyncio.run(handler.request(make_request("Unknown")["messages"]))
+    assert replayer.stats["misses"] == 1
+    with pytest.raises(ReplayMiss):
+        asyncio.run(replayer.replay(make_request("Unknown")))
+
+
+def test_recording_stores_request(tmp_path):
+    """测试录制保存模型名称和请求体，加载时按请求体重新计算标识"""
+    path = tmp_path / "traffic.jsonl.gz"
+    recorder = TrafficRecorder(str(path))
+    recorder.record(make_request("Hello"), time.perf_counter(), result=make_response("你好"))
+    recorder.close()
+
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        entry = json.loads(f.read())
+    assert entry["model"] == "m"
+    assert entry["request"] == make_request("Hello")
+
+    # 标识规则改变后，旧录制按请求体重新计算标识仍可回放
+    entry["key"] = "stale"
+    rekeyed = tmp_path / "rekeyed.jsonl"
+    rekeyed.write_text(json.dumps(entry, ensure_ascii=False) + "\n", encoding="utf-8")
+    replayer = TrafficReplayer(str(rekeyed), latency_scale=0)
+    assert asyncio.run(replayer.replay(make_request("Hello"))) == make_response("你好")
+
+
+def test_replay_rejects_memory(tmp_path):
+    """测试翻译记忆不能与回放同时使用，翻译计划报告同样的错误"""
+    recording = tmp_path / "traffic.jsonl"
+    recording.write_text("", encoding="utf-8")
+    memory = str(tmp_path / "memory.jsonl")
+
+    plan = plan_translation(str(tmp_path / "data.jsonl"), "alpaca", memory_path=memory, replay_path=str(recording))
+    assert plan["errors"] and plan["errors"][0].startswith("--memory cannot be combined with --replay")
+    with pytest.raises(ValueError, match="--memory cannot be combined with --replay"):
+        asyncio.run(translate_dataset(str(tmp_path / "data.jsonl"), "alpaca", memory_path=memory,
+                                      replay_path=str(recording)))
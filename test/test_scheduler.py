@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+测试调度策略与重排缓冲区
+"""
+
+import pytest
+
+from packages.scheduler import ReorderBuffer, schedule_order
+
+
+def test_schedule_order():
+    """测试各调度策略的提交顺序"""
+    costs = [10, 500, 3, 700, 12]
+    assert schedule_order(costs, "fifo") == [0, 1, 2, 3, 4]
+    assert schedule_order(costs, "lpt") == [3, 1, 4, 0, 2]
+    # 同一长度桶内保持原始顺序
+    assert schedule_order(costs, "bucket") == [3, 1, 0, 4, 2]
+
+    with pytest.raises(ValueError):
+        schedule_order(costs, "random")
+
+
+def test_reorder_buffer():
+    """测试乱序完成的结果按原始顺序输出"""
+    output = []
+    buffer = ReorderBuffer(output.append)
+    for index in [3, 1, 0, 4, 2]:
+        buffer.push(index, f"item {index}")
+    buffer.close()
+
+    assert output == [f"item {i}" for i in range(5)]
+    assert buffer.pending == 0
+
+
+def test_reorder_buffer_missing():
+    """测试缺失结果时关闭缓冲区会报错"""
+    buffer = ReorderBuffer(lambda item: None)
+    buffer.push(1, "item 1")
+    with pytest.raises(RuntimeError):
+        buffer.close()
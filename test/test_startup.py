@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+测试命令行的快速启动：延迟导入、配置校验与翻译计划
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+from translate_dataset import plan_translation, validate_format_configs
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 只在实际翻译或加载数据集时才需要的较重依赖
+HEAVY_MODULES = ["datasets", "aiohttp", "pyarrow", "multiprocessing", "packages.openai"]
+
+# 导入主脚本的耗时上限（秒），留有余量以适应较慢的机器
+IMPORT_BUDGET = 1.0
+
+
+def test_import_time():
+    """测试导入主脚本时不加载较重的依赖，并且耗时在预算内"""
+    code = (
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        "import translate_dataset\n"
+        "elapsed = time.perf_counter() - start\n"
+        f"print(json.dumps({{'seconds': elapsed, 'heavy': [m for m in {HEAVY_MODULES!r} if m in sys.modules]}}))\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    measured = json.loads(result.stdout.strip().splitlines()[-1])
+    print(f"import translate_dataset: {measured['seconds'] * 1000:.1f} ms")
+
+    assert measured["heavy"] == []
+    assert measured["seconds"] < IMPORT_BUDGET
+
+
+def test_validate_format_configs(tmp_path):
+    """测试内置配置全部通过校验，错误的配置能被发现"""
+    assert not any(validate_format_configs(os.path.join(ROOT, "configs")).values())
+
+    (tmp_path / "broken.yaml").write_text(
+        "name: broken\ntranslatable_fields:\n  - field: text\nprefilter:\n  rules: [nope]\n", encoding="utf-8"
+    )
+    (tmp_path / "invalid.yaml").write_text("name: [unclosed\n", encoding="utf-8")
+    errors = validate_format_configs(str(tmp_path))
+    assert errors["broken"][0].startswith("prefilter:")
+    assert errors["invalid"][0].startswith("failed to load:")
+
+
+def test_plan_translation(tmp_path):
+    """测试翻译计划解析输入格式和各目标语言的输出目录"""
+    dataset_path = tmp_path / "train.jsonl"
+    dataset_path.write_text('{"instruction": "Hi", "input": "", "output": "Hello"}\n', encoding="utf-8")
+
+    plan = plan_translation(str(dataset_path), "alpaca", to_lang=["zh-CN", "ja"],
+                            config_dir=os.path.join(ROOT, "configs"), input_format="auto")
+    assert plan["input_format"] == "jsonl"
+    assert plan["input_size_bytes"] == dataset_path.stat().st_size
+    assert plan["translatable_fields"] == ["instruction", "input", "output"]
+    assert plan["outputs"]["ja"]["path"] == os.path.join(f"{dataset_path}_translated", "ja")
+    assert plan["errors"] == [] and plan["warnings"] == []
+
+
+def test_plan_reports_setting_conflicts(tmp_path):
+    """测试翻译计划和配置校验按翻译时相同的规则报告配置与参数的冲突"""
+    configs = os.path.join(ROOT, "configs")
+    plan = plan_translation(str(tmp_path / "data.jsonl"), "sharegpt", to_lang=["zh-CN", "ja"], config_dir=configs,
+                            multi_target_json=True)
+    assert plan["errors"] == []
+    assert "multi_target_json" in plan["warnings"][0]
+
+    plan = plan_translation(str(tmp_path / "data.jsonl"), "alpaca", from_lang="en", to_lang=["en", "ja"], config_dir=configs)
+    assert plan["errors"] == ["Source language 'en' is also a target language"]
+    assert validate_format_configs(configs, ["alpaca"], from_lang="en", to_langs=["en"]) == {
+        "alpaca": ["Source language 'en' is also a target language"]
+    }
+    assert validate_format_configs(configs, ["sharegpt"], from_lang="en", to_langs=["zh-CN", "ja"], multi_target_json=True) == {
+        "sharegpt": []
+    }
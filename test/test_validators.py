@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+测试译文本地校验
+"""
+
+import pytest
+
+from packages.validators import TranslationValidator, ValidationError
+
+SOURCE = "The patient attends 3 sessions per week, see {{KEEP_0}} and {name}.\n```\ncode\n```"
+GOOD = "患者每周参加3次治疗，参见{{KEEP_0}}和{name}。\n```\ncode\n```"
+
+
+def test_validate_batch():
+    """测试批量校验各项规则"""
+    validator = TranslationValidator({"enabled": True})
+    translations = [
+        GOOD,
+        "Here is the translation: " + GOOD,
+        "患者",
+        "The patient attends 3 sessions per week, see {{KEEP_0}} and {name}.\n```\ncode\n```",
+        GOOD.replace("{{KEEP_0}}", ""),
+        GOOD.replace("\n```\ncode\n```", ""),
+        "",
+    ]
+    errors = validator.validate_batch([SOURCE] * len(translations), translations, "en", "zh-CN")
+
+    assert errors[0] is None
+    assert errors[1].startswith("chatty_prefix")
+    assert errors[2].startswith("length_ratio")
+    assert errors[3].startswith("script")
+    assert errors[4].startswith("placeholders")
+    assert errors[5].startswith("code_fences")
+    assert errors[6] == "empty translation"
+    assert validator.stats["chatty_prefix"] == 1
+
+
+def test_validate_config():
+    """测试按格式配置选择校验项，未启用时只拒绝空译文"""
+    disabled = TranslationValidator()
+    assert not disabled.enabled
+    assert disabled.validate_batch([SOURCE] * 2, ["Here is the translation: 患者", ""], "en", "zh-CN") == [None, "empty translation"]
+
+    validator = TranslationValidator({"enabled": True, "checks": ["placeholders"]})
+    validator.validate(SOURCE, "Here is the translation: {{KEEP_0}} {name}", "en", "zh-CN")
+
+    with pytest.raises(ValidationError):
+        validator.validate(SOURCE, "no placeholders", "en", "zh-CN")
+    with pytest.raises(ValueError):
+        TranslationValidator({"checks": ["unknown"]})
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+测试流式输出写入
+"""
+
+import datetime
+import json
+import os
+
+import pytest
+
+from packages.writers import DatasetWriter, encode_rows, find_output, load_output, open_output_splits
+
+SPLITS = {
+    "train": [{"instruction": f"指令 {i}", "output": str(i)} for i in range(25)],
+    "empty": [],
+    "test": [{"instruction": "测试", "output": "x"}],
+}
+
+
+@pytest.mark.parametrize("output_format,compression,workers", [
+    ("json", "none", 0),
+    ("json", "gzip", 2),
+    ("jsonl", "none", 2),
+    ("jsonl", "gzip", 0),
+])
+def test_round_trip(tmp_path, output_format, compression, workers):
+    """测试各输出格式和压缩方式写入后能按原顺序读回"""
+    writer = DatasetWriter(str(tmp_path), output_format=output_format, compression=compression,
+                           workers=workers, chunk_size=4)
+    for split, rows in SPLITS.items():
+        writer.start_split(split)
+        for row in rows:
+            writer.write(split, row)
+    writer.close()
+
+    assert writer.counts == {split: len(rows) for split, rows in SPLITS.items()}
+    assert find_output(str(tmp_path)) == (output_format, compression)
+    loaded = load_output(str(tmp_path))
+    if output_format == "jsonl":
+        loaded = {split: loaded[split] for split in SPLITS}
+    assert loaded == SPLITS
+
+
+def test_json_layout(tmp_path):
+    """测试JSON输出保持 {split: [...]} 结构并支持缩进"""
+    writer = DatasetWriter(str(tmp_path), indent=2)
+    writer.write("train", SPLITS["test"][0])
+    writer.close()
+
+    with open(os.path.join(str(tmp_path), "translated_dataset.json"), encoding="utf-8") as f:
+        text = f.read()
+    assert json.loads(text) == {"train": SPLITS["test"]}
+    assert '  "instruction"' in text
+
+
+def test_open_output_splits(tmp_path):
+    """测试打开JSONL输出时按需读取，并忽略失败字段记录"""
+    writer = DatasetWriter(str(tmp_path), output_format="jsonl")
+    for row in SPLITS["train"]:
+        writer.write("train", row)
+    writer.close()
+    (tmp_path / "failed_fields.jsonl").write_text("", encoding="utf-8")
+
+    splits = open_output_splits(str(tmp_path))
+    assert list(splits.keys()) == ["train"]
+    assert len(splits["train"]) == len(SPLITS["train"])
+    assert splits["train"].slice(20, 30) == SPLITS["train"][20:]
+    assert list(load_output(str(tmp_path)).keys()) == ["train"]
+
+
+def test_encode_rows_fallback():
+    """测试orjson不支持的缩进和类型退回标准库json"""
+    row = {"text": "中文", "date": datetime.date(2024, 1, 2)}
+    compact, indented = encode_rows([row], indent=None) + encode_rows([row], indent=4)
+    assert json.loads(compact) == json.loads(indented) == {"text": "中文", "date": "2024-01-02"}
+    assert b'\n    "text"' in indented
@@ -1,21 +1,57 @@
 import json
 import os
 import asyncio
-from typing import List, Dict, Optional
-from datasets import load_dataset
-from packages.openai import OpenAIHandler
-from packages.translate import OpenAITranslator
-from packages.config import ConfigManager
-from packages.formats.base import TranslatableField
+from typing import Any, List, Dict, Optional, Union
+from packages.memory import TranslationMemory, Glossary
+from packages.prefilter import ContentFilter
+from packages.prompts import PromptBuilder
+from packages.validators import TranslationValidator
+from packages.quarantine import FailureLog, FAILED_FIELDS_FILENAME, WHOLE_ITEM
+from packages.delta import PriorOutput, RowIndex, ROW_INDEX_FILENAME
+from packages.recording import TrafficRecorder, TrafficReplayer
+from packages.profiling import RunProfiler, StageTimer, PROFILE_MODES
+from packages.autotune import ConcurrencyTuner, load_operating_point, save_operating_point
+from packages.writers import DatasetWriter, OUTPUT_FORMATS, COMPRESSIONS, find_output, load_output
+from packages.offload import CpuOffload, LoopLagMonitor, CPU_EXECUTORS
+from packages.config import ConfigManager, check_translation_settings
+from packages.formats.paths import compile_path
+from packages.readers import open_dataset, detect_input_format, sample_indices, select_rows, INPUT_FORMATS
+from packages.scheduler import SCHEDULING_POLICIES
 
 async def translate_dataset(
     dataset_path: str,
     format_name: str,
     from_lang: str = "en",
-    to_lang: str = "zh-CN",
+    to_lang: Union[str, List[str]] = "zh-CN",
     output_path: str = None,
     max_concurrent: int = 5,
-    config_dir: str = "configs"
+    config_dir: str = "configs",
+    input_format: str = "hub",
+    scheduling: str = "lpt",
+    memory_path: str = None,
+    glossary_path: str = None,
+    multi_target_json: bool = False,
+    retry_failed: bool = False,
+    output_format: str = "json",
+    compression: str = "none",
+    indent: Optional[int] = None,
+    serialize_workers: int = 0,
+    serialize_executor: str = "thread",
+    cpu_executor: str = "inline",
+    cpu_workers: Optional[int] = None,
+    cpu_batch_size: int = 256,
+    delta_from: str = None,
+    sample: Optional[int] = None,
+    fraction: Optional[float] = None,
+    seed: int = 0,
+    record_path: str = None,
+    replay_path: str = None,
+    replay_latency_scale: float = 1.0,
+    profile: Optional[str] = None,
+    autotune: bool = False,
+    autotune_max: int = 256,
+    target_latency: Optional[float] = None,
+    autotune_state: str = "autotune.json"
 ):
     """
     通用数据集翻译函数
@@ -24,16 +60,56 @@ async def translate_dataset(
         dataset_path: 数据集路径或名称
         format_name: 数据格式名称（如 alpaca, sharegpt, custom_reasoning）
         from_lang: 源语言代码，默认en
-        to_lang: 目标语言代码，默认zh-CN
+        to_lang: 目标语言代码或代码列表，默认zh-CN；多个目标语言时一次提取、并发翻译，并分别写入 输出路径/语言代码
         output_path: 输出路径，默认与输入路径相同
-        max_concurrent: 最大并发数，默认200
+        max_concurrent: 同时翻译的数据项数量上限，默认5；自动调节时为初始并发请求数
         config_dir: 配置文件目录，默认configs
+        input_format: 输入格式，默认hub（datasets.load_dataset），可选auto、jsonl、parquet、arrow、csv
+        scheduling: 调度策略，默认lpt（最长优先），可选fifo、bucket；不影响输出顺序
+        memory_path: 翻译记忆库JSONL文件路径，精确命中直接复用，新译文会追加写入
+        glossary_path: 术语表文件路径（YAML或TSV）
+        multi_target_json: 多目标语言时是否用一次JSON模式请求同时翻译所有语言，对话模式下只用于对话窗口之外的单个字段
+        retry_failed: 仅重新翻译已有输出中记录在 failed_fields.jsonl 的失败字段
+        output_format: 输出格式，json（默认，所有split写入一个文件）或 jsonl（每个split一个文件）
+        compression: 输出压缩方式，none（默认）、gzip 或 zstd
+        indent: JSON缩进空格数，默认None（紧凑输出）
+        serialize_workers: 输出序列化的并行数，默认0（在写入线程中序列化）
+        serialize_executor: 输出序列化使用的执行器，thread（默认）或 process
+        cpu_executor: 字段提取、重新组装、译文校验和写入等CPU阶段的执行方式，inline（默认，在事件循环中执行）、thread 或 process
+        cpu_workers: CPU阶段的线程/进程数，默认由执行器决定
+        cpu_batch_size: CPU阶段每批处理的数据项数量，默认256
+        delta_from: 之前一次运行的输出路径；可翻译内容未变的数据项直接复用其译文，只翻译新增或修改的数据项
+        sample: 每个split按固定种子抽取的行数，用于小规模试运行
+        fraction: 每个split按固定种子抽取的比例（0到1之间）
+        seed: 抽样的随机种子，默认0
+        record_path: 录制文件路径，记录每次API请求尝试的响应和延迟
+        replay_path: 回放文件路径，从录制中回放响应而不请求API，无需设置API环境变量
+        replay_latency_scale: 回放延迟缩放比例，默认1（原始延迟），0为不等待
+        profile: 分析模式，spans（输出各阶段耗时）、cprofile 或 sample（另外保存 profile.prof 或折叠栈 profile.collapsed），默认不分析
+        autotune: 是否根据观测到的延迟自动调整并发请求数
+        autotune_max: 自动调节的最大并发请求数，默认256
+        target_latency: 自动调节的目标p90延迟（秒），默认不设，改为与低并发时的延迟比较
+        autotune_state: 保存各后端选定工作点的状态文件，之后的运行从该工作点开始，默认autotune.json
     """
-    # 从环境变量获取OpenAI配置
+    to_langs = [to_lang] if isinstance(to_lang, str) else list(to_lang)
+    if not to_langs:
+        raise ValueError("At least one target language is required")
+
+    # 网络请求相关的依赖只在实际翻译时导入，保证 --list_formats、--plan 等命令快速启动
+    from packages.openai import OpenAIHandler
+    from packages.pipeline import DatasetTranslator
+
+    errors = check_run_flags(memory_path, replay_path)
+    if errors:
+        raise ValueError(errors[0])
+
+    # 从环境变量获取OpenAI配置，回放时不请求API
     openai_url = os.getenv("OPENAI_BASE_URL")
     openai_key = os.getenv("OPENAI_API_KEY")
     model_name = os.getenv("MODEL")
-    if not openai_url or not openai_key or not model_name:
+    if replay_path:
+        model_name = model_name or "replay"
+    elif not openai_url or not openai_key or not model_name:
         raise EnvironmentError("Please set OPENAI_BASE_URL, OPENAI_API_KEY, and MODEL in environment variables")
     
     # 初始化配置管理器和格式处理器
@@ -44,105 +120,473 @@ async def translate_dataset(
     format_handler = config_manager.create_format_handler(format_name)
     print(f"Using format: {format_handler.name} - {format_handler.description}")
     
-    # 初始化OpenAI处理器和翻译器
+    # 自动调节并发：从之前保存的工作点（没有时从max_concurrent）开始
+    tuner = None
+    backend = f"replay:{replay_path}|{model_name}" if replay_path else f"{openai_url}|{model_name}"
+    if autotune:
+        previous_point = load_operating_point(autotune_state, backend)
+        initial = previous_point["max_concurrent"] if previous_point else max_concurrent
+        tuner = ConcurrencyTuner(initial=initial, maximum=autotune_max, target_latency=target_latency)
+        print(f"Auto-tuning concurrency from {tuner.limit} (max {autotune_max}"
+              f"{', saved operating point' if previous_point else ''})")
+
+    # 初始化OpenAI处理器和数据集翻译器，可选录制或回放请求
+    replayer = TrafficReplayer(replay_path, latency_scale=replay_latency_scale) if replay_path else None
+    if replayer is not None:
+        print(f"Replaying {len(replayer)} recorded responses from {replay_path} (latency scale: {replay_latency_scale})")
     openai_handler = OpenAIHandler(
         model=model_name,
         openai_url=openai_url,
-        openai_key=openai_key
+        openai_key=openai_key,
+        recorder=TrafficRecorder(record_path) if record_path else None,
+        replayer=replayer,
+        tuner=tuner
+    )
+    memory = TranslationMemory(memory_path) if memory_path else None
+    glossary = Glossary.from_file(glossary_path) if glossary_path else None
+    # CPU密集阶段的执行器边界，事件循环只负责网络I/O
+    offload = CpuOffload(cpu_executor, workers=cpu_workers, batch_size=cpu_batch_size)
+    # 各阶段（load、extract、translate、reconstruct、write 等）的耗时统计
+    stages = StageTimer()
+    translator = DatasetTranslator(
+        openai_handler,
+        format_handler,
+        from_lang=from_lang,
+        to_langs=to_langs,
+        # 自动调节时由调节器限制并发请求数，数据项并发放宽到上限
+        max_concurrent=autotune_max if autotune else max_concurrent,
+        memory=memory,
+        glossary=glossary,
+        multi_target_json=multi_target_json,
+        offload=offload,
+        stages=stages
     )
-    translator = OpenAITranslator(openai_handler)
+
+    output_path = output_path or f"{dataset_path}_translated"
+    profiler = RunProfiler(profile) if profile else None
+
+    if retry_failed:
+        if profiler is not None:
+            profiler.start()
+        await retry_failed_fields(output_path, translator)
+        if profiler is not None:
+            profiler.stop()
+        offload.close()
+        await openai_handler.close()
+        if memory is not None:
+            memory.save()
+        print(f"API requests: {translator.stats.get('requests', 0)}, translation memory hits: {translator.stats.get('memory_hits', 0)}")
+        if profiler is not None:
+            print_profile(stages, profiler, output_path)
+        return
 
     # 加载数据集
-    print(f"Loading dataset: {dataset_path}")
-    dataset = load_dataset(dataset_path)
-    
-    # 创建信号量控制并发
-    semaphore = asyncio.Semaphore(max_concurrent)
+    print(f"Loading dataset: {dataset_path} (input format: {input_format})")
+    if profiler is not None:
+        profiler.start()
+    with stages.span("load"):
+        dataset = open_dataset(dataset_path, input_format)
 
-    async def translate_item(item: Dict) -> Dict:
-        """翻译单个数据项"""
-        async with semaphore:
-            try:
-                # 提取可翻译内容
-                translatable_fields = format_handler.extract_translatable_content(item)
-                
-                if not translatable_fields:
-                    print(f"No translatable content found in item: {item}")
-                    return item
-                
-                # 翻译所有字段
-                for field in translatable_fields:
-                    if field.content and isinstance(field.content, str):
-                        try:
-                            translated_content = await translator.translate(
-                                from_lang=from_lang,
-                                to_lang=to_lang,
-                                text=field.content
-                            )
-                            field.content = translated_content
-                        except Exception as e:
-                            print(f"Error translating field {field.field_path}: {str(e)}")
-                            continue
-                
-                # 重新组装数据项
-                translated_item = format_handler.reconstruct_item(item, translatable_fields)
-                return translated_item
-                
-            except Exception as e:
-                print(f"Error processing item: {str(e)}")
-                return item
+    # 打开之前的输出，必须在写入器覆盖输出文件之前完成
+    prior = None
+    if delta_from:
+        prior_dirs = {lang: get_lang_output_path(delta_from, to_langs, lang) for lang in to_langs}
+        in_place = any(
+            os.path.abspath(prior_dir) == os.path.abspath(get_lang_output_path(output_path, to_langs, lang))
+            for lang, prior_dir in prior_dirs.items()
+        )
+        prior = PriorOutput(prior_dirs, format_handler, from_lang, preload=in_place)
+        print(f"Loaded {len(prior)} reusable rows from previous output: {delta_from}")
+    row_index = RowIndex(format_handler.name, from_lang)
+
+    # 每种目标语言一个流式写入器，多目标语言时写入单独的子目录
+    writers = {
+        lang: DatasetWriter(
+            get_lang_output_path(output_path, to_langs, lang),
+            output_format=output_format,
+            compression=compression,
+            indent=indent,
+            workers=serialize_workers,
+            executor_type=serialize_executor
+        )
+        for lang in to_langs
+    }
+
+    # 监测事件循环延迟，衡量CPU工作对请求处理的影响
+    lag_monitor = LoopLagMonitor()
+    lag_monitor.start()
 
     # 处理所有split
-    translated_splits = {}
     for split_name, split_data in dataset.items():
-        print(f"Translating split: {split_name} ({len(split_data)} items)")
+        # 按固定种子抽样，输出只包含抽中的数据项
+        indices = sample_indices(len(split_data), sample=sample, fraction=fraction, seed=seed)
+        # 有意将整个split读入内存：LPT/bucket调度和 --delta_from 需要先得到全部数据项的字段与哈希；
+        # 本地文件只是避免了 datasets 缓存，需要有界内存的调用方应使用 DatasetTranslator.translate_rows
+        with stages.span("load"):
+            items = list(split_data) if indices is None else select_rows(split_data, indices)
+        if indices is not None:
+            print(f"Sampled {len(items)} of {len(split_data)} items from split {split_name} (seed: {seed})")
+        print(f"Translating split: {split_name} ({len(items)} items, scheduling: {scheduling})")
         
         # 验证数据格式
-        if len(split_data) > 0:
-            sample_item = split_data[0]
+        if len(items) > 0:
+            sample_item = items[0]
             if not format_handler.validate_item(sample_item):
                 print(f"Warning: Sample item may not match expected format")
                 print(f"Sample item keys: {list(sample_item.keys())}")
                 print(f"Expected fields: {[field['field'] for field in format_handler.translatable_fields]}")
         
-        # 并发翻译
-        tasks = [translate_item(item) for item in split_data.select(range(len(split_data)))]
-        translated_items = await asyncio.gather(*tasks)
-        
-        translated_splits[split_name] = translated_items
+        # 并发翻译，结果按原始顺序流式写入各目标语言
+        for writer in writers.values():
+            writer.start_split(split_name)
 
-    # 保存翻译后的数据集
-    output_path = output_path or f"{dataset_path}_translated"
+        async def write_rows(lang: str, rows: List[Dict]):
+            with stages.span("write"):
+                await offload.run_local(writers[lang].write_rows, split_name, rows)
+
+        row_index.splits[split_name] = await translator.translate_split(
+            items, split_name, write_rows, scheduling=scheduling, prior=prior
+        )
+
+    for writer in writers.values():
+        # 完成剩余的序列化和写入
+        with stages.span("write"):
+            await writer.aclose()
+        print(f"Translated dataset saved to: {', '.join(writer.paths)}")
     
-    # 创建输出目录
-    os.makedirs(output_path, exist_ok=True)
+    if profiler is not None:
+        profiler.stop()
+    await lag_monitor.stop()
+    offload.close()
+    await openai_handler.close()
+    loop_lag = lag_monitor.summary()
+    stats = translator.stats
+
+    operating_point = None
+    if tuner is not None:
+        # 保存选定的工作点，之后对同一后端的运行从该并发开始
+        operating_point = tuner.operating_point()
+        if operating_point["windows"]:
+            save_operating_point(autotune_state, backend, operating_point)
+
+    for lang, writer in writers.items():
+        lang_output_path = writer.output_dir
+        
+        # 保存运行元数据（格式、模型、提示词版本及统计信息）
+        metadata = {
+            "dataset": dataset_path,
+            "format": format_handler.name,
+            "from_lang": from_lang,
+            "to_lang": lang,
+            "model": model_name,
+            **translator.prompts.metadata(),
+            "output_format": output_format,
+            "compression": compression,
+            "cpu_executor": cpu_executor,
+            "sample": {"sample": sample, "fraction": fraction, "seed": seed} if sample is not None or fraction is not None else None,
+            "delta_from": delta_from,
+            "autotune": {**operating_point, "history": tuner.history} if tuner else None,
+            "replay": {"path": replay_path, "latency_scale": replay_latency_scale, **replayer.stats} if replayer else None,
+            "splits": dict(writer.counts),
+            "stats": {
+                **stats,
+                "loop_lag": loop_lag,
+                "stages": stages.report(),
+            },
+        }
+        metadata_path = os.path.join(lang_output_path, "metadata.json")
+        with open(metadata_path, "w", encoding="utf-8") as f:
+            json.dump(metadata, f, ensure_ascii=False, indent=2)
+
+        # 保存行哈希索引，供之后的 --delta_from 增量翻译使用
+        row_index.save(os.path.join(lang_output_path, ROW_INDEX_FILENAME))
+        
+        # 保存失败字段记录
+        failed_count = translator.failures.save(os.path.join(lang_output_path, FAILED_FIELDS_FILENAME), lang)
+        if failed_count:
+            print(f"{failed_count} failed fields for {lang} recorded in {FAILED_FIELDS_FILENAME}, re-run with --retry_failed")
     
-    # 保存JSON格式的翻译结果
-    json_path = os.path.join(output_path, "translated_dataset.json")
-    with open(json_path, "w", encoding="utf-8") as f:
-        json.dump(translated_splits, f, ensure_ascii=False, indent=2)
+    if memory is not None:
+        memory.save()
     
-    print(f"Translated dataset JSON saved to: {json_path}")
     print(f"Translation completed successfully!")
     
     # 显示统计信息
-    total_items = sum(len(split_data) for split_data in translated_splits.values())
-    print(f"Total items translated: {total_items}")
-    print(f"Splits processed: {list(translated_splits.keys())}")
+    split_counts = writers[to_langs[0]].counts
+    print(f"Total items translated: {sum(split_counts.values())}")
+    print(f"Target languages: {to_langs}")
+    print(f"Splits processed: {list(split_counts.keys())}")
+    print(f"API requests: {stats.get('requests', 0)}, translation memory hits: {stats.get('memory_hits', 0)}")
+    if prior is not None:
+        print(f"Rows reused from previous output: {stats.get('reused_rows', 0)}")
+    if record_path:
+        print(f"Recorded {openai_handler.recorder.count} request attempts to {record_path}")
+    if operating_point is not None:
+        print(f"Auto-tuned concurrency: {operating_point['max_concurrent']} "
+              f"(throughput {operating_point.get('throughput_rps')} req/s, p90 latency {operating_point.get('p90_latency_s')} s), "
+              f"saved to {autotune_state}")
+    if replayer is not None:
+        print(f"Replayed responses: {replayer.stats['hits']}, missing from recording: {replayer.stats['misses']}")
+    print(f"Calls saved by prefilter: {stats['prefilter_skipped']} {dict(translator.content_filter.stats)}")
+    print(f"Responses rejected by validation: {sum(stats['validation_rejected'].values())} {stats['validation_rejected']}")
+    print(f"Failed fields: {len(translator.failures)}")
+    print(f"Event loop lag ({cpu_executor} CPU stages): mean {loop_lag['mean_ms']} ms, p99 {loop_lag['p99_ms']} ms, max {loop_lag['max_ms']} ms")
+
+    if profiler is not None:
+        print_profile(stages, profiler, output_path)
+
+def print_profile(stages: StageTimer, profiler: RunProfiler, output_path: str) -> None:
+    """
+    打印各阶段耗时并保存分析结果
+
+    Args:
+        stages: 各阶段的耗时统计
+        profiler: 已停止的分析器
+        output_path: 输出路径，分析结果保存在其中
+    """
+    # 并发阶段（translate）的累计耗时是所有数据项之和，可能超过100%
+    print("Stage breakdown (calls, total, mean, % of run):")
+    for stage, timing in stages.report().items():
+        print(f"  {stage:<12} {timing['calls']:>8} {timing['total_s']:>10.3f} s {timing['mean_ms']:>10.3f} ms {timing['wall_pct']:>7.1f}%")
+    for path in profiler.save(output_path):
+        print(f"Profile saved to: {path}")
+
+def check_run_flags(memory_path: str = None, replay_path: str = None) -> List[str]:
+    """
+    检查运行参数之间的冲突，translate_dataset 与 plan_translation 使用相同的检查
+
+    Returns:
+        List[str]: 错误信息列表
+    """
+    errors = []
+    if memory_path and replay_path:
+        # 参考译文提示取决于请求完成的顺序，回放时请求无法稳定匹配录制
+        errors.append("--memory cannot be combined with --replay: translation memory hints depend on "
+                      "request completion order, so replayed requests would not match the recording")
+    return errors
+
+def get_lang_output_path(output_path: str, to_langs: List[str], lang: str) -> str:
+    """目标语言对应的输出目录，多目标语言时为 输出路径/语言代码"""
+    return output_path if len(to_langs) == 1 else os.path.join(output_path, lang)
+
+async def retry_failed_fields(output_path: str, translator):
+    """
+    重新翻译已有输出中记录的失败字段
+    
+    失败字段在输出中保留的是原文，因此直接从已有输出中提取并重新翻译，无需重新加载原始数据集。
+    仍然失败的字段会重新写入失败记录。
+    
+    Args:
+        output_path: 已有的输出路径
+        translator: 数据集翻译器（DatasetTranslator）
+    """
+    to_langs = translator.to_langs
+    for lang in to_langs:
+        lang_output_path = get_lang_output_path(output_path, to_langs, lang)
+        failed_path = os.path.join(lang_output_path, FAILED_FIELDS_FILENAME)
+        failed_rows = FailureLog.group_by_row(FailureLog.load(failed_path))
+        if not failed_rows:
+            print(f"No failed fields recorded for {lang}")
+            continue
+        
+        output_format, compression = find_output(lang_output_path)
+        with translator.stages.span("load"):
+            translated_splits = load_output(lang_output_path)
+        print(f"Retrying {sum(len(paths) for paths in failed_rows.values())} failed fields in {len(failed_rows)} items for {lang}")
+        
+        tasks = []
+        for (split_name, index), field_paths in failed_rows.items():
+            item = translated_splits[split_name][index]
+            try:
+                fields = translator.format_handler.extract_translatable_content(item)
+            except Exception as e:
+                translator.failures.record(split_name, index, WHOLE_ITEM, lang, e)
+                continue
+            if WHOLE_ITEM not in field_paths:
+                fields = [field for field in fields if field.field_path in field_paths]
+            tasks.append((split_name, translator.translate_item(index, item, fields, split_name, [lang])))
+        
+        results = await asyncio.gather(*(task for _, task in tasks))
+        for (split_name, _), (index, lang_fields) in zip(tasks, results):
+            item = translated_splits[split_name][index]
+            translated_splits[split_name][index] = (await translator.reconstruct_items(split_name, lang, [(index, item, lang_fields[lang])]))[0]
+        
+        with translator.stages.span("write"):
+            writer = DatasetWriter(lang_output_path, output_format=output_format, compression=compression)
+            for split_name, items in translated_splits.items():
+                writer.start_split(split_name)
+                for item in items:
+                    writer.write(split_name, item)
+            await writer.aclose()
+        remaining = translator.failures.save(failed_path, lang)
+        print(f"Updated {', '.join(writer.paths)}, {remaining} fields still failing")
+
+def validate_format_configs(config_dir: str = "configs", format_names: List[str] = None, from_lang: str = None,
+                            to_langs: List[str] = None, multi_target_json: bool = False) -> Dict[str, List[str]]:
+    """
+    校验格式配置：基本结构，以及 prefilter、prompt、validation、conversation 各部分能否正常构建
+    
+    不加载数据集，也不导入网络请求相关的依赖。
+    
+    Args:
+        config_dir: 配置目录
+        format_names: 要校验的格式名称，默认为所有格式
+        from_lang: 源语言代码，与 to_langs 同时指定时检查配置与运行参数的组合（与翻译时的检查相同）
+        to_langs: 目标语言代码列表
+        multi_target_json: 是否用一次JSON模式请求同时翻译所有目标语言
+        
+    Returns:
+        Dict[str, List[str]]: 格式名称 -> 错误信息列表，校验通过时为空列表
+    """
+    config_manager = ConfigManager(config_dir)
+    errors = {name: [f"failed to load: {message}"] for name, message in config_manager.load_errors.items()}
+    
+    for format_name in format_names or config_manager.list_formats():
+        format_errors = errors.setdefault(format_name, [])
+        if format_errors:
+            continue
+        try:
+            config = config_manager.get_config(format_name)
+        except KeyError as e:
+            format_errors.append(str(e))
+            continue
+        if not config_manager.validate_config(config):
+            format_errors.append("missing 'name' or a valid 'translatable_fields' list")
+            continue
+        
+        for section, factory in (("prefilter", ContentFilter), ("prompt", PromptBuilder), ("validation", TranslationValidator)):
+            try:
+                factory(config.get(section))
+            except Exception as e:
+                format_errors.append(f"{section}: {str(e)}")
+
+        for field_config in config["translatable_fields"]:
+            if field_config.get("type") == "path":
+                try:
+                    compile_path(field_config["field"])
+                except ValueError as e:
+                    format_errors.append(f"translatable_fields: {str(e)}")
+        
+        conversation = config.get("conversation") or {}
+        for key in ("max_chars", "max_turns"):
+            value = conversation.get(key)
+            if value is not None and (not isinstance(value, int) or value < 1):
+                format_errors.append(f"conversation: {key} must be a positive integer, got {value!r}")
+
+        if from_lang and to_langs:
+            format_errors.extend(check_translation_settings(config, from_lang, to_langs, multi_target_json)[0])
+    return errors
 
-def auto_detect_format(dataset_path: str, config_dir: str = "configs") -> Optional[str]:
+def plan_translation(
+    dataset_path: str,
+    format_name: str,
+    from_lang: str = "en",
+    to_lang: Union[str, List[str]] = "zh-CN",
+    output_path: str = None,
+    max_concurrent: int = 5,
+    config_dir: str = "configs",
+    input_format: str = "hub",
+    scheduling: str = "lpt",
+    memory_path: str = None,
+    glossary_path: str = None,
+    multi_target_json: bool = False,
+    retry_failed: bool = False,
+    output_format: str = "json",
+    compression: str = "none",
+    delta_from: str = None,
+    sample: Optional[int] = None,
+    fraction: Optional[float] = None,
+    seed: int = 0,
+    autotune: bool = False,
+    autotune_state: str = "autotune.json",
+    replay_path: str = None
+) -> Dict[str, Any]:
+    """
+    生成翻译计划，用于在启动任务前检查参数
+    
+    只解析格式配置和路径，不加载数据集、不请求API，也不导入 datasets、aiohttp 等较重的依赖。
+    参数含义与 translate_dataset 相同。配置与参数的组合按翻译时相同的规则检查，结果记录在 errors 和 warnings 中。
+    
+    Returns:
+        Dict[str, Any]: 翻译计划
+    """
+    to_langs = [to_lang] if isinstance(to_lang, str) else list(to_lang)
+    config_manager = ConfigManager(config_dir)
+    format_handler = config_manager.create_format_handler(format_name)
+    config = format_handler.config
+    errors, warnings = check_translation_settings(config, from_lang, to_langs, multi_target_json)
+    errors += check_run_flags(memory_path, replay_path)
+    content_filter = ContentFilter(config.get("prefilter"))
+    validator = TranslationValidator(config.get("validation"))
+    output_path = output_path or f"{dataset_path}_translated"
+    
+    if input_format == "auto" and os.path.exists(dataset_path):
+        input_format = detect_input_format(dataset_path)
+    input_size = None
+    if os.path.isfile(dataset_path):
+        input_size = os.path.getsize(dataset_path)
+    elif os.path.isdir(dataset_path):
+        input_size = sum(
+            os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(dataset_path) for name in names
+        )
+    
+    outputs = {}
+    for lang in to_langs:
+        lang_output_path = get_lang_output_path(output_path, to_langs, lang)
+        outputs[lang] = {"path": lang_output_path}
+        if retry_failed:
+            outputs[lang]["failed_fields"] = len(FailureLog.load(os.path.join(lang_output_path, FAILED_FIELDS_FILENAME)))
+        if delta_from:
+            prior_index = RowIndex.load(os.path.join(get_lang_output_path(delta_from, to_langs, lang), ROW_INDEX_FILENAME))
+            outputs[lang]["delta_rows"] = sum(len(hashes) for hashes in prior_index.splits.values()) if prior_index else None
+    
+    return {
+        "dataset": dataset_path,
+        "input_format": input_format,
+        "input_size_bytes": input_size,
+        "format": format_handler.name,
+        "translatable_fields": [field["field"] for field in format_handler.translatable_fields],
+        "conversation_mode": bool(format_handler.conversation.get("enabled", False)),
+        "from_lang": from_lang,
+        "to_langs": to_langs,
+        "multi_target_json": multi_target_json and len(to_langs) > 1,
+        "retry_failed": retry_failed,
+        "delta_from": delta_from,
+        "sample": {"sample": sample, "fraction": fraction, "seed": seed} if sample is not None or fraction is not None else None,
+        "outputs": outputs,
+        "output_format": output_format,
+        "compression": compression,
+        "scheduling": scheduling,
+        "max_concurrent": max_concurrent,
+        # 自动调节时之前为该后端保存的工作点
+        "autotune": {
+            "saved_operating_point": load_operating_point(autotune_state, f"{os.getenv('OPENAI_BASE_URL')}|{os.getenv('MODEL')}"),
+        } if autotune else None,
+        **PromptBuilder(config.get("prompt")).metadata(),
+        "prefilter_rules": content_filter.rules if content_filter.enabled else [],
+        "validation_checks": validator.checks if validator.enabled else [],
+        "memory": memory_path,
+        "glossary": glossary_path,
+        "replay": replay_path,
+        "missing_env": [name for name in ("OPENAI_BASE_URL", "OPENAI_API_KEY", "MODEL") if not os.getenv(name)],
+        "errors": errors,
+        "warnings": warnings,
+    }
+
+def auto_detect_format(dataset_path: str, config_dir: str = "configs", input_format: str = "hub") -> Optional[str]:
     """
     自动检测数据集格式
     
     Args:
         dataset_path: 数据集路径
         config_dir: 配置目录
+        input_format: 输入格式
         
     Returns:
         Optional[str]: 检测到的格式名称
     """
     try:
-        dataset = load_dataset(dataset_path)
+        dataset = open_dataset(dataset_path, input_format)
         config_manager = ConfigManager(config_dir)
         
         # 获取第一个split的第一个样本
@@ -173,14 +617,47 @@ if __name__ == "__main__":
     
     # 创建参数解析器
     parser = argparse.ArgumentParser(description="通用数据集翻译脚本")
-    parser.add_argument("--dataset", required=True, help="数据集路径或名称")
+    parser.add_argument("--dataset", help="数据集路径或名称")
     parser.add_argument("--format", help="数据格式名称（如 alpaca, sharegpt, custom_reasoning）")
-    parser.add_argument("--from_lang", required=True, help="源语言代码")
-    parser.add_argument("--to_lang", required=True, help="目标语言代码")
+    parser.add_argument("--from_lang", help="源语言代码")
+    parser.add_argument("--to_lang", nargs="+", help="目标语言代码，可指定多个（空格或逗号分隔）")
     parser.add_argument("--output", help="输出路径，默认为数据集名_translated")
     parser.add_argument("--config_dir", default="configs", help="配置文件目录")
     parser.add_argument("--auto_detect", action="store_true", help="自动检测数据格式")
     parser.add_argument("--list_formats", action="store_true", help="列出所有可用格式")
+    parser.add_argument("--validate_config", action="store_true", help="校验格式配置后退出（指定--format时只校验该格式）")
+    parser.add_argument("--plan", action="store_true", help="打印翻译计划后退出，不加载数据集、不请求API")
+    parser.add_argument("--input_format", default="hub", choices=INPUT_FORMATS,
+                        help="输入格式：hub（默认）、auto（按扩展名推断）或本地文件格式")
+    parser.add_argument("--max_concurrent", type=int, default=5, help="同时翻译的数据项数量上限，默认5；--autotune 时为初始并发请求数")
+    parser.add_argument("--autotune", action="store_true", help="根据观测到的延迟自动调整并发请求数")
+    parser.add_argument("--autotune_max", type=int, default=256, help="自动调节的最大并发请求数，默认256")
+    parser.add_argument("--target_latency", type=float, default=None, help="自动调节的目标p90延迟（秒）")
+    parser.add_argument("--autotune_state", default="autotune.json", help="保存各后端选定并发的状态文件，默认autotune.json")
+    parser.add_argument("--scheduling", default="lpt", choices=SCHEDULING_POLICIES,
+                        help="调度策略：lpt（最长优先，默认）、fifo、bucket（按长度分桶）")
+    parser.add_argument("--memory", help="翻译记忆库JSONL文件路径")
+    parser.add_argument("--glossary", help="术语表文件路径（YAML或TSV）")
+    parser.add_argument("--multi_target_json", action="store_true", help="多目标语言时用一次JSON模式请求同时翻译所有语言")
+    parser.add_argument("--retry_failed", action="store_true", help="仅重新翻译已有输出中记录的失败字段")
+    parser.add_argument("--output_format", default="json", choices=OUTPUT_FORMATS, help="输出格式：json（默认）或 jsonl")
+    parser.add_argument("--compression", default="none", choices=COMPRESSIONS, help="输出压缩方式：none（默认）、gzip 或 zstd")
+    parser.add_argument("--indent", type=int, default=None, help="JSON缩进空格数，默认紧凑输出")
+    parser.add_argument("--serialize_workers", type=int, default=0, help="输出序列化的并行数，默认0")
+    parser.add_argument("--serialize_executor", default="thread", choices=["thread", "process"], help="输出序列化使用的执行器")
+    parser.add_argument("--cpu_executor", default="inline", choices=CPU_EXECUTORS,
+                        help="字段提取、重新组装、校验和写入等CPU阶段的执行方式：inline（默认）、thread 或 process")
+    parser.add_argument("--cpu_workers", type=int, default=None, help="CPU阶段的线程/进程数")
+    parser.add_argument("--cpu_batch_size", type=int, default=256, help="CPU阶段每批处理的数据项数量，默认256")
+    parser.add_argument("--delta_from", help="之前一次运行的输出路径，只翻译新增或修改的数据项，其余复用已有译文")
+    parser.add_argument("--sample", type=int, default=None, help="每个split按固定种子抽取的行数，用于小规模试运行")
+    parser.add_argument("--fraction", type=float, default=None, help="每个split按固定种子抽取的比例（0到1之间）")
+    parser.add_argument("--seed", type=int, default=0, help="抽样的随机种子，默认0")
+    parser.add_argument("--record", help="录制文件路径，记录API请求的响应和延迟（.gz/.zst后缀时压缩）")
+    parser.add_argument("--replay", help="回放文件路径，从录制中回放响应，不请求API")
+    parser.add_argument("--profile", nargs="?", const="spans", choices=PROFILE_MODES,
+                        help="输出各阶段耗时；cprofile 另外保存 profile.prof，sample 另外保存折叠栈 profile.collapsed")
+    parser.add_argument("--replay_latency_scale", type=float, default=1.0, help="回放延迟缩放比例，默认1（原始延迟），0为不等待")
     
     # 解析参数
     args = parser.parse_args()
@@ -196,12 +673,66 @@ if __name__ == "__main__":
             print(f"    Fields: {fields}")
         exit(0)
     
+    # 校验格式配置
+    if args.validate_config:
+        # 指定了语言时同时检查配置与运行参数的组合
+        results = validate_format_configs(
+            args.config_dir, [args.format] if args.format else None, from_lang=args.from_lang,
+            to_langs=[lang for value in args.to_lang or [] for lang in value.split(",") if lang],
+            multi_target_json=args.multi_target_json
+        )
+        for fmt, errors in results.items():
+            print(f"  {fmt}: {'OK' if not errors else 'INVALID'}")
+            for error in errors:
+                print(f"    - {error}")
+        exit(1 if any(results.values()) else 0)
+    
+    # 除 --list_formats 和 --validate_config 外，其余命令都需要指定数据集和语言
+    if not args.dataset or not args.from_lang or not args.to_lang:
+        parser.error("the following arguments are required: --dataset, --from_lang, --to_lang")
+    to_langs = [lang for value in args.to_lang for lang in value.split(",") if lang]
+    for error in check_run_flags(args.memory, args.replay):
+        if not args.plan:
+            parser.error(error)
+    
+    # 打印翻译计划
+    if args.plan:
+        if not args.format:
+            print("--plan requires --format (auto-detection would load the dataset)")
+            exit(1)
+        plan = plan_translation(
+            dataset_path=args.dataset,
+            format_name=args.format,
+            from_lang=args.from_lang,
+            to_lang=to_langs,
+            output_path=args.output,
+            config_dir=args.config_dir,
+            input_format=args.input_format,
+            scheduling=args.scheduling,
+            memory_path=args.memory,
+            glossary_path=args.glossary,
+            multi_target_json=args.multi_target_json,
+            retry_failed=args.retry_failed,
+            output_format=args.output_format,
+            compression=args.compression,
+            max_concurrent=args.max_concurrent,
+            autotune=args.autotune,
+            autotune_state=args.autotune_state,
+            delta_from=args.delta_from,
+            sample=args.sample,
+            fraction=args.fraction,
+            seed=args.seed,
+            replay_path=args.replay
+        )
+        print(json.dumps(plan, ensure_ascii=False, indent=2))
+        exit(1 if plan["errors"] else 0)
+    
     # 确定要使用的格式
     format_name = args.format
     
     if args.auto_detect or not format_name:
         print("Attempting to auto-detect format...")
-        detected_format = auto_detect_format(args.dataset, args.config_dir)
+        detected_format = auto_detect_format(args.dataset, args.config_dir, args.input_format)
         if detected_format:
             format_name = detected_format
         elif not format_name:
@@ -219,7 +750,34 @@ if __name__ == "__main__":
         dataset_path=args.dataset,
         format_name=format_name,
         from_lang=args.from_lang,
-        to_lang=args.to_lang,
+        to_lang=to_langs,
         output_path=args.output,
-        config_dir=args.config_dir
+        config_dir=args.config_dir,
+        input_format=args.input_format,
+        scheduling=args.scheduling,
+        memory_path=args.memory,
+        glossary_path=args.glossary,
+        multi_target_json=args.multi_target_json,
+        retry_failed=args.retry_failed,
+        output_format=args.output_format,
+        compression=args.compression,
+        indent=args.indent,
+        serialize_workers=args.serialize_workers,
+        serialize_executor=args.serialize_executor,
+        cpu_executor=args.cpu_executor,
+        cpu_workers=args.cpu_workers,
+        cpu_batch_size=args.cpu_batch_size,
+        delta_from=args.delta_from,
+        sample=args.sample,
+        fraction=args.fraction,
+        seed=args.seed,
+        record_path=args.record,
+        replay_path=args.replay,
+        replay_latency_scale=args.replay_latency_scale,
+        profile=args.profile,
+        max_concurrent=args.max_concurrent,
+        autotune=args.autotune,
+        autotune_max=args.autotune_max,
+        target_latency=args.target_latency,
+        autotune_state=args.autotune_state
     ))
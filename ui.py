@@ -1,63 +1,148 @@
-import streamlit as st
-from datasets import load_dataset  # 加载数据集
+import os
 import json  # 用于JSON格式化
+from itertools import zip_longest
+import streamlit as st
+from packages.config import ConfigManager
+from packages.quarantine import FailureLog, FAILED_FIELDS_FILENAME
+from packages.readers import open_dataset, read_slice, INPUT_FORMATS
+from packages.writers import open_output_splits
+
+
+@st.cache_resource(show_spinner="正在加载数据集...")
+def load_source_dataset(dataset_name: str, input_format: str):
+    """加载数据集，跨rerun缓存，翻页时不会重新加载"""
+    return open_dataset(dataset_name, input_format)
+
+
+@st.cache_resource(show_spinner="正在打开翻译结果...")
+def load_translated_dataset(output_dir: str):
+    """打开翻译结果，跨rerun缓存；JSONL/Parquet输出以内存映射方式按需读取"""
+    return open_output_splits(output_dir)
+
+
+@st.cache_resource
+def load_config_manager(config_dir: str) -> ConfigManager:
+    """加载格式配置"""
+    return ConfigManager(config_dir)
+
+
+@st.cache_data
+def load_failures(output_dir: str):
+    """读取失败字段记录：(split, 下标) -> 失败的字段路径集合"""
+    return FailureLog.group_by_row(FailureLog.load(os.path.join(output_dir, FAILED_FIELDS_FILENAME)))
+
+
+def to_display_rows(rows):
+    """只对当前页的嵌套字段（如conversations）编码为JSON字符串，便于表格展示"""
+    return [
+        {
+            key: json.dumps(value, ensure_ascii=False, indent=2) if isinstance(value, (list, dict)) else value
+            for key, value in row.items()
+        }
+        for row in rows
+    ]
+
+
+def show_side_by_side(format_handler, split_name, start_idx, rows, translated_rows, failures):
+    """按格式配置的字段路径并排展示原文与译文"""
+    if len(translated_rows) != len(rows):
+        st.warning(f"翻译结果在当前页只有 {len(translated_rows)} 条记录，原数据集有 {len(rows)} 条")
+
+    for offset, (source_item, translated_item) in enumerate(zip_longest(rows, translated_rows)):
+        index = start_idx + offset
+        failed_paths = failures.get((split_name, index))
+        label = f"#{index}"
+        if failed_paths:
+            label += f"  ⚠️ 失败字段: {', '.join(sorted(failed_paths))}"
+
+        with st.expander(label, expanded=offset < 3):
+            if source_item is None:
+                st.json(translated_item)
+                continue
+            left, right = st.columns(2)
+            left.caption("原文")
+            right.caption("译文")
+            for field_path, source, target in format_handler.align_fields(source_item, translated_item):
+                left, right = st.columns(2)
+                left.markdown(f"**{field_path}**")
+                left.text(source)
+                right.markdown(f"**{field_path}**")
+                right.text(target if target is not None else "（缺失）")
+
 
 def show_dataset():
     # 设置页面标题
     st.title("数据集展示")
-    
+
     # 创建输入框获取数据集名称
-    dataset_name = st.text_input("请输入数据集名称（例如：samhog/psychology-10k）", 
+    dataset_name = st.text_input("请输入数据集名称或本地路径（例如：samhog/psychology-10k）",
                                value="samhog/psychology-10k")
-    
+    input_format = st.selectbox("输入格式", INPUT_FORMATS, index=INPUT_FORMATS.index("hub"))
+    output_dir = st.text_input("翻译结果目录（可选，填写后并排对照原文与译文）", value="")
+
     try:
-        # 加载数据集
-        dataset = load_dataset(dataset_name)
-        
+        # 加载数据集（缓存）
+        dataset = load_source_dataset(dataset_name, input_format)
+
         # 显示数据集信息
         st.write(f"数据集包含 {len(dataset)} 个 split")
-        
+
         # 选择要查看的split
         split_names = list(dataset.keys())
         selected_split = st.selectbox("请选择要查看的split", split_names)
-        
+
         # 获取选中的split数据
         split_data = dataset[selected_split]
         st.write(f"当前split大小：{len(split_data)} 条记录")
-        st.write(f"数据集列名：{split_data.column_names}")
-        
-        # 分批次读取设置
-        batch_size = st.slider("选择每批显示的数据量", 100, 5000, 1000, 100)
-        total_batches = (len(split_data) + batch_size - 1) // batch_size
-        
-        # 添加批次选择器
-        batch_num = st.number_input(f"选择要查看的批次 (共 {total_batches} 批)", 
-                                  min_value=1, 
-                                  max_value=total_batches, 
+        if hasattr(split_data, "column_names"):
+            st.write(f"数据集列名：{split_data.column_names}")
+
+        # 分页设置，每页只读取和转换当前页的数据
+        page_size = st.slider("选择每页显示的数据量", 10, 500, 50, 10)
+        total_pages = max(1, (len(split_data) + page_size - 1) // page_size)
+
+        # 添加页码选择器
+        page_num = st.number_input(f"选择要查看的页 (共 {total_pages} 页)",
+                                  min_value=1,
+                                  max_value=total_pages,
                                   value=1)
-        
-        # 计算当前批次的起止位置
-        start_idx = (batch_num - 1) * batch_size
-        end_idx = min(start_idx + batch_size, len(split_data))
-        
-        # 获取当前批次数据
-        batch_data = split_data.select(range(start_idx, end_idx))
-        
-        # 将批次数据转换为pandas DataFrame格式
-        df = batch_data.to_pandas()
-        
-        if 'conversations' in df.columns:
-            # 处理ndarray类型数据
-            df['conversations'] = df['conversations'].apply(
-                lambda x: json.dumps(x.tolist() if hasattr(x, 'tolist') else x, 
-                                   ensure_ascii=False, 
-                                   indent=2)
-            )
-        
-        # 展示当前批次数据
-        st.write(f"正在显示 {selected_split} split 的第 {batch_num} 批数据 ({start_idx + 1}-{end_idx} 条):")
-        st.dataframe(df)
-        
+
+        # 计算当前页的起止位置
+        start_idx = (page_num - 1) * page_size
+        end_idx = min(start_idx + page_size, len(split_data))
+
+        # 获取当前页数据（Arrow切片/内存映射按需读取）
+        rows = read_slice(split_data, start_idx, end_idx)
+        st.write(f"正在显示 {selected_split} split 的第 {page_num} 页数据 ({start_idx + 1}-{end_idx} 条):")
+
+        if not output_dir:
+            st.dataframe(to_display_rows(rows))
+            return
+
+        # 打开翻译结果并按格式配置对照展示
+        translated = load_translated_dataset(output_dir)
+        if selected_split not in translated:
+            st.warning(f"翻译结果中没有 split {selected_split}，可用的split：{list(translated.keys())}")
+            st.dataframe(to_display_rows(rows))
+            return
+        translated_rows = read_slice(translated[selected_split], start_idx, end_idx)
+
+        config_manager = load_config_manager("configs")
+        formats = config_manager.list_formats()
+        detected_format = config_manager.detect_format(rows[0]) if rows else None
+        format_name = st.selectbox(
+            "数据格式", formats, index=formats.index(detected_format) if detected_format in formats else 0
+        )
+        format_handler = config_manager.create_format_handler(format_name)
+
+        view = st.radio("显示方式", ["并排对照", "表格"], horizontal=True)
+        if view == "表格":
+            left, right = st.columns(2)
+            left.dataframe(to_display_rows(rows))
+            right.dataframe(to_display_rows(translated_rows))
+        else:
+            show_side_by_side(format_handler, selected_split, start_idx, rows, translated_rows, load_failures(output_dir))
+
     except Exception as e:
         st.error(f"加载数据集失败: {str(e)}")
 